@@ -0,0 +1,10 @@
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_solutions.settings')
+os.environ.setdefault('ASGI', 'True')
+
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler  # noqa: E402
+from django.core.asgi import get_asgi_application  # noqa: E402
+
+# WhiteNoise serves static files under WSGI; here Django's handler does
+application = ASGIStaticFilesHandler(get_asgi_application())
@@ -18,6 +18,10 @@ urlpatterns = [
     path('api/feedback/', include('feedback.urls')),
     path('api/gallery/', include('gallery.urls')),
     path('api/contacts/', include('contacts.urls')),
+    path('api/stats/', include('stats.urls')),
+    path('api/changes/', include('changes.urls')),
+    path('api/', include('core.urls')),
+    path(f"{settings.MEDIA_URL.lstrip('/')}variants/", include('images.urls')),
 ]
 
 if settings.DEBUG:
@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, list_indexes
 
 class Article(BaseModel):
     title = models.CharField(max_length=300)
@@ -13,6 +13,7 @@ class Article(BaseModel):
     
     class Meta:
         ordering = ['-publish_date']
+        indexes = list_indexes(ordering, ['category', 'author'])
     
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -1,8 +1,12 @@
 from rest_framework import serializers
+from core.sparse import DynamicFieldsMixin
+from images.fields import SrcsetField
 from .models import Article
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = Article
-        fields = ['id', 'title', 'description', 'image', 'author', 
+        fields = ['id', 'title', 'description', 'image', 'srcset', 'author', 
                  'publish_date', 'read_time', 'category', 'external_link', 'created_at']
\ No newline at end of file
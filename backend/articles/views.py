@@ -1,18 +1,28 @@
 from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
+from changes.sync import DeltaSyncMixin, UpdatedSinceFilter
+from core.asyncviews import AsyncReadMixin
+from core.bulk import BulkModelViewSetMixin
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.fast import FastListMixin
+from core.search import FullTextSearchFilter
+from core.sparse import SparseFieldsetMixin
 from .models import Article
 from .serializers import ArticleSerializer
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(BulkModelViewSetMixin, CachedResponseMixin, ConditionalGetMixin,
+                     SparseFieldsetMixin, FastListMixin, DeltaSyncMixin, AsyncReadMixin,
+                     viewsets.ModelViewSet):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, UpdatedSinceFilter]
     filterset_fields = ['category', 'author']
     search_fields = ['title', 'description', 'author', 'category']
     ordering_fields = ['publish_date', 'created_at', 'title']
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'delta']:
             permission_classes = [permissions.AllowAny]
         else:
             permission_classes = [permissions.IsAuthenticated]
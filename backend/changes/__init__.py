@@ -0,0 +1 @@
+# Changes app
\ No newline at end of file
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import Change, Tombstone
+
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'model', 'object_id', 'op', 'updated_at', 'created_at']
+    list_filter = ['model', 'op']
+    readonly_fields = ['model', 'object_id', 'op', 'updated_at', 'created_at']
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ['model', 'object_id', 'deleted_at']
+    list_filter = ['model']
+    readonly_fields = ['model', 'object_id', 'deleted_at']
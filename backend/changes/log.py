@@ -0,0 +1,178 @@
+"""
+Change log behind the ``/api/changes/stream`` server-sent events feed.
+
+Writes to the tracked models (core.models.TRACKED_MODELS) append one
+compact row per object in the write's own transaction, so a change is
+logged exactly when its data commits and every worker process streams the
+same sequence from the database. Bulk writes touching more than
+``CHANGES_BULK_LIMIT`` rows log a single ``reset`` for the model instead,
+which tells clients to refetch it.
+
+Streams poll the log every ``CHANGES_POLL_SECONDS``; a commit in the same
+process wakes them right away through ``listeners``.
+"""
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Change, Tombstone
+
+
+class Listeners:
+    """Wakes this process's streams, sync and async, when a change commits"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.waiters = set()
+
+    def notify(self):
+        with self.condition:
+            self.condition.notify_all()
+            waiters = list(self.waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def sleep(self, timeout):
+        """time.sleep() that ends early when a change commits"""
+        with self.condition:
+            self.condition.wait(timeout)
+
+    async def asleep(self, timeout):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.condition:
+            self.waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.condition:
+                self.waiters.discard(waiter)
+
+
+listeners = Listeners()
+
+
+def record(model, op, rows, using=None):
+    """Log op for rows, a list of (object_id, updated_at), in the current transaction"""
+    label = model._meta.app_label
+    if op == Change.RESET or len(rows) > settings.CHANGES_BULK_LIMIT:
+        changes = [Change(model=label, op=Change.RESET, updated_at=timezone.now())]
+    else:
+        changes = [
+            Change(model=label, object_id=pk, op=op, updated_at=updated_at)
+            for pk, updated_at in rows
+        ]
+        if not changes:
+            return
+    Change.objects.using(using).bulk_create(changes)
+    transaction.on_commit(listeners.notify, using=using)
+
+
+def as_event(change, event_id):
+    data = {
+        'model': change.model,
+        'id': change.object_id,
+        'op': change.op,
+        'updated_at': change.updated_at.isoformat() if change.updated_at else None,
+    }
+    return f'id: {event_id}\nevent: change\ndata: {json.dumps(data)}\n\n'
+
+
+def reset_event(event_id):
+    """Tell the client its position is gone: refetch everything"""
+    return f'id: {event_id}\nevent: reset\ndata: {{}}\n\n'
+
+
+def _ids(descending=False):
+    return Change.objects.order_by('-id' if descending else 'id').values_list('id', flat=True)
+
+
+def start_position(last_event_id):
+    """(position, reset) for a client resuming after last_event_id, or a new one"""
+    latest = _ids(descending=True).first() or 0
+    if last_event_id is None:
+        return latest, False
+    return resume_position(last_event_id, latest, _ids().first())
+
+
+async def astart_position(last_event_id):
+    latest = await _ids(descending=True).afirst() or 0
+    if last_event_id is None:
+        return latest, False
+    return resume_position(last_event_id, latest, await _ids().afirst())
+
+
+def resume_position(last_event_id, latest, oldest):
+    # Pruned past the client's position, or a different database
+    if last_event_id > latest or (oldest is not None and last_event_id < oldest - 1):
+        return latest, True
+    return last_event_id, False
+
+
+class Cursor:
+    """
+    One stream's position in the log.
+
+    Ids are allocated before commit, so with concurrent writers a row can
+    become visible after a higher id was already read. Skipped ids are
+    re-polled for ``CHANGES_GAP_SECONDS`` before they are given up as
+    rolled back.
+    """
+    max_gap = 100
+
+    def __init__(self, position):
+        self.position = position
+        self.gaps = {}
+
+    def queryset(self):
+        condition = Q(id__gt=self.position)
+        if self.gaps:
+            condition |= Q(id__in=list(self.gaps))
+        return Change.objects.filter(condition).order_by('id')[:settings.CHANGES_BATCH_SIZE]
+
+    def events(self, changes):
+        now = time.monotonic()
+        for change in changes:
+            self.gaps.pop(change.id, None)
+            if change.id > self.position:
+                if change.id - self.position <= self.max_gap:
+                    self.gaps.update(dict.fromkeys(range(self.position + 1, change.id), now))
+                self.position = change.id
+            # Late rows carry the current position so Last-Event-ID never goes back
+            yield as_event(change, self.position)
+        self.gaps = {
+            change_id: seen for change_id, seen in self.gaps.items()
+            if now - seen < settings.CHANGES_GAP_SECONDS
+        }
+
+    def poll(self):
+        return list(self.events(list(self.queryset())))
+
+    async def apoll(self):
+        return list(self.events([change async for change in self.queryset()]))
+
+
+def prune():
+    """
+    Delete changes older than CHANGES_RETENTION_HOURS (keeping the newest)
+    and tombstones older than TOMBSTONE_RETENTION_DAYS
+    """
+    now = timezone.now()
+    latest = _ids(descending=True).first()
+    changes = Change.objects.filter(
+        created_at__lt=now - timedelta(hours=settings.CHANGES_RETENTION_HOURS)
+    ).exclude(id=latest)
+    tombstones = Tombstone.objects.filter(
+        deleted_at__lt=now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    )
+    # Plain DELETEs: neither table has relations, and the global post_delete
+    # receivers would otherwise make Django load every row first
+    return changes._raw_delete(changes.db), tombstones._raw_delete(tombstones.db)
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from changes.log import prune
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete change log entries older than CHANGES_RETENTION_HOURS and delete '
+        'tombstones older than TOMBSTONE_RETENTION_DAYS; streams and delta syncs '
+        'resuming from before that point are told to start over'
+    )
+
+    def handle(self, *args, **options):
+        changes, tombstones = prune()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {changes} change(s) older than {settings.CHANGES_RETENTION_HOURS}h and '
+            f'{tombstones} tombstone(s) older than {settings.TOMBSTONE_RETENTION_DAYS} days'
+        ))
@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Change(models.Model):
+    """A committed write to a tracked model; the id is the SSE event id"""
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    RESET = 'reset'
+    OP_CHOICES = [
+        (CREATE, 'Create'),
+        (UPDATE, 'Update'),
+        (DELETE, 'Delete'),
+        (RESET, 'Reset'),
+    ]
+
+    # App label, as in the API path: 'services', 'feedback', ...
+    model = models.CharField(max_length=50)
+    # Empty for reset, which means "refetch every row of the model"
+    object_id = models.BigIntegerField(blank=True, null=True)
+    op = models.CharField(max_length=10, choices=OP_CHOICES)
+    updated_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.op} {self.model} #{self.object_id}"
+
+
+class Tombstone(models.Model):
+    """A deleted row of a tracked model, kept for delta sync (see changes.sync)"""
+    # Model label, e.g. 'feedback.feedback'
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_model_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted {self.deleted_at}"
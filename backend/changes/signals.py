@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import is_tracked
+from core.signals import bulk_changed, pre_bulk_update
+
+from .log import record
+from .models import Change, Tombstone
+
+
+@receiver(post_save)
+def log_save(sender, instance, created, using, **kwargs):
+    if is_tracked(sender):
+        record(sender, Change.CREATE if created else Change.UPDATE,
+               [(instance.pk, instance.updated_at)], using=using)
+
+
+@receiver(post_delete)
+def log_delete(sender, instance, using, **kwargs):
+    if is_tracked(sender):
+        # The tombstone is written in the delete's transaction, so it exists
+        # exactly when the row is gone
+        Tombstone.objects.using(using).create(model=sender._meta.label_lower, object_id=instance.pk)
+        record(sender, Change.DELETE, [(instance.pk, timezone.now())], using=using)
+
+
+@receiver(pre_bulk_update)
+def log_queryset_update(sender, queryset, values, **kwargs):
+    if not is_tracked(sender):
+        return
+    # Only the ids are needed, and only up to the point where a reset is logged
+    ids = queryset.order_by().values_list('pk', flat=True)[:settings.CHANGES_BULK_LIMIT + 1]
+    updated_at = values.get('updated_at')
+    if not isinstance(updated_at, datetime):
+        # An expression: the new value is only known to the database
+        updated_at = None
+    record(sender, Change.UPDATE, [(pk, updated_at) for pk in ids], using=queryset.db)
+
+
+@receiver(bulk_changed)
+def log_bulk_write(sender, action, objs=(), **kwargs):
+    if not is_tracked(sender) or action == 'update':
+        return
+    if any(obj.pk is None for obj in objs):
+        # Created without returning their ids, so they cannot be named
+        record(sender, Change.RESET, [])
+        return
+    op = Change.CREATE if action == 'bulk_create' else Change.UPDATE
+    record(sender, op, [(obj.pk, obj.updated_at) for obj in objs])
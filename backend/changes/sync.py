@@ -0,0 +1,153 @@
+"""
+Delta sync for clients that keep a copy of the content.
+
+``?updated_since=<ISO 8601 datetime>`` on any list returns the rows changed
+after that moment. ``GET <prefix>/delta/?since=<watermark>`` returns, in one
+response, the rows created or updated since the watermark (``upserts``), the
+ids deleted since then (``deleted``, from the Tombstone table) and the
+watermark to send next time. Rows that left the list's filters, such as
+feedback that is no longer approved, count as deleted.
+
+Watermarks are opaque ``(updated_at, id)`` keys. A response stops at the
+``DELTA_SYNC_LIMIT``-th row with ``more: true``; the client repeats the call
+with the new watermark until ``more`` is false. Rows updated in the last
+``DELTA_SYNC_LAG_SECONDS`` are left for the next sync, so a transaction that
+commits a little after it set ``updated_at`` is never skipped. A watermark
+older than ``TOMBSTONE_RETENTION_DAYS`` gets a full copy with ``reset: true``.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.response import Response
+
+from core.metrics import time_serialization
+
+from .models import Tombstone
+
+
+def parse_since(value, param):
+    # An unencoded "+" in the query string arrives as a space
+    try:
+        since = parse_datetime(value.replace(' ', '+'))
+    except ValueError:
+        since = None
+    if since is None:
+        raise ValidationError({param: 'Expected an ISO 8601 datetime.'})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, timezone.utc)
+    return since
+
+
+class UpdatedSinceFilter(BaseFilterBackend):
+    """``?updated_since=<ISO 8601 datetime>``: rows changed after that moment"""
+    updated_since_param = 'updated_since'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.updated_since_param)
+        if not value:
+            return queryset
+        return queryset.filter(updated_at__gt=parse_since(value, self.updated_since_param))
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.updated_since_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Only rows created or updated after this ISO 8601 datetime',
+            'schema': {'type': 'string', 'format': 'date-time'},
+        }]
+
+
+def encode_watermark(updated_at, pk):
+    payload = json.dumps([updated_at.isoformat(), pk], separators=(',', ':'))
+    return urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_watermark(encoded):
+    """(updated_at, pk) from a watermark; pk is None after a complete sync"""
+    try:
+        updated_at, pk = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+        updated_at = parse_datetime(updated_at)
+        if updated_at is None or timezone.is_naive(updated_at):
+            raise ValueError
+        if pk is not None and not isinstance(pk, int):
+            raise ValueError
+        return updated_at, pk
+    except (TypeError, ValueError):
+        raise ValidationError({'since': 'Invalid watermark.'})
+
+
+def after(position):
+    """Rows past an (updated_at, pk) position; pk None means past every row at updated_at"""
+    updated_at, pk = position
+    if pk is None:
+        return Q(updated_at__gt=updated_at)
+    return Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk)
+
+
+class DeltaSyncMixin:
+    """
+    ViewSet mixin adding ``GET <prefix>/delta/``. The viewset grants the
+    ``delta`` action the same permissions and queryset as ``list``.
+    """
+    delta_limit = None
+
+    @action(detail=False, methods=['get'], url_path='delta')
+    def delta(self, request, *args, **kwargs):
+        now = timezone.now()
+        horizon = now - timedelta(seconds=settings.DELTA_SYNC_LAG_SECONDS)
+        since, reset = self.get_since(request, now)
+        limit = self.delta_limit or settings.DELTA_SYNC_LIMIT
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(updated_at__lte=horizon)
+        if since is not None:
+            queryset = queryset.filter(after(since))
+        rows = list(queryset.order_by('updated_at', 'pk')[:limit + 1])
+        more = len(rows) > limit
+        rows = rows[:limit]
+        until = (rows[-1].updated_at, rows[-1].pk) if more else (horizon, None)
+        if since is not None and since[0] > horizon:
+            # Synced again within the lag: keep the watermark where it was
+            until = since
+
+        with time_serialization():
+            upserts = self.get_serializer(rows, many=True).data
+        return Response({
+            'upserts': upserts,
+            'deleted': self.get_deleted(queryset.model, since, until) if since else [],
+            'watermark': encode_watermark(*until),
+            'more': more,
+            'reset': reset,
+        })
+
+    def get_since(self, request, now):
+        encoded = request.query_params.get('since')
+        if not encoded:
+            return None, False
+        since = decode_watermark(encoded)
+        if since[0] < now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS):
+            # Deletions that old may have been pruned: start over
+            return None, True
+        return since, False
+
+    def get_deleted(self, model, since, until):
+        """Ids deleted, or moved out of this list, between two positions"""
+        # Only rows that existed at the last sync: the client may hold those
+        hidden = (
+            model._default_manager.filter(after(since), created_at__lte=since[0])
+            .exclude(after(until))
+            .exclude(pk__in=self.filter_queryset(self.get_queryset()).values('pk'))
+            .values_list('pk', flat=True)
+        )
+        deleted = Tombstone.objects.filter(
+            model=model._meta.label_lower, deleted_at__gt=since[0], deleted_at__lte=until[0],
+        ).values_list('object_id', flat=True)
+        return sorted(set(deleted) | set(hidden))
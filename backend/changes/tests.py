@@ -0,0 +1,308 @@
+import threading
+import time
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from feedback.models import Feedback
+from services.models import Service
+
+from .log import listeners, prune
+from .models import Change, Tombstone
+from .sync import decode_watermark, encode_watermark
+from .views import ChangeStreamView
+
+
+def parse_events(body):
+    """[(id, event, data)] for the events of an SSE body, skipping comments"""
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((int(fields['id']), fields['event'], fields['data']))
+    return events
+
+
+@override_settings(CHANGES_WSGI_STREAM_SECONDS=0.2, CHANGES_STREAM_SECONDS=0.2, CHANGES_POLL_SECONDS=0.05)
+class ChangeStreamTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('staff', password='pw', is_staff=True))
+
+    def make_changes(self):
+        feedback = Feedback.objects.create(name='A', email='a@example.com', rating=4, review='Fine')
+        feedback.rating = 5
+        feedback.save()
+        service = Service.objects.create(name='S', description='d', image='https://example.com/a.jpg', features=[])
+        pk = feedback.pk
+        feedback.delete()
+        return pk, service.pk
+
+    def stream(self, last_event_id=None):
+        headers = {'Accept': 'text/event-stream'}
+        if last_event_id is not None:
+            headers['Last-Event-ID'] = str(last_event_id)
+        response = self.client.get('/api/changes/stream', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return b''.join(response.streaming_content).decode()
+
+    def test_requires_staff(self):
+        self.client.logout()
+        self.assertIn(self.client.get('/api/changes/stream').status_code, (401, 403))
+
+    def test_writes_are_logged_in_order(self):
+        feedback, service = self.make_changes()
+        self.assertEqual(list(Change.objects.values_list('model', 'object_id', 'op')), [
+            ('feedback', feedback, 'create'),
+            ('feedback', feedback, 'update'),
+            ('services', service, 'create'),
+            ('feedback', feedback, 'delete'),
+        ])
+        self.assertTrue(Tombstone.objects.filter(model='feedback.feedback', object_id=feedback).exists())
+
+    def test_changes_are_written_in_the_write_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks, transaction.atomic():
+            feedback = Feedback.objects.create(name='A', email='a@example.com', rating=4, review='Fine')
+            Service.objects.filter(pk=0).update(name='Nobody')
+            # Logged before the commit; the commit only wakes the streams
+            self.assertEqual(list(Change.objects.values_list('object_id', 'op')), [(feedback.pk, 'create')])
+        self.assertEqual(callbacks, [listeners.notify])
+
+    def test_rolled_back_writes_are_not_logged(self):
+        service = Service.objects.create(name='S', description='d', image='https://example.com/a.jpg', features=[])
+        logged = list(Change.objects.all())
+        for write in [
+            lambda: Feedback.objects.create(name='A', email='a@example.com', rating=4, review='Fine'),
+            lambda: Service.objects.filter(pk=service.pk).update(name='Renamed'),
+            lambda: Service.objects.bulk_create([
+                Service(name='B', description='d', image='https://example.com/a.jpg', features=[]),
+            ]),
+            lambda: Service.objects.get(pk=service.pk).delete(),
+        ]:
+            with self.captureOnCommitCallbacks() as callbacks:
+                with self.assertRaises(DatabaseError), transaction.atomic():
+                    write()
+                    self.assertGreater(Change.objects.count(), len(logged))
+                    raise DatabaseError('rolled back')
+            self.assertEqual(list(Change.objects.all()), logged)
+            self.assertEqual(callbacks, [])
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_commit_wakes_sleeping_streams(self):
+        timer = threading.Timer(0.1, listeners.notify)
+        timer.start()
+        started = time.monotonic()
+        listeners.sleep(5)
+        self.assertLess(time.monotonic() - started, 2)
+
+        async def asleep():
+            timer = threading.Timer(0.1, listeners.notify)
+            timer.start()
+            await listeners.asleep(5)
+
+        started = time.monotonic()
+        async_to_sync(asleep)()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(listeners.waiters, set())
+
+    def test_new_client_starts_at_the_end(self):
+        self.make_changes()
+        body = self.stream()
+        self.assertTrue(body.startswith('retry: 3000\n\n'))
+        self.assertEqual(parse_events(body), [])
+
+    def test_resume_with_last_event_id(self):
+        self.make_changes()
+        ids = list(Change.objects.values_list('id', flat=True))
+        events = parse_events(self.stream(last_event_id=ids[0] - 1))
+        self.assertEqual([event_id for event_id, _, _ in events], ids)
+        self.assertEqual({event for _, event, _ in events}, {'change'})
+
+        resumed = parse_events(self.stream(last_event_id=ids[1]))
+        self.assertEqual([event_id for event_id, _, _ in resumed], ids[2:])
+        self.assertIn('"op": "create"', resumed[0][2])
+        self.assertIn('"op": "delete"', resumed[1][2])
+
+    def test_resume_with_query_parameter(self):
+        self.make_changes()
+        last = Change.objects.order_by('id').values_list('id', flat=True)[2]
+        response = self.client.get(f'/api/changes/stream?last_event_id={last}')
+        events = parse_events(b''.join(response.streaming_content).decode())
+        self.assertEqual([event_id for event_id, _, _ in events], [last + 1])
+
+    def test_changes_during_the_stream_are_sent(self):
+        self.make_changes()
+        last = Change.objects.order_by('-id').values_list('id', flat=True)[0]
+        view = ChangeStreamView()
+        stream = view.stream(last, 0.5)
+        self.assertEqual(next(stream), 'retry: 3000\n\n')
+        Service.objects.create(name='Late', description='d', image='https://example.com/a.jpg', features=[])
+        events = parse_events(''.join(stream))
+        self.assertEqual([(event_id, event) for event_id, event, _ in events], [(last + 1, 'change')])
+
+    def test_pruned_position_gets_reset(self):
+        self.make_changes()
+        Change.objects.update(created_at=timezone.now() - timedelta(days=30))
+        self.assertEqual(prune(), (3, 0))
+        latest = Change.objects.get().id
+        events = parse_events(self.stream(last_event_id=1))
+        self.assertEqual(events, [(latest, 'reset', '{}')])
+
+    def test_position_from_another_database_gets_reset(self):
+        self.make_changes()
+        events = parse_events(self.stream(last_event_id=10 ** 6))
+        self.assertEqual([event for _, event, _ in events], ['reset'])
+
+    def test_invalid_last_event_id(self):
+        response = self.client.get('/api/changes/stream', headers={'Last-Event-ID': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CHANGES_BULK_LIMIT=3)
+    def test_large_bulk_write_logs_one_reset(self):
+        Service.objects.bulk_create([
+            Service(name=f'S{i}', description='d', image='https://example.com/a.jpg', features=[])
+            for i in range(5)
+        ])
+        self.assertEqual(list(Change.objects.values_list('model', 'object_id', 'op')),
+                         [('services', None, 'reset')])
+
+    @override_settings(CHANGES_STREAM_SECONDS=60, CHANGES_WSGI_STREAM_SECONDS=0.2)
+    def test_wsgi_stream_ends_before_worker_timeout(self):
+        started = time.monotonic()
+        self.stream()
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_async_stream_resumes_like_sync(self):
+        self.make_changes()
+        first = Change.objects.order_by('id').values_list('id', flat=True)[0]
+
+        async def collect():
+            return ''.join([chunk async for chunk in ChangeStreamView().astream(first, 0.2)])
+
+        self.assertEqual(parse_events(async_to_sync(collect)()), parse_events(self.stream(last_event_id=first)))
+
+
+def feedback(name, approved=True):
+    return Feedback.objects.create(name=name, email=f'{name.lower()}@example.com', rating=5,
+                                   review='Good', approved=approved)
+
+
+@override_settings(DELTA_SYNC_LAG_SECONDS=0)
+class DeltaSyncTests(TestCase):
+    def delta(self, since=None, path='/api/feedback/delta/'):
+        response = self.client.get(path, {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def sync_all(self, since=None):
+        """Follow the watermarks until more is false; return (upserted ids, deleted ids, watermark)"""
+        upserts, deleted = [], []
+        while True:
+            data = self.delta(since)
+            upserts += [row['id'] for row in data['upserts']]
+            deleted += data['deleted']
+            since = data['watermark']
+            if not data['more']:
+                return upserts, deleted, since
+
+    def test_first_sync_returns_every_visible_row(self):
+        rows = [feedback(f'F{i}') for i in range(3)]
+        feedback('Pending', approved=False)
+        data = self.delta()
+        self.assertEqual([row['id'] for row in data['upserts']], [row.pk for row in rows])
+        self.assertEqual((data['deleted'], data['more'], data['reset']), ([], False, False))
+        # Public rows are serialized like the list
+        self.assertNotIn('email', data['upserts'][0])
+
+    def test_delta_reports_upserts_deletes_and_hidden_rows(self):
+        kept, edited, deleted, hidden = (feedback(name) for name in ('Kept', 'Edited', 'Deleted', 'Hidden'))
+        watermark = self.delta()['watermark']
+
+        edited.review = 'Better'
+        edited.save()
+        created = feedback('Created')
+        deleted_pk = deleted.pk
+        deleted.delete()
+        Feedback.objects.filter(pk=hidden.pk).update(approved=False)
+        # Created and hidden after the last sync: the client never had it
+        unseen = feedback('Unseen')
+        Feedback.objects.filter(pk=unseen.pk).update(approved=False)
+
+        data = self.delta(watermark)
+        self.assertEqual(sorted(row['id'] for row in data['upserts']), sorted([edited.pk, created.pk]))
+        self.assertEqual(data['deleted'], sorted([deleted_pk, hidden.pk]))
+        self.assertFalse(data['more'])
+
+        # Nothing changed since
+        data = self.delta(data['watermark'])
+        self.assertEqual((data['upserts'], data['deleted']), ([], []))
+
+    def test_pages_follow_watermarks_without_gaps(self):
+        rows = [feedback(f'F{i}') for i in range(7)]
+        # One UPDATE gives every row the same updated_at: the id breaks the tie
+        Feedback.objects.update(rating=4)
+        with override_settings(DELTA_SYNC_LIMIT=3):
+            first = self.delta()
+            self.assertTrue(first['more'])
+            self.assertEqual(len(first['upserts']), 3)
+            upserts, deleted, watermark = self.sync_all()
+        self.assertEqual(upserts, [row.pk for row in rows])
+        self.assertEqual(deleted, [])
+        self.assertIsNone(decode_watermark(watermark)[1])
+
+    def test_deletes_between_pages_are_reported(self):
+        rows = [feedback(f'F{i}') for i in range(4)]
+        watermark = self.delta()['watermark']
+        Feedback.objects.filter(pk__in=[row.pk for row in rows[:3]]).update(rating=4)
+        doomed = rows[3].pk
+        rows[3].delete()
+        with override_settings(DELTA_SYNC_LIMIT=2):
+            upserts, deleted, _ = self.sync_all(watermark)
+        self.assertEqual(upserts, [row.pk for row in rows[:3]])
+        self.assertEqual(deleted, [doomed])
+
+    @override_settings(DELTA_SYNC_LAG_SECONDS=60)
+    def test_recent_writes_wait_for_the_lag(self):
+        feedback('Fresh')
+        data = self.delta()
+        self.assertEqual(data['upserts'], [])
+        since = decode_watermark(data['watermark'])[0]
+        self.assertLess(since, timezone.now() - timedelta(seconds=59))
+
+    def test_expired_watermark_resets(self):
+        feedback('F')
+        old = encode_watermark(timezone.now() - timedelta(days=365), None)
+        data = self.delta(old)
+        self.assertTrue(data['reset'])
+        self.assertEqual(len(data['upserts']), 1)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/feedback/delta/', {'since': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/feedback/', {'updated_since': 'yesterday'}).status_code, 400)
+
+    def test_updated_since_filter(self):
+        old = feedback('Old')
+        Feedback.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        new = feedback('New')
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.get('/api/feedback/', {'updated_since': since, 'pagination': 'page'})
+        self.assertEqual([row['id'] for row in response.json()['results']], [new.pk])
+
+    def test_staff_delta_includes_unapproved_rows(self):
+        pending = feedback('Pending', approved=False)
+        self.client.force_login(User.objects.create_user('staff', password='pw', is_staff=True))
+        data = self.delta()
+        self.assertEqual([row['id'] for row in data['upserts']], [pending.pk])
+        self.assertIn('email', data['upserts'][0])
+
+    def test_content_endpoints_have_delta(self):
+        service = Service.objects.create(name='S', description='d', image='https://example.com/a.jpg', features=[])
+        watermark = self.delta(path='/api/services/delta/')['watermark']
+        service_pk = service.pk
+        service.delete()
+        data = self.delta(watermark, path='/api/services/delta/')
+        self.assertEqual(data['deleted'], [service_pk])
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import ChangeStreamView
+
+urlpatterns = [
+    path('stream', ChangeStreamView.as_view(), name='change-stream'),
+]
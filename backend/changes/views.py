@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from core.renderers import EventStreamRenderer, JSONRenderer
+
+from .log import Cursor, astart_position, listeners, reset_event, start_position
+
+HEARTBEAT = ': keep-alive\n\n'
+
+
+class ChangeStreamView(APIView):
+    """
+    Server-sent events for every write to the content models.
+
+    Each response streams for ``CHANGES_STREAM_SECONDS`` and then ends; the
+    client reconnects with ``Last-Event-ID`` and resumes where it stopped.
+    Under ASGI the stream is an async generator, so open streams do not hold
+    a thread. Under WSGI a stream holds a sync worker, so it ends after
+    ``CHANGES_WSGI_STREAM_SECONDS`` instead, inside gunicorn's ``--timeout``.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+
+    def get(self, request, *args, **kwargs):
+        last_event_id = self.get_last_event_id(request)
+        if settings.ASGI:
+            stream = self.astream(last_event_id, settings.CHANGES_STREAM_SECONDS)
+        else:
+            stream = self.stream(last_event_id, settings.CHANGES_WSGI_STREAM_SECONDS)
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def get_last_event_id(self, request):
+        # EventSource sends the header on reconnect; the parameter is for the first connect
+        value = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({'last_event_id': 'Expected an event id.'})
+
+    def stream(self, last_event_id, seconds):
+        position, reset = start_position(last_event_id)
+        yield f'retry: {settings.CHANGES_RETRY_MS}\n\n'
+        if reset:
+            yield reset_event(position)
+        cursor = Cursor(position)
+        deadline = time.monotonic() + seconds
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            events = cursor.poll()
+            if events:
+                yield ''.join(events)
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= settings.CHANGES_HEARTBEAT_SECONDS:
+                # Lets proxies keep the connection and reveals closed clients
+                yield HEARTBEAT
+                last_sent = time.monotonic()
+            if len(events) < settings.CHANGES_BATCH_SIZE:
+                listeners.sleep(settings.CHANGES_POLL_SECONDS)
+
+    async def astream(self, last_event_id, seconds):
+        position, reset = await astart_position(last_event_id)
+        yield f'retry: {settings.CHANGES_RETRY_MS}\n\n'
+        if reset:
+            yield reset_event(position)
+        cursor = Cursor(position)
+        deadline = time.monotonic() + seconds
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            events = await cursor.apoll()
+            if events:
+                yield ''.join(events)
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= settings.CHANGES_HEARTBEAT_SECONDS:
+                yield HEARTBEAT
+                last_sent = time.monotonic()
+            if len(events) < settings.CHANGES_BATCH_SIZE:
+                await listeners.asleep(settings.CHANGES_POLL_SECONDS)
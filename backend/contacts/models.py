@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, list_indexes
 
 class Contact(BaseModel):
     full_name = models.CharField(max_length=100)
@@ -12,6 +12,7 @@ class Contact(BaseModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = list_indexes(ordering, ['country', 'company'])
     
     def __str__(self):
         return f"{self.full_name} - {self.email}"
\ No newline at end of file
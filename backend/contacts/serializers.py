@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from core.sparse import DynamicFieldsMixin
 from .models import Contact
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Contact
         fields = ['id', 'full_name', 'email', 'phone', 'company', 
@@ -0,0 +1,52 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from jobs.registry import task
+from .models import Contact
+
+logger = logging.getLogger(__name__)
+
+
+def build_notification(contact):
+    subject = f"New Contact Inquiry from {contact.full_name}"
+    message = f"""
+            New contact inquiry received:
+            
+            Name: {contact.full_name}
+            Email: {contact.email}
+            Phone: {contact.phone}
+            Company: {contact.company}
+            Country: {contact.country}
+            Job Title: {contact.job_title}
+            
+            Details:
+            {contact.job_details}
+            """
+    return EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [settings.EMAIL_HOST_USER])
+
+
+@task('contacts.notify_admin', batch=True)
+def notify_admin(payloads):
+    """Email the admin about new contact inquiries over a single SMTP connection"""
+    if not settings.EMAIL_HOST_USER:
+        logger.warning('EMAIL_HOST_USER is not set; skipping %s contact notification(s)', len(payloads))
+        return [None] * len(payloads)
+
+    contacts = Contact.objects.in_bulk([payload['contact_id'] for payload in payloads])
+    errors = []
+    with get_connection() as connection:
+        for payload in payloads:
+            contact = contacts.get(payload['contact_id'])
+            if contact is None:
+                # Deleted before the notification went out
+                errors.append(None)
+                continue
+            try:
+                connection.send_messages([build_notification(contact)])
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+    return errors
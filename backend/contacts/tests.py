@@ -0,0 +1,85 @@
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from jobs.models import Job
+from jobs.worker import Worker
+
+from .models import Contact
+
+CONTACT = {
+    'full_name': 'Ada Lovelace',
+    'email': 'ada@example.com',
+    'company': 'Analytical Engines',
+    'country': 'United Kingdom',
+    'job_details': 'We would like a demo.',
+}
+
+
+@override_settings(EMAIL_HOST_USER='admin@example.com')
+class ContactNotificationTests(TestCase):
+    """Contact notifications go through the job queue; Django's test runner uses the locmem email backend"""
+
+    def setUp(self):
+        # Throttle counters live in the cache
+        cache.clear()
+
+    def submit(self, **overrides):
+        response = self.client.post('/api/contacts/', {**CONTACT, **overrides}, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response
+
+    def test_create_queues_notification_without_sending(self):
+        self.submit()
+        contact = Contact.objects.get()
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'contacts.notify_admin')
+        self.assertEqual(job.payload, {'contact_id': contact.pk})
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(mail.outbox, [])
+
+    def test_worker_sends_notification(self):
+        self.submit()
+        self.assertEqual(Worker().run_once(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.subject, 'New Contact Inquiry from Ada Lovelace')
+        self.assertEqual(message.to, ['admin@example.com'])
+        self.assertIn('We would like a demo.', message.body)
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+    def test_batch_is_sent_together(self):
+        for i in range(3):
+            self.submit(full_name=f'Person {i}', email=f'person{i}@example.com')
+        self.assertEqual(Worker().run_once(), 3)
+        self.assertEqual(sorted(message.subject for message in mail.outbox), [
+            f'New Contact Inquiry from Person {i}' for i in range(3)
+        ])
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
+
+    def test_deleted_contact_is_skipped(self):
+        self.submit()
+        Contact.objects.all().delete()
+        Worker().run_once()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+    @override_settings(EMAIL_HOST_USER='')
+    def test_no_recipient_configured(self):
+        self.submit()
+        with self.assertLogs('contacts.tasks', 'WARNING'):
+            Worker().run_once()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+                       EMAIL_HOST='127.0.0.1', EMAIL_PORT=1, EMAIL_USE_TLS=False)
+    def test_send_failure_is_retried(self):
+        self.submit()
+        with self.assertLogs('jobs.worker', 'WARNING'):
+            Worker().run_once()
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, job.created_at)
+        self.assertIn('Error', job.last_error)
@@ -1,18 +1,28 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
+from changes.sync import DeltaSyncMixin, UpdatedSinceFilter
+from core.conditional import ConditionalGetMixin
+from core.fast import FastListMixin
+from core.search import FullTextSearchFilter
+from core.sparse import SparseFieldsetMixin
+from core.throttling import EmailCreateThrottle, IPCreateThrottle
 from .models import Contact
 from .serializers import ContactSerializer
+from .tasks import notify_admin
 
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, DeltaSyncMixin,
+                     viewsets.ModelViewSet):
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, UpdatedSinceFilter]
     filterset_fields = ['country', 'company']
     search_fields = ['full_name', 'email', 'company', 'job_details']
     ordering_fields = ['created_at', 'full_name']
+    pagination_mode = 'cursor'
+    throttle_classes = [IPCreateThrottle, EmailCreateThrottle]
+    throttle_scope = 'contact'
     
     def get_permissions(self):
         if self.action == 'create':
@@ -24,34 +34,12 @@ class ContactViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        contact = serializer.save()
-        
-        # Send email notification to admin
-        try:
-            subject = f"New Contact Inquiry from {contact.full_name}"
-            message = f"""
-            New contact inquiry received:
-            
-            Name: {contact.full_name}
-            Email: {contact.email}
-            Phone: {contact.phone}
-            Company: {contact.company}
-            Country: {contact.country}
-            Job Title: {contact.job_title}
-            
-            Details:
-            {contact.job_details}
-            """
-            
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [settings.EMAIL_HOST_USER],
-                fail_silently=True,
-            )
-        except Exception as e:
-            print(f"Failed to send email: {e}")
+        # Notify the admin from the job queue instead of holding the request
+        # open for an SMTP round trip (see `manage.py runworker`). The job row
+        # is written in the same transaction, so no inquiry is ever lost.
+        with transaction.atomic():
+            contact = serializer.save()
+            notify_admin.delay(contact_id=contact.pk)
         
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
\ No newline at end of file
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+
+    def ready(self):
+        from . import cache  # noqa: F401  (registers invalidation receivers)
+        from . import sqlite  # noqa: F401  (applies the SQLite PRAGMAs)
+        from .search import create_search_indexes
+
+        post_migrate.connect(create_search_indexes, sender=self)
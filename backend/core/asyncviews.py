@@ -0,0 +1,102 @@
+"""
+Async list/retrieve for the public ViewSets under ASGI.
+
+When ``settings.ASGI`` is on (set by ``ai_solutions/asgi.py``), the view
+function of a ViewSet using AsyncReadMixin is a coroutine. Anonymous GET
+list/retrieve requests are dispatched to ``alist``/``aretrieve``, which read
+through the async ORM (``acount``, ``aaggregate``, ``afirst``, ``async for``)
+and the async cache API; the mixins in core.cache, core.conditional and
+core.fast provide async twins of their ``list``/``retrieve``. Every other
+request, such as writes, authenticated and profiled requests, runs the
+regular synchronous view through ``sync_to_async``. Under WSGI the mixin
+does nothing.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from rest_framework.response import Response
+
+from .metrics import time_serialization
+from .profiling import wants_profile
+
+ASYNC_ACTIONS = ('list', 'retrieve')
+
+
+class AsyncReadMixin:
+    """ViewSet mixin serving anonymous list/retrieve natively async under ASGI"""
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ASGI or actions.get('get') not in ASYNC_ACTIONS:
+            return view
+        sync_view = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            if not cls.serves_async(request):
+                return await sync_view(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.action_map = {**actions, 'head': actions['get']}
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        # Keep cls, initkwargs, actions and csrf_exempt for routers and middleware
+        async_view.__dict__.update(view.__dict__)
+        return async_view
+
+    @classmethod
+    def serves_async(cls, request):
+        """Anonymous reads that need no synchronous work before the queries"""
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if 'HTTP_AUTHORIZATION' in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return False
+        return not wants_profile(request)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """APIView.dispatch() awaiting the a<action> handler"""
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            self.initial(request, *args, **kwargs)
+            response = await getattr(self, f'a{self.action}')(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is None:
+            page = [obj async for obj in queryset]
+            return Response(await sync_to_async(self.serialize)(page, many=True))
+        return self.get_paginated_response(await sync_to_async(self.serialize)(page, many=True))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await sync_to_async(self.serialize)(instance))
+
+    def serialize(self, instance, many=False):
+        # Serializer fields may query (e.g. SrcsetField), so this runs in a thread
+        with time_serialization():
+            return self.get_serializer(instance, many=many).data
+
+    async def aget_object(self):
+        """get_object() through the async ORM"""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
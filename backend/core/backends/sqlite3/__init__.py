@@ -0,0 +1 @@
+# SQLite backend for the concurrent profile
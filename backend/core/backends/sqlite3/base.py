@@ -0,0 +1,15 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend whose transactions take the write lock up front.
+
+    A deferred ``BEGIN`` starts as a reader and upgrades on its first write;
+    when two such transactions both try to upgrade, SQLite fails one with
+    "database is locked" without waiting on busy_timeout. ``BEGIN
+    IMMEDIATE`` queues writers on busy_timeout instead.
+    """
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
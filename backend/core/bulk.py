@@ -0,0 +1,108 @@
+"""
+Bulk create/update/delete for ModelViewSets.
+
+``POST``, ``PATCH`` and ``DELETE`` on ``<prefix>/bulk/`` take a JSON list.
+Every item is validated before anything is written; if any item is invalid
+nothing is written and the response is a list of per-item errors aligned
+with the request (``{}`` for items that were valid). Valid payloads are
+written in a single transaction with bulk_create/bulk_update.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+
+class BulkModelViewSetMixin:
+    bulk_max_items = 1000
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'detail': 'Expected a list of items.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.bulk_max_items:
+            return Response({'detail': f'At most {self.bulk_max_items} items per request.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        handler = {
+            'POST': self.bulk_create,
+            'PATCH': self.bulk_update,
+            'DELETE': self.bulk_destroy,
+        }[request.method]
+        return handler(items)
+
+    def bulk_create(self, items):
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        objs = [model(**attrs) for attrs in serializer.validated_data]
+        with transaction.atomic():
+            objs = model._default_manager.bulk_create(objs)
+        data = self.get_serializer(objs, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, items):
+        ids = [self._coerce_pk(item.get('id')) if isinstance(item, dict) else None for item in items]
+        # Read under row locks in the write's transaction, so a concurrent
+        # write between the read and bulk_update() cannot be overwritten
+        with transaction.atomic():
+            instances = self.get_queryset().select_for_update().in_bulk([pk for pk in ids if pk is not None])
+
+            errors, serializers, fields, seen = [], [], {'updated_at'}, set()
+            for pk, item in zip(ids, items):
+                serializer = None
+                if pk is None:
+                    errors.append({'id': ['A valid id is required.']})
+                elif pk in seen:
+                    errors.append({'id': ['Duplicate id.']})
+                elif pk not in instances:
+                    errors.append({'id': ['Not found.']})
+                else:
+                    serializer = self.get_serializer(instances[pk], data=item, partial=True)
+                    if serializer.is_valid():
+                        errors.append({})
+                        fields.update(serializer.validated_data)
+                    else:
+                        errors.append(serializer.errors)
+                seen.add(pk)
+                serializers.append(serializer)
+            if any(errors):
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+            now = timezone.now()
+            objs = []
+            for serializer in serializers:
+                instance = serializer.instance
+                for attr, value in serializer.validated_data.items():
+                    setattr(instance, attr, value)
+                # bulk_update() does not apply auto_now
+                instance.updated_at = now
+                objs.append(instance)
+            self.get_queryset().model._default_manager.bulk_update(objs, sorted(fields))
+        return Response(self.get_serializer(objs, many=True).data)
+
+    def bulk_destroy(self, items):
+        submitted = [item.get('id') if isinstance(item, dict) else item for item in items]
+        ids = [self._coerce_pk(value) for value in submitted]
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=[pk for pk in ids if pk is not None])
+            existing = set(queryset.values_list('pk', flat=True))
+            queryset.delete()
+        results = []
+        for value, pk in zip(submitted, ids):
+            if pk is None:
+                results.append({'id': value, 'status': 'invalid'})
+            else:
+                results.append({'id': pk, 'status': 'deleted' if pk in existing else 'not_found'})
+        return Response(results)
+
+    def _coerce_pk(self, value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
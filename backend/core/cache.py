@@ -0,0 +1,187 @@
+"""
+Versioned response cache for the public read-only API actions.
+
+Every cached response key embeds a per-model version number. Writes never
+delete cache entries; they bump the version instead, so stale entries are
+simply never looked up again and expire on their own.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.http import parse_http_date_safe
+
+from .compression import compress, is_compressible, negotiate
+from .conditional import apply_conditional
+from .models import BaseModel
+from .routers import mark_changed
+from .signals import bulk_changed
+
+KEY_PREFIX = 'api'
+
+
+def _version_key(model):
+    return f'{KEY_PREFIX}:version:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    """Return the current cache version for a model"""
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses old keys
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_model_version(model):
+    """get_model_version() through the async cache API"""
+    key = _version_key(model)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_model_version(model):
+    """Invalidate every cached response built from a model"""
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    mark_changed(model)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_on_write(sender, **kwargs):
+    if issubclass(sender, BaseModel):
+        bump_model_version(sender)
+
+
+@receiver(bulk_changed)
+def invalidate_on_bulk_write(sender, **kwargs):
+    bump_model_version(sender)
+
+
+class CachedResponseMixin:
+    """
+    Serve anonymous list/retrieve responses from the cache.
+
+    The cache key covers the model version, the negotiated media type, the
+    route and the normalised query string. Compressed bodies are kept in the
+    entry per Content-Encoding, see core.compression.
+    """
+    cache_timeout = None
+    cached_headers = ('ETag', 'Last-Modified', 'Cache-Control')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
+
+    def is_cacheable(self, request):
+        return request.method == 'GET' and not request.user.is_authenticated
+
+    def get_cache_key(self, request, version):
+        query = sorted(request.query_params.lists())
+        raw = f'{request.path}?{query}'
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        label = self.queryset.model._meta.label_lower
+        media_type = request.accepted_renderer.media_type
+        return f'{KEY_PREFIX}:response:{label}:{version}:{media_type}:{digest}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(request, get_model_version(self.queryset.model))
+        entry = cache.get(key)
+        if entry is not None:
+            response, added = self.response_from_entry(request, entry)
+            if added:
+                cache.set(key, entry, self.get_cache_timeout())
+            return response
+        return self.store_on_render(request, key, handler(request, *args, **kwargs))
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return await handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(request, await aget_model_version(self.queryset.model))
+        entry = await cache.aget(key)
+        if entry is not None:
+            response, added = self.response_from_entry(request, entry)
+            if added:
+                await cache.aset(key, entry, self.get_cache_timeout())
+            return response
+        return self.store_on_render(request, key, await handler(request, *args, **kwargs))
+
+    def store_on_render(self, request, key, response):
+        """Cache a successful response once it has been rendered"""
+        if response.status_code != 200:
+            return response
+
+        # Django renders responses of async views in a thread too, so the
+        # synchronous cache API is safe here
+        def store(rendered):
+            entry = {
+                'content': rendered.content,
+                'content_type': rendered['Content-Type'],
+                'headers': {
+                    header: rendered[header]
+                    for header in self.cached_headers if rendered.has_header(header)
+                },
+                'encoded': {},
+            }
+            self.precompress(request, rendered, entry)
+            cache.set(key, entry, self.get_cache_timeout())
+
+        response.add_post_render_callback(store)
+        return response
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is None:
+            return settings.API_CACHE_TIMEOUT
+        return self.cache_timeout
+
+    def precompress(self, request, response, entry):
+        """
+        Attach the body compressed for this client, from the entry when it
+        has it. Return True if the entry gained a new encoding.
+        """
+        encoding = negotiate(request)
+        if encoding is None or not is_compressible(request, response):
+            return False
+        encoded = entry.setdefault('encoded', {})
+        added = encoding not in encoded
+        if added:
+            encoded[encoding] = compress(encoding, entry['content'])
+        response.precompressed = (encoding, encoded[encoding])
+        return added
+
+    def response_from_entry(self, request, entry):
+        """The response for a cache entry, and whether the entry gained an encoding"""
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        for header, value in entry['headers'].items():
+            response[header] = value
+        if 'ETag' in entry['headers']:
+            # Validators were stored with the body, so 304s cost no query either
+            last_modified = parse_http_date_safe(entry['headers'].get('Last-Modified'))
+            response = apply_conditional(request, entry['headers']['ETag'], last_modified, response)
+        added = response.status_code == 200 and self.precompress(request, response, entry)
+        return response, added
@@ -0,0 +1,124 @@
+"""
+Content-Encoding for API responses.
+
+Responses under ``/api/`` of at least ``COMPRESSION_MIN_SIZE`` bytes are
+compressed with the best codec the client accepts: Brotli or zstd when their
+packages are installed, otherwise gzip. Responses from the response cache
+carry their compressed bodies in the cache entry, so a hot list is
+compressed once per codec rather than once per request.
+"""
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/msgpack', 'text/')
+
+
+def _gzip(content, level):
+    # mtime=0 keeps the output, and so cached entries, deterministic
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def _brotli(content, level):
+    return brotli.compress(content, quality=level)
+
+
+def _zstd(content, level):
+    return zstandard.ZstdCompressor(level=level).compress(content)
+
+
+# In order of preference when the client accepts several equally
+CODECS = {
+    name: compress
+    for name, compress, module in (('br', _brotli, brotli), ('zstd', _zstd, zstandard),
+                                   ('gzip', _gzip, gzip))
+    if module is not None
+}
+
+
+def compress(encoding, content):
+    return CODECS[encoding](content, settings.COMPRESSION_LEVELS[encoding])
+
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate(request):
+    """The codec to use for the request, or None for identity"""
+    accepted = parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    default = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for name in CODECS:
+        q = accepted.get(name, default)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible_path(request):
+    # Token responses stay uncompressed: compressing secrets next to
+    # request-controlled input enables BREACH-style attacks
+    return (request.path.startswith(settings.COMPRESSION_PATH_PREFIX)
+            and not request.path.startswith(settings.COMPRESSION_EXCLUDE_PREFIXES))
+
+
+def is_compressible(request, response):
+    if not is_compressible_path(request):
+        return False
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+    if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+        return False
+    return len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+
+def encode_response(response, encoding, body):
+    """Switch a response to a compressed body"""
+    response.content = body
+    response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(body))
+    # The compressed bytes are a different representation of the same entity
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = f'W/{etag}'
+    return response
+
+
+def encode_not_modified(request, response):
+    """
+    Give a 304 the weak ETag of the compressed representation when that is
+    what the client revalidated, as the 200 would have carried it.
+    """
+    etag = response.get('ETag')
+    if not etag or not etag.startswith('"') or not is_compressible_path(request):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if f'W/{etag}' in request.META.get('HTTP_IF_NONE_MATCH', '') and negotiate(request):
+        response['ETag'] = f'W/{etag}'
+    return response
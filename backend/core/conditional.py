@@ -0,0 +1,136 @@
+"""
+Conditional GET support (ETag / Last-Modified) for list and detail actions.
+
+Validators are computed from BaseModel.updated_at with a single aggregate
+query, so a matching If-None-Match or If-Modified-Since is answered with
+304 Not Modified before anything is serialized. Keyset (cursor) pages are
+validated by their own rows instead, read with the same index seek as the
+page, so they never need a COUNT or MAX over the whole table.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8'))
+    return f'"{digest.hexdigest()}"'
+
+
+def to_timestamp(value):
+    return timegm(value.utctimetuple()) if value is not None else None
+
+
+def apply_conditional(request, etag, last_modified, response=None):
+    """Return a 304 response if the request validators match, else response"""
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=response
+    )
+    if response is None and conditional is not None and conditional.status_code == 304:
+        # A 304 carries the validators the 200 would have sent (RFC 9110 15.4.5)
+        conditional['ETag'] = etag
+        if last_modified is not None:
+            conditional['Last-Modified'] = http_date(last_modified)
+    return conditional
+
+
+class ConditionalGetMixin:
+    """Send ETag/Last-Modified on list/retrieve and honour conditional requests"""
+
+    def list(self, request, *args, **kwargs):
+        last_modified, state = self.get_list_validators(self.filter_queryset(self.get_queryset()))
+        return self.conditional_response(super().list, last_modified, state, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.get_retrieve_queryset(kwargs)
+        last_modified = queryset.values_list('updated_at', flat=True).first()
+        if last_modified is None:
+            # Missing object: let the normal code path produce the 404
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            super().retrieve, last_modified, 1, request, *args, **kwargs
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        last_modified, state = await self.aget_list_validators(self.filter_queryset(self.get_queryset()))
+        return await self.aconditional_response(super().alist, last_modified, state, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        queryset = self.get_retrieve_queryset(kwargs)
+        last_modified = await queryset.values_list('updated_at', flat=True).afirst()
+        if last_modified is None:
+            return await super().aretrieve(request, *args, **kwargs)
+        return await self.aconditional_response(
+            super().aretrieve, last_modified, 1, request, *args, **kwargs
+        )
+
+    def get_list_validators(self, queryset):
+        """(last modified, state) of a list: its row count, or a cursor page's (pk, updated_at) rows"""
+        page = self.get_cursor_page(queryset)
+        if page is not None:
+            return self.page_validators(list(page.values_list('pk', 'updated_at')))
+        validators = queryset.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        return validators['last_modified'], validators['count']
+
+    async def aget_list_validators(self, queryset):
+        page = self.get_cursor_page(queryset)
+        if page is not None:
+            return self.page_validators([row async for row in page.values_list('pk', 'updated_at')])
+        validators = await queryset.aaggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        return validators['last_modified'], validators['count']
+
+    def get_cursor_page(self, queryset):
+        """The rows of the requested keyset page (plus the one that detects more), or None"""
+        get_cursor_queryset = getattr(self.paginator, 'get_cursor_queryset', None)
+        if get_cursor_queryset is None:
+            return None
+        return get_cursor_queryset(queryset, self.request, self)
+
+    def page_validators(self, rows):
+        # The page's keys change with any insert or delete that moves it
+        return max((updated_at for _, updated_at in rows), default=None), [pk for pk, _ in rows]
+
+    def get_retrieve_queryset(self, kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+
+    def get_etag(self, request, last_modified, state):
+        return make_etag(
+            self.queryset.model._meta.label_lower,
+            state,
+            last_modified.isoformat() if last_modified else '',
+            request.path,
+            sorted(request.query_params.lists()),
+            request.accepted_renderer.media_type,
+            self.get_serializer_class().__name__,
+        )
+
+    def conditional_response(self, handler, last_modified, state, request, *args, **kwargs):
+        etag = self.get_etag(request, last_modified, state)
+        timestamp = to_timestamp(last_modified)
+        not_modified = apply_conditional(request, etag, timestamp)
+        if not_modified is not None:
+            return self.add_validators(not_modified, etag, timestamp)
+        return self.add_validators(handler(request, *args, **kwargs), etag, timestamp)
+
+    async def aconditional_response(self, handler, last_modified, state, request, *args, **kwargs):
+        etag = self.get_etag(request, last_modified, state)
+        timestamp = to_timestamp(last_modified)
+        not_modified = apply_conditional(request, etag, timestamp)
+        if not_modified is not None:
+            return self.add_validators(not_modified, etag, timestamp)
+        return self.add_validators(await handler(request, *args, **kwargs), etag, timestamp)
+
+    def add_validators(self, response, etag, timestamp):
+        # A 304 repeats the validators and Cache-Control of the 200 (RFC 9110 15.4.5)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,188 @@
+"""
+Compiled read-only serialization for list responses.
+
+A ModelSerializer builds a field per attribute per row and goes through
+get_attribute()/to_representation() for every value. For plain model fields
+that work can be precomputed once per serializer: the list is read with
+``values_list()`` and each row is turned into a dict by a fixed sequence of
+converters. The output is identical to the serializer's; fields the compiler
+does not understand (method fields, nested or dotted sources) make the view
+fall back to the regular serializer. A field with a
+``get_list_converter(context)`` method supplies its converter per response,
+so per-request lookups (e.g. SrcsetField's srcset map) run once per list.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, fields as drf_fields
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .metrics import time_serialization
+
+
+class Unsupported(Exception):
+    pass
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        return value if isinstance(value, str) else value.isoformat()
+    return convert
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _choice_converter(field):
+    lookup = field.choice_strings_to_values
+
+    def convert(value):
+        if value == '':
+            return value
+        return lookup.get(str(value), value)
+    return convert
+
+
+def get_converter(field):
+    """Return a callable replicating field.to_representation, or None for identity"""
+    # Order matters: several DRF fields subclass CharField/IntegerField
+    if isinstance(field, drf_fields.ChoiceField):
+        return _choice_converter(field)
+    if isinstance(field, drf_fields.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, drf_fields.DateField):
+        return _date_converter(field)
+    if isinstance(field, drf_fields.BooleanField):
+        return bool
+    if isinstance(field, drf_fields.JSONField) and not field.binary:
+        return None
+    if type(field) in (drf_fields.CharField, drf_fields.EmailField, drf_fields.URLField,
+                       drf_fields.IntegerField, drf_fields.ReadOnlyField):
+        # The database already returns str/int for these columns
+        return None
+    return field.to_representation
+
+
+class CompiledSerializer:
+    """Row -> dict converter compiled from a (trimmed) serializer instance"""
+
+    def __init__(self, serializer, model):
+        self.keys, self.sources, self.converters = [], [], []
+        # {position: field} for converters bound per response, see bind()
+        self.contextual = {}
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            if source == '*' or '.' in source:
+                raise Unsupported(name)
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                raise Unsupported(name)
+            if not model_field.concrete or model_field.is_relation:
+                raise Unsupported(name)
+            if hasattr(field, 'get_list_converter'):
+                self.contextual[len(self.keys)] = field
+            self.keys.append(name)
+            self.sources.append(model_field.attname)
+            self.converters.append(get_converter(field))
+        # Several fields may read the same column (e.g. image and srcset)
+        self.columns = list(dict.fromkeys(self.sources))
+        self.positions = [self.columns.index(source) for source in self.sources]
+
+    def bind(self, context):
+        """The converters for one response, given its serializer context"""
+        if not self.contextual:
+            return self.converters
+        converters = list(self.converters)
+        for position, field in self.contextual.items():
+            converters[position] = field.get_list_converter(context)
+        return converters
+
+    def to_representation(self, row, converters=None):
+        return {
+            key: value if convert is None or value is None else convert(value)
+            for key, convert, value in zip(
+                self.keys, converters or self.converters, [row[i] for i in self.positions]
+            )
+        }
+
+    def rows(self, queryset, extra=()):
+        """values_list() rows with the serialized columns first, then extra ones"""
+        names = self.columns + [name for name in extra if name not in self.columns]
+        return queryset.values_list(*names, named=True)
+
+
+_compiled = {}
+
+
+def compile_serializer(serializer, model):
+    """Return a cached CompiledSerializer for this field layout, or None"""
+    key = (type(serializer), model, tuple(serializer.fields))
+    if key not in _compiled:
+        try:
+            _compiled[key] = CompiledSerializer(serializer, model)
+        except Unsupported:
+            _compiled[key] = None
+    return _compiled[key]
+
+
+class FastListMixin:
+    """Serve ``list`` through the compiled serializer when possible"""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        compiled = compile_serializer(self.get_serializer(), queryset.model)
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.get_rows(compiled, queryset)
+        page = self.paginate_queryset(rows)
+        data = self.represent(compiled, list(rows if page is None else page))
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        compiled = compile_serializer(self.get_serializer(), queryset.model)
+        if compiled is None:
+            return await super().alist(request, *args, **kwargs)
+
+        rows = self.get_rows(compiled, queryset)
+        page = await self.apaginate_queryset(rows)
+        if page is None:
+            rows = [row async for row in rows]
+        # Converters such as SrcsetField may query, so they run in a thread
+        data = await sync_to_async(self.represent)(compiled, rows if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def get_rows(self, compiled, queryset):
+        # Keyset pagination reads pk and the sort keys from each row
+        extra = ['pk'] + [name.lstrip('-') for name in queryset.model._meta.ordering]
+        return compiled.rows(queryset, extra)
+
+    def represent(self, compiled, rows):
+        with time_serialization():
+            converters = compiled.bind(self.get_serializer_context())
+            return [compiled.to_representation(row, converters) for row in rows]
@@ -0,0 +1,181 @@
+import json
+import logging
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.cache import bump_model_version
+from core.synthetic import generate, row_values
+from core.utils import get_api_views, get_api_viewsets
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every API endpoint in-process through the Django test client '
+        'against a scratch test database seeded at one or more scales, and save '
+        'latency percentiles, throughput, query counts and peak memory as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, action='append',
+                            help='Rows per model; repeat for several scales (default 1000)')
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=5,
+                            help='Untimed requests per endpoint before timing')
+        parser.add_argument('--cold', action='store_true',
+                            help='Invalidate the response cache before every request')
+        parser.add_argument('--endpoint', action='append', default=[],
+                            help='Only run endpoints whose name contains this (repeatable)')
+        parser.add_argument('--output', help='JSON results file (default benchmarks/api-<timestamp>.json)')
+        parser.add_argument('--compare', help='Previous results file to compare against')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 2:
+            raise CommandError('--iterations must be at least 2')
+        scales = sorted(set(options['rows'] or [1000]))
+        baseline = json.loads(Path(options['compare']).read_text()) if options['compare'] else None
+        # 4xx responses while probing for the right client are expected
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+
+        # A throwaway database: seeding millions of rows must not touch real data
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.anonymous = Client(SERVER_NAME='localhost')
+            self.staff = Client(SERVER_NAME='localhost')
+            self.staff.force_login(User.objects.create_user('benchmark', is_staff=True))
+            results = []
+            for rows in scales:
+                started = time.perf_counter()
+                self.seed(rows)
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f'{rows} rows per model (seeded in {time.perf_counter() - started:.1f}s)'
+                ))
+                for endpoint in self.endpoints(options['endpoint']):
+                    result = {'rows': rows, **self.measure(endpoint, options)}
+                    results.append(result)
+                    self.report(result, baseline)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = Path(options['output'] or f"benchmarks/api-{timezone.now():%Y%m%d-%H%M%S}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({'meta': self.meta(options), 'results': results}, indent=2) + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+    def meta(self, options):
+        return {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'cache': settings.CACHES['default']['BACKEND'],
+            'iterations': options['iterations'],
+            'warmup': options['warmup'],
+            'cold': options['cold'],
+        }
+
+    def models(self):
+        return [viewset.queryset.model for viewset in get_api_viewsets()]
+
+    def seed(self, rows):
+        for model in self.models():
+            generate(model, rows)
+
+    def endpoints(self, names):
+        """Yield (name, method, path, client, payload) for every API endpoint"""
+        endpoints = []
+        for viewset, prefix in get_api_viewsets().items():
+            model = viewset.queryset.model
+            label = prefix.strip('/').split('/')[-1]
+            pk = model._default_manager.values_list('pk', flat=True).first()
+            endpoints.append((f'{label} list', 'GET', prefix, None))
+            if getattr(viewset, 'search_fields', None):
+                endpoints.append((f'{label} search', 'GET', f'{prefix}?search=platform', None))
+            endpoints.append((f'{label} retrieve', 'GET', f'{prefix}{pk}/', None))
+            endpoints.append((f'{label} create', 'POST', prefix, row_values(model, 0)))
+        for view, path in get_api_views().items():
+            endpoints.append((path.strip('/').split('/')[-1], 'GET', path, None))
+
+        for name, method, path, payload in endpoints:
+            if names and not any(part in name for part in names):
+                continue
+            # Measure as an anonymous visitor wherever the API allows it
+            client = self.anonymous
+            if method != 'GET' or client.get(path).status_code in (401, 403):
+                client = self.staff
+            yield name, method, path, client, payload
+
+    def request(self, endpoint):
+        name, method, path, client, payload = endpoint
+        if method == 'GET':
+            return client.get(path)
+        return client.post(path, payload, content_type='application/json')
+
+    def measure(self, endpoint, options):
+        for _ in range(options['warmup']):
+            self.request(endpoint)
+
+        latencies = []
+        for _ in range(options['iterations']):
+            if options['cold']:
+                for model in self.models():
+                    bump_model_version(model)
+            started = time.perf_counter()
+            response = self.request(endpoint)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        # Queries and memory come from one extra request, so their
+        # instrumentation does not skew the timings above
+        if options['cold']:
+            for model in self.models():
+                bump_model_version(model)
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            self.request(endpoint)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        quantiles = statistics.quantiles(latencies, n=100)
+        name, method, path, client, payload = endpoint
+        return {
+            'endpoint': name,
+            'method': method,
+            'path': path,
+            'status': response.status_code,
+            'p50_ms': round(quantiles[49], 3),
+            'p95_ms': round(quantiles[94], 3),
+            'p99_ms': round(quantiles[98], 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'throughput_rps': round(len(latencies) / (sum(latencies) / 1000), 1),
+            'queries': len(queries),
+            'peak_memory_kib': round(peak / 1024, 1),
+            'response_bytes': len(response.content),
+        }
+
+    def report(self, result, baseline):
+        line = (
+            f"  {result['endpoint']:<20} {result['status']} p50={result['p50_ms']:8.2f}ms "
+            f"p95={result['p95_ms']:8.2f}ms p99={result['p99_ms']:8.2f}ms "
+            f"{result['throughput_rps']:8.1f}/s queries={result['queries']:<3} "
+            f"peak={result['peak_memory_kib']:8.1f}KiB"
+        )
+        previous = None
+        if baseline:
+            previous = next((r for r in baseline['results']
+                             if r['rows'] == result['rows'] and r['endpoint'] == result['endpoint']), None)
+        if previous:
+            change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100
+            line += f' p50 {change:+.1f}% vs baseline'
+        self.stdout.write(self.style.ERROR(line) if result['status'] >= 400 else line)
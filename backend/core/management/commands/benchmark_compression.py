@@ -0,0 +1,78 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.compression import CODECS
+from core.synthetic import generate
+from core.utils import get_api_viewsets
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Render a page of every list endpoint and report, per available codec '
+        '(gzip, and Brotli/zstd when installed), the bytes saved against the CPU '
+        'time spent compressing'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20,
+                            help='Rows per response, e.g. the page size (seeded in a rolled-back transaction)')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Timing repetitions; the best run is reported')
+        parser.add_argument('--level', action='append', default=[], metavar='CODEC=LEVEL',
+                            help='Override a level from COMPRESSION_LEVELS, e.g. br=11 (repeatable)')
+
+    def handle(self, *args, **options):
+        levels = dict(settings.COMPRESSION_LEVELS)
+        for override in options['level']:
+            codec, _, level = override.partition('=')
+            levels[codec] = int(level)
+
+        totals = {codec: [0, 0, 0.0] for codec in CODECS}
+        try:
+            with transaction.atomic():
+                for viewset in get_api_viewsets():
+                    model = viewset.queryset.model
+                    generate(model, options['rows'])
+                    queryset = model._default_manager.all()[:options['rows']]
+                    content = JSONRenderer().render(viewset.serializer_class(queryset, many=True).data)
+                    for codec, compress in CODECS.items():
+                        elapsed, body = self.best_of(options['repeat'], compress, content, levels[codec])
+                        self.report(str(model._meta.verbose_name_plural), codec, levels[codec],
+                                    len(content), len(body), elapsed)
+                        totals[codec][0] += len(content)
+                        totals[codec][1] += len(body)
+                        totals[codec][2] += elapsed
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(self.style.MIGRATE_HEADING('All endpoints'))
+        for codec, (raw, compressed, elapsed) in totals.items():
+            self.report('total', codec, levels[codec], raw, compressed, elapsed)
+
+    def best_of(self, repeat, compress, content, level):
+        best = None
+        for _ in range(repeat):
+            start = time.process_time()
+            body = compress(content, level)
+            elapsed = time.process_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
+
+    def report(self, name, codec, level, raw, compressed, elapsed):
+        saved = raw - compressed
+        # Bytes saved per millisecond of CPU: how much each ms of compression buys
+        efficiency = saved / 1024 / (elapsed * 1000) if elapsed else float('inf')
+        self.stdout.write(
+            f'{name:<16} {codec:<4} level={level:<2} {raw:>9}B -> {compressed:>8}B '
+            f'({compressed / raw:6.1%}) cpu={elapsed * 1000:7.3f}ms '
+            f'saved={saved / 1024:8.1f}KiB {efficiency:8.1f}KiB/cpu-ms'
+        )
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.fast import compile_serializer
+from core.synthetic import generate
+from core.utils import get_api_viewsets, get_serializer_classes
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the compiled read-path serializer with the ModelSerializer of '
+        'every viewset: check the rendered JSON is byte-identical and time both'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Rows per model to serialize (seeded in a rolled-back transaction)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timing repetitions; the best run is reported')
+
+    def handle(self, *args, **options):
+        failures = []
+        try:
+            with transaction.atomic():
+                for viewset in get_api_viewsets():
+                    for serializer_class in get_serializer_classes(viewset):
+                        if not self.compare(viewset.queryset.model, serializer_class, options):
+                            failures.append(serializer_class.__name__)
+                raise Rollback
+        except Rollback:
+            pass
+        if failures:
+            raise CommandError(f"Output differs for: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('Compiled output is byte-identical for every serializer'))
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def compare(self, model, serializer_class, options):
+        generate(model, options['rows'])
+        queryset = model._default_manager.all()[:options['rows']]
+        renderer = JSONRenderer()
+        compiled = compile_serializer(serializer_class(), model)
+        name = serializer_class.__name__
+        if compiled is None:
+            self.stdout.write(f'{name}: not compilable, skipped')
+            return True
+
+        def standard():
+            return renderer.render(serializer_class(list(queryset), many=True).data)
+
+        def fast():
+            return renderer.render([compiled.to_representation(row) for row in compiled.rows(queryset)])
+
+        standard_time, expected = self.best_of(options['repeat'], standard)
+        fast_time, actual = self.best_of(options['repeat'], fast)
+        identical = expected == actual
+        line = (
+            f'{name:<28} rows={options["rows"]:<6} serializer={standard_time * 1000:8.1f}ms '
+            f'compiled={fast_time * 1000:8.1f}ms speedup={standard_time / fast_time:5.1f}x '
+            f'identical={identical}'
+        )
+        self.stdout.write(self.style.SUCCESS(line) if identical else self.style.ERROR(line))
+        return identical
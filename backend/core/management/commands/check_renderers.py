@@ -0,0 +1,118 @@
+import datetime
+import decimal
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework import renderers
+
+from core.renderers import JSONRenderer, MessagePackRenderer, msgpack, orjson
+from core.synthetic import generate
+from core.utils import get_api_viewsets, get_serializer_classes
+
+# Values the fast encoders handle differently from the stdlib one unless told to
+EDGE_CASES = {
+    'datetime': datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    'naive_datetime': datetime.datetime(2025, 1, 2, 3, 4, 5),
+    'date': datetime.date(2025, 1, 2),
+    'time': datetime.time(12, 30),
+    'duration': datetime.timedelta(hours=1, seconds=3),
+    'decimal': decimal.Decimal('4.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'int_keys': {5: 10, 4: 3},
+    'unicode': 'caf\u00e9 \u2603 line\u2028separator\u2029',
+    'big_int': 2 ** 70,
+    'float': 0.1 + 0.2,
+    'tuple': (1, 'two'),
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Check that the orjson and MessagePack renderers decode to exactly the '
+        'same data as DRF\'s stdlib JSONRenderer for every API serializer, and '
+        'time them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200,
+                            help='Rows per model to render (seeded in a rolled-back transaction)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timing repetitions; the best run is reported')
+
+    def handle(self, *args, **options):
+        self.reference = renderers.JSONRenderer()
+        self.candidates = {'json': JSONRenderer()}
+        if msgpack is not None:
+            self.candidates['msgpack'] = MessagePackRenderer()
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed: JSON uses the stdlib fallback'))
+        if msgpack is None:
+            self.stdout.write(self.style.WARNING('msgpack is not installed: MessagePack skipped'))
+
+        failures = []
+        for key, value in EDGE_CASES.items():
+            # One at a time: a value orjson rejects sends the whole payload to the fallback
+            if not self.compare(f'edge case: {key}', {key: value}, options, only=['json']):
+                failures.append(f'edge case: {key}')
+        try:
+            with transaction.atomic():
+                for viewset in get_api_viewsets():
+                    model = viewset.queryset.model
+                    generate(model, options['rows'])
+                    instances = list(model._default_manager.all()[:options['rows']])
+                    for serializer_class in get_serializer_classes(viewset):
+                        name = serializer_class.__name__
+                        if not self.compare(name, serializer_class(instances, many=True).data, options):
+                            failures.append(name)
+                        if not self.compare(f'{name} (detail)', serializer_class(instances[0]).data, options):
+                            failures.append(f'{name} (detail)')
+                raise Rollback
+        except Rollback:
+            pass
+        if failures:
+            raise CommandError(f"Decoded output differs for: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('Every renderer decodes to the stdlib JSON output'))
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def decode(self, format, content):
+        if format == 'msgpack':
+            return msgpack.unpackb(content, raw=False)
+        return json.loads(content)
+
+    def compare(self, name, data, options, only=None):
+        reference_time, reference = self.best_of(options['repeat'], lambda: self.reference.render(data))
+        expected = json.loads(reference)
+        ok = True
+        for format, renderer in self.candidates.items():
+            if only and format not in only:
+                continue
+            elapsed, content = self.best_of(options['repeat'], lambda: renderer.render(data))
+            if content == reference:
+                outcome = 'identical bytes'
+            elif self.decode(format, content) == expected:
+                outcome = 'identical data'
+            else:
+                outcome = 'DIFFERENT'
+                ok = False
+            line = (
+                f'{name:<36} {format:<8} stdlib={reference_time * 1000:7.2f}ms '
+                f'{format}={elapsed * 1000:7.2f}ms speedup={reference_time / elapsed:5.1f}x '
+                f'size={len(content):>8}B {outcome}'
+            )
+            self.stdout.write(self.style.ERROR(line) if outcome == 'DIFFERENT' else line)
+        return ok
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.util import find_spec
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    '/api/services/',
+    '/api/articles/',
+    '/api/articles/?pagination=cursor&fields=id,title,author',
+    '/api/articles/1/',
+    '/api/feedback/',
+    '/api/projects/',
+]
+
+SERVERS = {
+    'wsgi': ['ai_solutions.wsgi'],
+    'asgi': ['ai_solutions.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve a seeded scratch SQLite database with gunicorn sync workers (WSGI) '
+        'and with uvicorn workers (ASGI), drive both with the same concurrent '
+        'anonymous reads over HTTP, and compare throughput and latency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['wsgi', 'asgi', 'both'], default='both')
+        parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+        parser.add_argument('--concurrency', type=int, default=64, help='Requests in flight at once')
+        parser.add_argument('--requests', type=int, default=2000, help='Timed requests per server')
+        parser.add_argument('--scale', type=float, default=0.1,
+                            help='generate_data --scale for the scratch database')
+        parser.add_argument('--path', action='append', default=[],
+                            help='Request path, used round-robin (repeatable; default: public lists and a detail)')
+        parser.add_argument('--no-cache', action='store_true',
+                            help='Disable the response cache (API_CACHE_TIMEOUT=0) so every request queries')
+        parser.add_argument('--port', type=int, help='Port to serve on (default: a free port)')
+
+    def handle(self, *args, **options):
+        servers = ['wsgi', 'asgi'] if options['server'] == 'both' else [options['server']]
+        if 'asgi' in servers and find_spec('uvicorn') is None:
+            self.stdout.write(self.style.WARNING('uvicorn is not installed: ASGI skipped'))
+            servers.remove('asgi')
+        if not servers:
+            raise CommandError('No server to run')
+        paths = options['path'] or DEFAULT_PATHS
+        if options['port'] is None:
+            options['port'] = self.free_port()
+
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py')]
+        with tempfile.TemporaryDirectory() as scratch:
+            env = {
+                **os.environ,
+                'DATABASE_URL': f'sqlite:///{scratch}/servers.sqlite3',
+                'DATABASE_REPLICA_URLS': '',
+                'SQLITE_CONCURRENT': 'True',
+                'DEBUG': 'False',
+                'ALLOWED_HOSTS': '127.0.0.1',
+            }
+            if options['no_cache']:
+                env['API_CACHE_TIMEOUT'] = '0'
+            subprocess.run(manage + ['migrate', '--run-syncdb', '-v', '0'], env=env, check=True)
+            subprocess.run(manage + ['generate_data', '--scale', str(options['scale'])],
+                           env=env, check=True, stdout=subprocess.DEVNULL)
+
+            for server in servers:
+                result = self.run_server(server, paths, env, options)
+                line = (
+                    f"{server:<5} workers={options['workers']:<3} concurrency={options['concurrency']:<4} "
+                    f"requests={result['requests']:<6} throughput={result['throughput']:7.1f}/s "
+                    f"p50={result['p50']:6.1f}ms p95={result['p95']:7.1f}ms p99={result['p99']:7.1f}ms "
+                    f"errors={result['errors']}"
+                )
+                self.stdout.write(self.style.WARNING(line) if result['errors'] else self.style.SUCCESS(line))
+
+    def run_server(self, server, paths, env, options):
+        command = [
+            sys.executable, '-m', 'gunicorn', *SERVERS[server],
+            '--workers', str(options['workers']), '--bind', f"127.0.0.1:{options['port']}",
+            '--log-level', 'warning',
+        ]
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            asyncio.run(self.wait_ready(options['port'], paths[0], process))
+            # Warm up every worker's connections, caches and compiled serializers
+            asyncio.run(self.load(options['port'], paths, options['workers'] * len(paths) * 2,
+                                  options['concurrency']))
+            started = time.perf_counter()
+            latencies, errors = asyncio.run(
+                self.load(options['port'], paths, options['requests'], options['concurrency'])
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            process.terminate()
+            process.wait()
+
+        quantiles = statistics.quantiles(sorted(latencies), n=100) if len(latencies) > 1 else [0.0] * 99
+        return {
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed,
+            'p50': quantiles[49],
+            'p95': quantiles[94],
+            'p99': quantiles[98],
+            'errors': errors,
+        }
+
+    def free_port(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    async def wait_ready(self, port, path, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'The server exited with status {process.returncode}')
+            try:
+                if await self.fetch(port, path) < 500:
+                    return
+            except OSError:
+                pass
+            await asyncio.sleep(0.2)
+        raise CommandError(f'The server did not answer within {timeout}s')
+
+    async def load(self, port, paths, total, concurrency):
+        latencies, errors = [], 0
+        issued = 0
+
+        async def client():
+            nonlocal issued, errors
+            while issued < total:
+                path = paths[issued % len(paths)]
+                issued += 1
+                started = time.perf_counter()
+                try:
+                    status = await self.fetch(port, path)
+                except OSError:
+                    status = None
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status is None or status >= 400:
+                    errors += 1
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return latencies, errors
+
+    async def fetch(self, port, path):
+        """GET path over a new connection and return the status code"""
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write(
+                f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept-Encoding: gzip\r\n'
+                f'Connection: close\r\n\r\n'.encode('ascii')
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            # Read the whole body, as a real client would
+            await reader.read()
+        finally:
+            writer.close()
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ConnectionResetError(f'Malformed response: {status_line!r}')
+        return int(parts[1])
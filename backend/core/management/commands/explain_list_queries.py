@@ -0,0 +1,111 @@
+import re
+from itertools import combinations
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from core.utils import get_api_viewsets
+
+# SQLite: "SCAN table" without an index, "USE TEMP B-TREE FOR ORDER BY"
+# PostgreSQL: "Seq Scan on table", "Sort" nodes
+FULL_SCAN_RE = re.compile(r'\bSCAN \S+$|\bSCAN \S+ (?!USING)|Seq Scan on', re.MULTILINE)
+TEMP_SORT_RE = re.compile(r'USE TEMP B-TREE FOR (ORDER|GROUP) BY|(^|->\s+)Sort\b', re.MULTILINE)
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN for every viewset list query under each combination of '
+        'its filterset_fields and ordering_fields, and flag full-table scans '
+        'and temporary sorts'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--viewset', action='append', default=[],
+                            help='Only audit the named viewset class (repeatable)')
+        parser.add_argument('--max-filters', type=int, default=2,
+                            help='Largest number of filters combined in one query')
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help='Print the full plan of every query')
+        parser.add_argument('--strict', action='store_true',
+                            help='Exit with an error if any query is flagged')
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        flagged = total = 0
+        for viewset, prefix in get_api_viewsets().items():
+            if options['viewset'] and viewset.__name__ not in options['viewset']:
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{viewset.__name__} ({prefix})'))
+            seen = set()
+            for label, queryset in self.list_queries(viewset, prefix, options['max_filters']):
+                sql = str(queryset.query)
+                if sql in seen:
+                    continue
+                seen.add(sql)
+                total += 1
+                plan = queryset.explain()
+                flags = self.get_flags(plan)
+                if flags:
+                    flagged += 1
+                    self.stdout.write(self.style.WARNING(f"  {label}: {', '.join(flags)}"))
+                else:
+                    self.stdout.write(f'  {label}: ok')
+                if options['verbose_plans'] or flags:
+                    for line in plan.splitlines():
+                        self.stdout.write(f'      {line}')
+
+        summary = f'{total} list queries explained, {flagged} flagged'
+        if flagged and options['strict']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary) if not flagged else self.style.WARNING(summary))
+
+    def get_flags(self, plan):
+        flags = []
+        if FULL_SCAN_RE.search(plan):
+            flags.append('full table scan')
+        if TEMP_SORT_RE.search(plan):
+            flags.append('temp sort')
+        return flags
+
+    def list_queries(self, viewset, prefix, max_filters):
+        model = viewset.queryset.model
+        filter_fields = list(getattr(viewset, 'filterset_fields', None) or [])
+        orderings = [None]
+        for field in getattr(viewset, 'ordering_fields', None) or []:
+            orderings += [field, f'-{field}']
+        page_size = api_settings.PAGE_SIZE or 20
+
+        for user in (AnonymousUser(), User(username='audit', is_staff=True)):
+            who = 'staff' if user.is_authenticated else 'anonymous'
+            for size in range(min(max_filters, len(filter_fields)) + 1):
+                for fields in combinations(filter_fields, size):
+                    params = {field: self.sample_value(model, field) for field in fields}
+                    queryset = self.filtered_queryset(viewset, prefix, params, user)
+                    for ordering in orderings:
+                        ordered = queryset.order_by(ordering) if ordering else queryset
+                        filters = ', '.join(f'{k}={v}' for k, v in params.items()) or 'no filter'
+                        label = f"[{who}] {filters}; order by {ordering or 'Meta.ordering'}"
+                        yield label, ordered[:page_size]
+
+    def filtered_queryset(self, viewset, prefix, params, user):
+        request = Request(self.factory.get(prefix, params))
+        request.user = user
+        view = viewset(action='list', request=request, args=(), kwargs={}, format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def sample_value(self, model, name):
+        value = model._default_manager.values_list(name, flat=True).first()
+        if value is not None:
+            return str(value).lower() if isinstance(value, bool) else value
+        field = model._meta.get_field(name)
+        if field.choices:
+            return field.choices[0][0]
+        if isinstance(field, models.BooleanField):
+            return 'true'
+        if isinstance(field, models.IntegerField):
+            return 1
+        return 'sample'
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.synthetic import DEFAULT_COUNTS, MODELS, generate, get_model
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with deterministic synthetic content for load testing. '
+        'Rows are appended up to the target count, so reruns with a larger scale grow the dataset'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1,
+                            help='Multiplier for the default row counts '
+                                 f"({', '.join(f'{k}={v}' for k, v in DEFAULT_COUNTS.items())})")
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; same seed, same data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create')
+        parser.add_argument('--transaction-size', type=int, default=100000,
+                            help='Rows per committed transaction')
+        for name in MODELS:
+            parser.add_argument(f'--{name}', type=int, metavar='N',
+                                help=f'Target {name} rows (overrides --scale)')
+
+    def handle(self, *args, **options):
+        if options['scale'] < 0:
+            raise CommandError('--scale must not be negative')
+        started = time.perf_counter()
+        total = 0
+        for name in MODELS:
+            count = options[name]
+            if count is None:
+                count = round(DEFAULT_COUNTS[name] * options['scale'])
+            model = get_model(name)
+            model_started = time.perf_counter()
+            created = generate(
+                model, count, seed=options['seed'], batch_size=options['batch_size'],
+                transaction_size=options['transaction_size'],
+                progress=lambda done, name=name: self.stdout.write(f'  {name}: {done} rows', ending='\r'),
+            )
+            elapsed = time.perf_counter() - model_started
+            rate = f' ({created / elapsed:,.0f} rows/s)' if created else ''
+            self.stdout.write(f'{name}: {created} created, {count} target{rate}' + ' ' * 20)
+            total += created
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {total} rows in {time.perf_counter() - started:.1f}s'
+        ))
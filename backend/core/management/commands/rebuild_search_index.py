@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from core.search import get_search_backend, get_searchable_models
+
+
+class Command(BaseCommand):
+    help = 'Drop and rebuild the full-text search index of every searchable viewset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help='Database to rebuild (default: the primary)')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['database'])
+        for model, columns in get_searchable_models():
+            if backend is None:
+                self.stdout.write(f'Skipping {model._meta.label}: no full-text support on this database')
+                continue
+            backend.rebuild(model, columns)
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt search index for {model._meta.label} ({', '.join(columns)})"
+            ))
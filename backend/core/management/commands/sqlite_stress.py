@@ -0,0 +1,139 @@
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+
+
+class Command(BaseCommand):
+    help = (
+        'Run concurrent contact/feedback submissions and list reads from N worker '
+        'processes against a scratch SQLite database, and count "database is locked" '
+        'errors with the default and the SQLITE_CONCURRENT profile'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8,
+                            help='Worker processes, each like one gunicorn worker')
+        parser.add_argument('--requests', type=int, default=100,
+                            help='Requests per worker')
+        parser.add_argument('--read-ratio', type=float, default=0.5,
+                            help='Share of requests that are list reads')
+        parser.add_argument('--profile', choices=['default', 'concurrent', 'both'], default='both')
+        parser.add_argument('--strict', action='store_true',
+                            help='Exit with an error if the concurrent profile hits a lock error')
+        # Internal: run as one worker, starting once this file exists
+        parser.add_argument('--worker', metavar='START_FILE', help=argparse.SUPPRESS)
+        parser.add_argument('--worker-id', type=int, default=0, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            return self.run_worker(options)
+
+        profiles = ['default', 'concurrent'] if options['profile'] == 'both' else [options['profile']]
+        results = {profile: self.run_profile(profile, options) for profile in profiles}
+        for profile, result in results.items():
+            line = (
+                f"{profile:<10} workers={options['workers']:<3} requests={result['requests']:<6} "
+                f"throughput={result['throughput']:7.1f}/s p50={result['p50']:6.1f}ms "
+                f"p95={result['p95']:7.1f}ms locked={result['locked']:<5} other errors={result['errors']}"
+            )
+            failed = result['locked'] or result['errors']
+            self.stdout.write(self.style.WARNING(line) if failed else self.style.SUCCESS(line))
+
+        if options['strict'] and results.get('concurrent', {}).get('locked'):
+            raise CommandError('"database is locked" errors with SQLITE_CONCURRENT enabled')
+
+    def run_profile(self, profile, options):
+        manage = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py')]
+        with tempfile.TemporaryDirectory() as scratch:
+            env = {
+                **os.environ,
+                'DATABASE_URL': f'sqlite:///{scratch}/stress.sqlite3',
+                'DATABASE_REPLICA_URLS': '',
+                'SQLITE_CONCURRENT': str(profile == 'concurrent'),
+            }
+            subprocess.run(manage + ['migrate', '--run-syncdb', '-v', '0'], env=env, check=True)
+
+            start_file = Path(scratch) / 'start'
+            workers = [
+                subprocess.Popen(
+                    manage + [
+                        'sqlite_stress', '--worker', str(start_file), '--worker-id', str(i),
+                        '--requests', str(options['requests']),
+                        '--read-ratio', str(options['read_ratio']),
+                    ],
+                    env=env, stdout=subprocess.PIPE, text=True,
+                )
+                for i in range(options['workers'])
+            ]
+            # Start every worker at once, after Django has loaded in all of them
+            for worker in workers:
+                worker.stdout.readline()
+            start_file.touch()
+            started = time.perf_counter()
+            reports = [json.loads(worker.communicate()[0]) for worker in workers]
+            elapsed = time.perf_counter() - started
+
+        if any(worker.returncode for worker in workers):
+            raise CommandError(f'A {profile} worker exited with an error')
+        latencies = sorted(latency for report in reports for latency in report['latencies'])
+        quantiles = statistics.quantiles(latencies, n=100)
+        return {
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed,
+            'p50': quantiles[49],
+            'p95': quantiles[94],
+            'locked': sum(report['locked'] for report in reports),
+            'errors': sum(report['errors'] for report in reports),
+        }
+
+    def run_worker(self, options):
+        from django.test import Client
+
+        # Failures are counted below; keep request tracebacks out of the output
+        logging.disable(logging.ERROR)
+        client = Client(SERVER_NAME='localhost')
+        rng = random.Random(options['worker_id'])
+        report = {'locked': 0, 'errors': 0, 'latencies': []}
+        self.stdout.write('ready')
+        self.stdout.flush()
+        while not os.path.exists(options['worker']):
+            time.sleep(0.005)
+
+        for i in range(options['requests']):
+            # Distinct client addresses and emails keep the throttles out of the way
+            ident = f"{options['worker_id']}-{i}"
+            address = f"10.{options['worker_id'] % 256}.{i // 256 % 256}.{i % 256}"
+            started = time.perf_counter()
+            try:
+                if rng.random() < options['read_ratio']:
+                    path = rng.choice(['/api/feedback/', '/api/services/', '/api/bootstrap/'])
+                    response = client.get(path, REMOTE_ADDR=address)
+                elif rng.random() < 0.5:
+                    response = client.post('/api/contacts/', {
+                        'full_name': f'Stress {ident}', 'email': f'stress-{ident}@example.com',
+                        'country': 'Nowhere', 'job_details': 'Load test',
+                    }, content_type='application/json', REMOTE_ADDR=address)
+                else:
+                    response = client.post('/api/feedback/', {
+                        'name': f'Stress {ident}', 'email': f'stress-{ident}@example.com',
+                        'rating': rng.randint(1, 5), 'review': 'Load test',
+                    }, content_type='application/json', REMOTE_ADDR=address)
+                if response.status_code >= 400:
+                    report['errors'] += 1
+            except OperationalError as exc:
+                report['locked' if 'locked' in str(exc) else 'errors'] += 1
+            report['latencies'].append((time.perf_counter() - started) * 1000)
+
+        self.stdout.write(json.dumps(report))
@@ -0,0 +1,228 @@
+"""
+Per-request performance instrumentation.
+
+MetricsMiddleware wraps every database connection with an
+``execute_wrapper`` for the duration of a request, counting queries and
+their time, and serializers/renderers add their time through
+``time_serialization()``. The totals go out as a ``Server-Timing`` header
+and into per-route counters and latency histograms, served in Prometheus
+text format at ``/api/metrics/``.
+
+Each process accumulates into memory and adds its deltas to the cache with
+``cache.incr()`` at most every ``METRICS_FLUSH_SECONDS``, so with a shared
+cache backend the endpoint reports every worker, not just the one that
+answered the scrape.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import KEY_PREFIX
+
+slow_query_logger = logging.getLogger('core.slow_queries')
+
+METRICS_KEY = f'{KEY_PREFIX}:metrics'
+SERIES_KEY = f'{METRICS_KEY}:series'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# name: (type, help); *_seconds values are kept as integer microseconds
+METRICS = {
+    'api_requests_total': ('counter', 'Requests by route, method and status'),
+    'api_request_duration_seconds': ('histogram', 'Request latency by route'),
+    'api_db_queries_total': ('counter', 'Database queries by route'),
+    'api_db_duration_seconds_total': ('counter', 'Time spent in database queries by route'),
+    'api_serialize_duration_seconds_total': ('counter', 'Time spent serializing and rendering by route'),
+    'api_response_bytes_total': ('counter', 'Response body bytes by route'),
+    'api_slow_queries_total': ('counter', 'Queries slower than SLOW_QUERY_MS by route'),
+}
+
+current_request = ContextVar('current_request', default=None)
+
+
+def describe_view(request):
+    """'module.ViewClass.action' for the view handling the request"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return request.path
+    view = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    if view is None:
+        return match._func_path
+    name = f'{view.__module__}.{view.__qualname__}'
+    action = getattr(match.func, 'actions', {}).get(request.method.lower())
+    return f'{name}.{action}' if action else name
+
+
+class RequestMetrics:
+    """Query and serialization totals of one request"""
+
+    def __init__(self, request):
+        self.request = request
+        self.queries = 0
+        self.slow_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+                self.slow_queries += 1
+                slow_query_logger.warning(
+                    'Slow query (%.1f ms, %s) in %s: %s',
+                    elapsed * 1000, context['connection'].alias, describe_view(self.request), sql,
+                )
+
+    def server_timing(self, total, size):
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+            f'size;desc="{size} bytes"',
+        ])
+
+
+@contextmanager
+def time_serialization():
+    """Add the time spent in the block to the request's serialization time"""
+    metrics = current_request.get()
+    # Nested serializers and renderers are counted once, by the outermost block
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_time += time.perf_counter() - started
+        metrics.serializing = False
+
+
+def _micros(seconds):
+    return int(seconds * 1_000_000)
+
+
+def _cache_key(series):
+    return f"{METRICS_KEY}:{hashlib.md5(repr(series).encode()).hexdigest()}"
+
+
+class Registry:
+    """Process-local deltas, flushed into the cache"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = defaultdict(int)
+        self.flushed_at = time.monotonic()
+
+    def add(self, name, labels, value):
+        series = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.pending[series] += value
+
+    def observe(self, name, labels, seconds):
+        le = next((str(bound) for bound in LATENCY_BUCKETS if seconds <= bound), '+Inf')
+        self.add(f'{name}_bucket', {**labels, 'le': le}, 1)
+        self.add(f'{name}_count', labels, 1)
+        self.add(f'{name}_sum', labels, _micros(seconds))
+
+    def record(self, request, response, metrics, total, size):
+        match = getattr(request, 'resolver_match', None)
+        route = {'route': match.view_name if match else 'unmatched'}
+        self.add('api_requests_total', {**route, 'method': request.method,
+                                        'status': str(response.status_code)}, 1)
+        self.observe('api_request_duration_seconds', {**route, 'method': request.method}, total)
+        self.add('api_db_queries_total', route, metrics.queries)
+        self.add('api_db_duration_seconds_total', route, _micros(metrics.db_time))
+        self.add('api_serialize_duration_seconds_total', route, _micros(metrics.serialize_time))
+        self.add('api_response_bytes_total', route, size)
+        if metrics.slow_queries:
+            self.add('api_slow_queries_total', route, metrics.slow_queries)
+
+    def flush_due(self):
+        return time.monotonic() - self.flushed_at >= settings.METRICS_FLUSH_SECONDS
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, defaultdict(int)
+            self.flushed_at = time.monotonic()
+        if not pending:
+            return
+        # Re-read so series registered by other processes are kept
+        registered = cache.get(SERIES_KEY) or set()
+        if not pending.keys() <= registered:
+            cache.set(SERIES_KEY, registered | set(pending), None)
+        for series, value in pending.items():
+            key = _cache_key(series)
+            cache.add(key, 0, None)
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                cache.set(key, value, None)
+
+    def collect(self):
+        """{(name, labels): value} across every process that flushed"""
+        self.flush()
+        series = cache.get(SERIES_KEY) or set()
+        values = cache.get_many([_cache_key(item) for item in series])
+        return {item: values.get(_cache_key(item), 0) for item in series}
+
+
+registry = Registry()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(name, value):
+    if name.endswith(('_seconds_sum', '_seconds_total')):
+        return f'{value / 1_000_000:.6f}'
+    return str(value)
+
+
+def render_prometheus(samples):
+    """Prometheus text exposition format for collect() output"""
+    lines = []
+    for metric, (kind, help_text) in METRICS.items():
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+        if kind == 'counter':
+            for (name, labels), value in sorted(samples.items()):
+                if name == metric:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(name, value)}')
+            continue
+
+        # Buckets are stored per bucket; the exposition format is cumulative
+        buckets = defaultdict(list)
+        for (name, labels), value in samples.items():
+            if name == f'{metric}_bucket':
+                key = tuple(item for item in labels if item[0] != 'le')
+                buckets[key].append((labels, value))
+        for labels in sorted(buckets):
+            cumulative = 0
+            observed = {dict(item)['le']: value for item, value in buckets[labels]}
+            for bound in [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf']:
+                cumulative += observed.get(bound, 0)
+                lines.append(f'{metric}_bucket{_format_labels(labels + (("le", bound),))} {cumulative}')
+            for suffix in ('_sum', '_count'):
+                value = samples.get((f'{metric}{suffix}', labels), 0)
+                lines.append(f'{metric}{suffix}{_format_labels(labels)} '
+                             f'{_format_value(metric + suffix, value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,198 @@
+"""
+Project middleware. Each class works in both sync (WSGI) and async (ASGI)
+stacks, so running under ASGI never falls back to a thread per request.
+"""
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from .compression import compress, encode_not_modified, encode_response, is_compressible, negotiate
+from .metrics import RequestMetrics, current_request, registry
+from .profiling import arun_profiled, get_staff_user, run_profiled, wants_profile
+from .routers import replica_aliases, replica_reads
+
+PIN_COOKIE = 'db_pin'
+REPLICA_ACTIONS = ('list', 'retrieve')
+
+
+class Middleware:
+    """Base for middleware that runs natively in sync and async stacks"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            # Dispatch to __acall__ inside __call__ rather than swapping dunders
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.call(request)
+
+
+class ReplicaRoutingMiddleware(Middleware):
+    """
+    Route list/retrieve reads to replicas, with read-your-writes pinning.
+
+    A successful write sets a short-lived cookie; while it is present the
+    client's reads all go to the primary, so it sees its own changes.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.async_mode:
+            # Django hops to a thread for a sync process_view in async mode
+            self.process_view = self.aprocess_view
+
+    def call(self, request):
+        token = replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = replica_reads.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin(request, response)
+
+    def pin(self, request, response):
+        if (request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400
+                and replica_aliases()):
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.route(request, view_func)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.route(request, view_func)
+
+    def route(self, request, view_func):
+        if request.method in ('GET', 'HEAD') and PIN_COOKIE not in request.COOKIES:
+            replica_reads.set(self.reads_from_replica(request, view_func))
+
+    def reads_from_replica(self, request, view_func):
+        actions = getattr(view_func, 'actions', None)
+        if actions:
+            return actions.get(request.method.lower()) in REPLICA_ACTIONS
+        view_class = getattr(view_func, 'view_class', None)
+        return getattr(view_class, 'replica_reads', False)
+
+
+class MetricsMiddleware(Middleware):
+    """
+    Count queries, DB and serialization time and response size per request.
+
+    The totals are sent in a ``Server-Timing`` header and recorded per route
+    for ``/api/metrics/``. Queries slower than ``SLOW_QUERY_MS`` are logged
+    to ``core.slow_queries`` with the view that issued them.
+    """
+
+    def call(self, request):
+        metrics = RequestMetrics(request)
+        token = current_request.set(metrics)
+        started = time.perf_counter()
+        try:
+            with self.instrument(metrics):
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.record(request, response, metrics, time.perf_counter() - started)
+        if registry.flush_due():
+            registry.flush()
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics(request)
+        token = current_request.set(metrics)
+        started = time.perf_counter()
+        # Connections are per thread, and the ORM runs in the request's
+        # sync_to_async thread, so the wrappers are installed from there
+        stack = await sync_to_async(self.instrument)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            current_request.reset(token)
+        self.record(request, response, metrics, time.perf_counter() - started)
+        if registry.flush_due():
+            # The cache backend may be the database
+            await sync_to_async(registry.flush)()
+        return response
+
+    def instrument(self, metrics):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    def record(self, request, response, metrics, total):
+        size = 0 if response.streaming else len(response.content)
+        response['Server-Timing'] = metrics.server_timing(total, size)
+        registry.record(request, response, metrics, total, size)
+
+
+class ProfilingMiddleware(Middleware):
+    """Profile requests flagged with ``X-Profile`` or ``?profile=1`` by staff users"""
+
+    def call(self, request):
+        if wants_profile(request):
+            user = get_staff_user(request)
+            if user is not None:
+                return run_profiled(request, self.get_response, user)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if wants_profile(request):
+            user = await sync_to_async(get_staff_user)(request)
+            if user is not None:
+                return await arun_profiled(request, self.get_response, user)
+        return await self.get_response(request)
+
+
+class CompressionMiddleware(Middleware):
+    """
+    Compress API responses according to Accept-Encoding.
+
+    A view can hand over bytes it already compressed by setting
+    ``response.precompressed = (encoding, body)``.
+    """
+
+    def call(self, request):
+        return self.process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process(request, await self.get_response(request))
+
+    def process(self, request, response):
+        if response.status_code == 304:
+            return encode_not_modified(request, response)
+        if not is_compressible(request, response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        precompressed = getattr(response, 'precompressed', None)
+        if precompressed is not None:
+            return encode_response(response, *precompressed)
+        encoding = negotiate(request)
+        if encoding is None:
+            return response
+        body = compress(encoding, response.content)
+        if len(body) >= len(response.content):
+            return response
+        return encode_response(response, encoding, body)
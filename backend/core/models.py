@@ -1,10 +1,92 @@
-from django.db import models
+from django.apps import apps
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .signals import bulk_changed, pre_bulk_update
+
+# Content models whose writes are counted (stats) and logged (changes)
+TRACKED_MODELS = [
+    'services.Service',
+    'projects.Project',
+    'articles.Article',
+    'events.Event',
+    'feedback.Feedback',
+    'gallery.GalleryItem',
+    'contacts.Contact',
+]
+
+
+def is_tracked(model):
+    return model._meta.label in TRACKED_MODELS
+
+
+def tracked_models():
+    return [apps.get_model(label) for label in TRACKED_MODELS]
+
+
+class BaseQuerySet(models.QuerySet):
+    """QuerySet that reports bulk writes through the core.signals signals"""
+
+    def update(self, **kwargs):
+        # auto_now is not applied by UPDATE statements; keep updated_at honest
+        # because conditional GET validators are derived from it.
+        kwargs.setdefault('updated_at', timezone.now())
+        with transaction.atomic(using=self.db):
+            pre_bulk_update.send(sender=self.model, queryset=self, values=kwargs)
+            rows = super().update(**kwargs)
+            if rows:
+                bulk_changed.send(sender=self.model, action='update', values=kwargs)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            if objs:
+                bulk_changed.send(sender=self.model, action='bulk_create', objs=objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+            if rows:
+                bulk_changed.send(sender=self.model, action='bulk_update', objs=objs, fields=fields)
+        return rows
+
+
+def list_indexes(ordering, filter_fields=()):
+    """
+    Indexes for the API list access paths of a model.
+
+    Lists are sorted by Meta.ordering (with an id tie-breaker for keyset
+    pagination) and filtered by equality on the viewset's filterset_fields,
+    so index the sort key on its own and behind each filter field. Delta
+    sync and ?updated_since= read rows in (updated_at, id) order.
+    """
+    sort = ordering[0]
+    tie_breaker = '-id' if sort.startswith('-') else 'id'
+    indexes = [
+        models.Index(fields=[sort, tie_breaker], name='%(class)s_sort_idx'),
+        models.Index(fields=['updated_at', 'id'], name='%(class)s_updated_idx'),
+    ]
+    for field in filter_fields:
+        indexes.append(models.Index(fields=[field, sort], name=f'%(class)s_{field}_idx'))
+    return indexes
+
 
 class BaseModel(models.Model):
     """Base model with common fields"""
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BaseQuerySet.as_manager()
     
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # The row and what post_save receivers write for it (change log,
+        # counters) commit or roll back together
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
@@ -0,0 +1,187 @@
+"""
+Pagination classes for the API.
+
+PageNumberPagination needs a COUNT(*) and an OFFSET scan for every page,
+which degrades linearly on tables that only grow. KeysetPagination seeks
+straight to the next page using the model's Meta.ordering field plus an id
+tie-breaker and never counts rows.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination keyed on Meta.ordering[0] with an id tie-breaker"""
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.seek_queryset(queryset, request)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.seek_queryset(queryset, request)
+        return self.set_page([row async for row in queryset])
+
+    def seek_queryset(self, queryset, request):
+        """The queryset of the requested page plus one row to detect more"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.field, self.descending = self.get_ordering(queryset.model)
+        self.position, self.reverse = self.decode_cursor(request, queryset.model)
+
+        descending = self.descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}pk')
+        if self.position is not None:
+            queryset = queryset.filter(self.seek(descending, *self.position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+        self.page = results
+        return results
+
+    def get_ordering(self, model):
+        ordering = model._meta.ordering[0] if model._meta.ordering else '-pk'
+        return ordering.lstrip('-'), ordering.startswith('-')
+
+    def seek(self, descending, value, pk):
+        lookup = 'lt' if descending else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'pk__{lookup}': pk})
+        )
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            value, pk, reverse = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            value = model._meta.get_field(self.field).to_python(value)
+            return (value, int(pk)), bool(reverse)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = json.dumps([value, obj.pk, int(reverse)], separators=(',', ':'))
+        encoded = urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class ApiPagination(PageNumberPagination):
+    """
+    Page number pagination that can switch to keyset pagination.
+
+    Views choose their default with a ``pagination_mode`` attribute ('page'
+    or 'cursor'); clients can override it with ``?pagination=page|cursor``.
+    Passing a ``cursor`` parameter selects keyset pagination, except that a
+    ``?search=`` always gets page numbers: keyset order would replace the
+    relevance ordering of the results.
+    """
+    mode_query_param = 'pagination'
+    modes = ('page', 'cursor')
+
+    def get_mode(self, request, view):
+        if getattr(view, 'search_fields', None) and request.query_params.get(api_settings.SEARCH_PARAM):
+            return 'page'
+        if request.query_params.get(KeysetPagination.cursor_query_param):
+            return 'cursor'
+        mode = request.query_params.get(self.mode_query_param)
+        if mode in self.modes:
+            return mode
+        return getattr(view, 'pagination_mode', 'page')
+
+    def get_cursor_queryset(self, queryset, request, view=None):
+        """The unevaluated keyset page for request, or None in page mode"""
+        if self.get_mode(request, view) != 'cursor':
+            return None
+        return KeysetPagination().seek_queryset(queryset, request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.get_mode(request, view) == 'cursor':
+            self.keyset = KeysetPagination()
+            self.display_page_controls = False
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() with the COUNT and the page read through the async ORM"""
+        self.keyset = None
+        if self.get_mode(request, view) == 'cursor':
+            self.keyset = KeysetPagination()
+            self.display_page_controls = False
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.page.object_list = [row async for row in self.page.object_list]
+        self.request = request
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,142 @@
+"""
+On-demand profiling of single requests for staff users.
+
+A request with an ``X-Profile: 1`` header or ``?profile=1`` from a staff user
+(session or JWT) runs under cProfile. The stats are written to
+``PROFILE_DIR`` as ``<id>.prof`` (loadable with ``pstats`` or snakeviz) next
+to a ``<id>.json`` summary; only the newest ``PROFILE_MAX_FILES`` are kept.
+Requests without the flag only pay for the flag lookup.
+"""
+import cProfile
+import io
+import json
+import pstats
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .metrics import describe_view
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+PROFILE_ID = re.compile(r'^[0-9]{8}-[0-9]{12}-[0-9a-f]{6}$')
+TRUTHY = {'1', 'true', 'yes', 'on'}
+
+
+def is_truthy(value):
+    return value is not None and value.strip().lower() in TRUTHY
+
+
+def wants_profile(request):
+    """True for ``X-Profile`` or ``?profile=`` set to 1/true/yes/on; "0" or "false" do not profile"""
+    if is_truthy(request.META.get(PROFILE_HEADER)):
+        return True
+    # Cheap substring test first so normal requests never parse the query
+    return PROFILE_PARAM in request.META.get('QUERY_STRING', '') and is_truthy(request.GET.get(PROFILE_PARAM))
+
+
+def get_staff_user(request):
+    """The staff user behind a session or JWT, or None"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        user = result[0] if result else None
+    return user if user is not None and user.is_staff else None
+
+
+def profile_dir():
+    return Path(settings.PROFILE_DIR)
+
+
+def profile_path(profile_id, suffix):
+    if not PROFILE_ID.match(profile_id):
+        return None
+    return profile_dir() / f'{profile_id}{suffix}'
+
+
+def run_profiled(request, get_response, user):
+    """Call get_response under cProfile and save the profile"""
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        response = get_response(request)
+    finally:
+        profiler.disable()
+    return save_profile(request, response, profiler, time.perf_counter() - started, user)
+
+
+async def arun_profiled(request, get_response, user):
+    """
+    Await get_response under cProfile and save the profile. Other requests
+    running on the event loop meanwhile show up in the profile too.
+    """
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        response = await get_response(request)
+    finally:
+        profiler.disable()
+    return save_profile(request, response, profiler, time.perf_counter() - started, user)
+
+
+def save_profile(request, response, profiler, duration, user):
+    profile_id = f'{timezone.now():%Y%m%d-%H%M%S%f}-{uuid.uuid4().hex[:6]}'
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f'{profile_id}.prof')
+    summary = {
+        'id': profile_id,
+        'created_at': timezone.now().isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': describe_view(request),
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 3),
+        'user': user.get_username(),
+    }
+    (directory / f'{profile_id}.json').write_text(json.dumps(summary))
+    rotate()
+    response['X-Profile-Id'] = profile_id
+    return response
+
+
+def rotate():
+    """Delete all but the newest PROFILE_MAX_FILES profiles"""
+    # Ids start with a timestamp, so name order is age order
+    profiles = sorted(profile_dir().glob('*.prof'), reverse=True)
+    for path in profiles[settings.PROFILE_MAX_FILES:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.json').unlink(missing_ok=True)
+
+
+def list_profiles():
+    """Summaries of the stored profiles, newest first"""
+    summaries = []
+    for path in sorted(profile_dir().glob('*.json'), reverse=True):
+        try:
+            summary = json.loads(path.read_text())
+            summary['size'] = path.with_suffix('.prof').stat().st_size
+        except (OSError, ValueError):
+            # Rotated away by another process while listing
+            continue
+        summaries.append(summary)
+    return summaries
+
+
+def format_stats(path, sort='cumulative', limit=60):
+    """pstats text report of a stored profile"""
+    output = io.StringIO()
+    stats = pstats.Stats(str(path), stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
@@ -0,0 +1,84 @@
+"""
+Fast renderers registered in ``REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']``.
+
+JSONRenderer encodes with orjson when it is installed and falls back to
+DRF's stdlib encoder otherwise, or for output orjson does not produce
+(indented JSON, integers wider than 64 bits). MessagePackRenderer serves
+``application/msgpack`` when the msgpack package is installed. Both reuse
+DRF's JSONEncoder for values they cannot encode natively, so every renderer
+decodes to the same data; ``check_renderers`` verifies that.
+EventStreamRenderer lets views that stream server-sent events accept
+``text/event-stream``.
+"""
+import json
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+from .metrics import time_serialization
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+_encoder = encoders.JSONEncoder()
+
+
+def encode_default(value):
+    """Convert a value the native encoder does not handle, the way DRF would"""
+    return _encoder.default(value)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """orjson-backed JSONRenderer whose rendering counts as serialization time"""
+    if orjson is not None:
+        # Datetimes go through DRF's encoder, which formats them differently
+        orjson_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with time_serialization():
+            if (orjson is None or data is None or not self.compact or self.ensure_ascii
+                    or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+                return super().render(data, accepted_media_type, renderer_context)
+            try:
+                content = orjson.dumps(data, default=encode_default, option=self.orjson_options)
+            except orjson.JSONEncodeError:
+                return super().render(data, accepted_media_type, renderer_context)
+            # Same escaping as DRF: keep the output a strict JavaScript subset
+            return content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = MSGPACK_MEDIA_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        with time_serialization():
+            return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """
+    ``text/event-stream`` for server-sent event views. The events themselves
+    are streamed by the view; only error responses are rendered, as one
+    ``error`` event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return f'event: error\ndata: {json.dumps(data, cls=encoders.JSONEncoder)}\n\n'.encode()
@@ -0,0 +1,58 @@
+"""
+Primary/replica database routing.
+
+Writes always go to ``default``. Reads go to a random replica only while
+the ``replica_reads`` context variable is set, which ReplicaRoutingMiddleware
+does for list/retrieve requests from clients that have not written recently. Even
+then a model written in the last ``DATABASE_REPLICA_PIN_SECONDS`` is read
+from the primary, so a lagging replica never ends up in the response cache
+or behind an ETag.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set per request by core.middleware.ReplicaRoutingMiddleware
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def using_replicas():
+    return replica_reads.get() and bool(replica_aliases())
+
+
+def _changed_key(model):
+    return f'api:changed:{model._meta.label_lower}'
+
+
+def mark_changed(model):
+    """Read the model from the primary until replicas have caught up"""
+    if replica_aliases():
+        cache.set(_changed_key(model), time.time(), settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def recently_changed(model):
+    return cache.get(_changed_key(model)) is not None
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not using_replicas():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block or recently_changed(model):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replica_aliases())
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
@@ -0,0 +1,224 @@
+"""
+Ranked full-text search over a viewset's search_fields.
+
+SQLite gets an external-content FTS5 table per model, kept in sync by
+AFTER INSERT/UPDATE/DELETE triggers. PostgreSQL gets a GIN expression
+index over to_tsvector() of the same columns, which PostgreSQL maintains
+itself. Either way every write path, including bulk and raw SQL writes,
+keeps the index current. Indexes are created on the database being
+migrated after every ``migrate`` and rebuilt by the rebuild_search_index
+command, never by a search request, which may be reading from a replica
+that rejects DDL. Other engines fall back to DRF's icontains search.
+"""
+import hashlib
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_search_columns(model, search_fields):
+    """Map search_fields (optionally prefixed with ^ = @ $) to column names"""
+    return [
+        model._meta.get_field(field.lstrip('^=@$')).column
+        for field in search_fields
+    ]
+
+
+class SQLiteSearchBackend:
+    rank_ordering = 'search_rank'
+
+    trigger_suffixes = ('ai', 'ad', 'au')
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index_name(self, model):
+        return f'{model._meta.db_table}_fts'
+
+    def existing_columns(self, cursor, model):
+        cursor.execute(f'PRAGMA table_info({self.index_name(model)})')
+        return [row[1] for row in cursor.fetchall()]
+
+    def has_triggers(self, cursor, model):
+        # Remaking the table (SQLite's ALTER path) silently drops its triggers
+        fts = self.index_name(model)
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            [f'{fts}_{suffix}' for suffix in self.trigger_suffixes],
+        )
+        return cursor.fetchone()[0] == len(self.trigger_suffixes)
+
+    def drop_index(self, cursor, model):
+        fts = self.index_name(model)
+        for suffix in self.trigger_suffixes:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        cursor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+    def create_index(self, cursor, model, columns):
+        qn = self.connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        pk = qn(model._meta.pk.column)
+        fts = self.index_name(model)
+        cols = ', '.join(qn(col) for col in columns)
+        new = ', '.join(f'new.{qn(col)}' for col in columns)
+        old = ', '.join(f'old.{qn(col)}' for col in columns)
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content={table}, "
+            f"content_rowid={pk}, tokenize='porter unicode61')"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN '
+            f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new}); END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN '
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old}); END"
+        )
+        # Only text changes touch the index; e.g. approving feedback does not
+        cursor.execute(
+            f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN '
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old}); "
+            f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new}); END'
+        )
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def ensure_index(self, model, columns):
+        with self.connection.cursor() as cursor:
+            if self.existing_columns(cursor, model) != list(columns) or not self.has_triggers(cursor, model):
+                # Rows written while a trigger was missing are only picked up by a rebuild
+                self.drop_index(cursor, model)
+                self.create_index(cursor, model, columns)
+
+    def rebuild(self, model, columns):
+        with self.connection.cursor() as cursor:
+            self.drop_index(cursor, model)
+            self.create_index(cursor, model, columns)
+
+    def search(self, queryset, columns, tokens):
+        model = queryset.model
+        qn = self.connection.ops.quote_name
+        fts = self.index_name(model)
+        pk = f'{qn(model._meta.db_table)}.{qn(model._meta.pk.column)}'
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return queryset.filter(RawSQL(
+            f'{pk} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)',
+            [match], output_field=BooleanField(),
+        )).annotate(search_rank=RawSQL(
+            f'SELECT bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = {pk}',
+            [match], output_field=FloatField(),
+        ))
+
+
+class PostgreSQLSearchBackend:
+    rank_ordering = '-search_rank'
+    config = 'english'
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index_name(self, model, columns):
+        digest = hashlib.md5(','.join(columns).encode('utf-8')).hexdigest()[:8]
+        return f'{model._meta.db_table}_fts_{digest}'
+
+    def vector(self, columns, table=None):
+        qn = self.connection.ops.quote_name
+        prefix = f'{qn(table)}.' if table else ''
+        document = " || ' ' || ".join(f"COALESCE({prefix}{qn(col)}, '')" for col in columns)
+        return f"to_tsvector('{self.config}'::regconfig, {document})"
+
+    def ensure_index(self, model, columns):
+        qn = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.index_name(model, columns)} '
+                f'ON {qn(model._meta.db_table)} USING GIN ({self.vector(columns)})'
+            )
+
+    def rebuild(self, model, columns):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX IF EXISTS {self.index_name(model, columns)}')
+        self.ensure_index(model, columns)
+
+    def search(self, queryset, columns, tokens):
+        model = queryset.model
+        vector = self.vector(columns, table=model._meta.db_table)
+        query = f"to_tsquery('{self.config}'::regconfig, %s)"
+        terms = ' & '.join(f'{token}:*' for token in tokens)
+        return queryset.filter(RawSQL(
+            f'{vector} @@ {query}', [terms], output_field=BooleanField(),
+        )).annotate(search_rank=RawSQL(
+            f'ts_rank({vector}, {query})', [terms], output_field=FloatField(),
+        ))
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+_backends = {}
+
+
+def get_search_backend(alias):
+    """Return the full-text backend for a database alias, or None"""
+    if alias not in _backends:
+        connection = connections[alias]
+        backend_class = BACKENDS.get(connection.vendor)
+        _backends[alias] = backend_class(connection) if backend_class else None
+    return _backends[alias]
+
+
+def get_searchable_models():
+    """Yield (model, columns) for every viewset searched by FullTextSearchFilter"""
+    from core.utils import get_api_viewsets
+
+    for viewset in get_api_viewsets():
+        if FullTextSearchFilter in getattr(viewset, 'filter_backends', []):
+            model = viewset.queryset.model
+            yield model, get_search_columns(model, viewset.search_fields)
+
+
+def create_search_indexes(using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_migrate receiver: create missing or outdated indexes on the migrated database
+
+    Runs after every migrate, so an index whose table a migration remade
+    (dropping its triggers) is rebuilt there rather than going stale.
+    """
+    backend = get_search_backend(using)
+    if backend is None:
+        return
+    for model, columns in get_searchable_models():
+        backend.ensure_index(model, columns)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    ``?search=`` backed by the engine's full-text index, ordered by rank.
+
+    Each search term is matched as a word prefix and all terms must match.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        terms = self.get_search_terms(request)
+        if not search_fields or not terms:
+            return queryset
+
+        # The index is built on the primary; replicas receive it with the data
+        backend = get_search_backend(router.db_for_write(queryset.model))
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        tokens = TOKEN_RE.findall(' '.join(terms))
+        if not tokens:
+            return queryset.none()
+        columns = get_search_columns(queryset.model, search_fields)
+        queryset = backend.search(queryset, columns, tokens)
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.order_by(backend.rank_ordering, *ordering)
@@ -0,0 +1,14 @@
+from django.dispatch import Signal
+
+# Queryset-level writes bypass the per-instance pre_save/post_save signals.
+#
+# pre_bulk_update is sent by QuerySet.update() inside the update's
+# transaction, before the UPDATE runs. Arguments: sender (the model class),
+# queryset (the rows about to change) and values (the update kwargs).
+pre_bulk_update = Signal()
+
+# bulk_changed is sent after update/bulk_create/bulk_update wrote rows.
+# Arguments: sender, action ('update', 'bulk_create' or 'bulk_update') and,
+# depending on the action, values (update), objs (bulk_create/bulk_update)
+# and fields (bulk_update).
+bulk_changed = Signal()
@@ -0,0 +1,100 @@
+"""
+Sparse fieldsets: ``?fields=id,title,image`` keeps only the listed fields
+and ``?omit=description`` drops fields from GET responses.
+
+DynamicFieldsMixin trims the serializer output; SparseFieldsetMixin pushes
+the same selection down into ``.only()`` so unused columns (long TextFields,
+JSON lists) are never read from the database.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+from .metrics import time_serialization
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_requested_fields(request, available):
+    """
+    Return the names in available selected by ?fields=/?omit=, or None.
+    Raise ValidationError (400) for names the serializer does not have.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    params = request.query_params
+    if FIELDS_PARAM not in params and OMIT_PARAM not in params:
+        return None
+
+    selected = list(available)
+    errors = {}
+    for param in (FIELDS_PARAM, OMIT_PARAM):
+        names = parse_field_list(params.get(param, ''))
+        unknown = names.difference(available)
+        if unknown:
+            errors[param] = [f'Unknown field: {name}' for name in sorted(unknown)]
+        elif param == FIELDS_PARAM and names:
+            selected = [name for name in selected if name in names]
+        elif param == OMIT_PARAM:
+            selected = [name for name in selected if name not in names]
+    if errors:
+        raise ValidationError(errors)
+    return selected
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin that honours ?fields= and ?omit= on read requests to
+    views with SparseFieldsetMixin. Other views, e.g. the bootstrap endpoint
+    whose cached sections are shared by every client, ignore them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not isinstance(self.context.get('view'), SparseFieldsetMixin):
+            return
+        selected = get_requested_fields(self.context.get('request'), self.fields)
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        # Every API serializer uses this mixin, so it is where they are timed
+        with time_serialization():
+            return super().to_representation(instance)
+
+
+class SparseFieldsetMixin:
+    """ViewSet mixin that defers the columns a sparse fieldset leaves out"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        columns = self.get_sparse_columns(queryset.model)
+        return queryset.only(*columns) if columns else queryset
+
+    def get_sparse_columns(self, model):
+        fields = self.get_serializer_class()().fields
+        selected = get_requested_fields(self.request, fields)
+        if selected is None:
+            return None
+
+        # Always load the pk and the sort keys used by pagination
+        columns = {model._meta.pk.name}
+        columns.update(name.lstrip('-') for name in model._meta.ordering)
+        for name in selected:
+            source = fields[name].source
+            try:
+                field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                # Computed or dotted source: we cannot tell which columns it
+                # needs, so load the full row rather than risk N+1 queries
+                return None
+            if field.concrete:
+                columns.add(field.name)
+        return columns
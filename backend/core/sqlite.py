@@ -0,0 +1,21 @@
+"""
+Opt-in SQLite profile for running several workers on one database file.
+
+Enabled with ``SQLITE_CONCURRENT=True``: every new SQLite connection gets
+the ``SQLITE_PRAGMAS`` (WAL so readers never wait for the writer, a busy
+timeout so writers queue instead of failing, cheaper fsyncs, larger page
+cache and mmap), and the ``core.backends.sqlite3`` engine opens write
+transactions with ``BEGIN IMMEDIATE``.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not settings.SQLITE_CONCURRENT:
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
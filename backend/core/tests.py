@@ -0,0 +1,1247 @@
+import asyncio
+import gzip
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from base64 import urlsafe_b64encode
+from pathlib import Path
+
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import QuerySet
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date, parse_http_date
+from rest_framework import renderers, serializers
+from rest_framework.utils.urls import remove_query_param
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.cache import get_model_version
+from core.compression import CODECS, brotli, negotiate
+from core.fast import compile_serializer
+from core.management.commands.check_renderers import EDGE_CASES
+from core.metrics import LATENCY_BUCKETS, METRICS, registry, render_prometheus
+from core.models import BaseQuerySet
+from core.pagination import KeysetPagination
+from core.renderers import JSONRenderer, MessagePackRenderer, msgpack, orjson
+from core.synthetic import generate
+from core.throttling import get_hits
+from core.utils import get_api_viewsets, get_serializer_classes
+from core.views import Section
+from articles.models import Article
+from articles.views import ArticleViewSet
+from contacts.models import Contact
+from contacts.views import ContactViewSet
+from events.models import Event
+from events.serializers import EventSerializer
+from feedback.models import Feedback
+from feedback.views import FeedbackViewSet
+from images.fields import SrcsetField
+from services.models import Service
+from services.serializers import ServiceSerializer
+from services.views import ServiceViewSet
+
+MANAGE = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py')]
+
+# Runs in a child process configured with a primary and a replica file
+REPLICA_SCRIPT = '''
+import json
+from django.core.cache import cache
+from django.test import Client
+from services.models import Service
+
+def names(response):
+    return sorted(row['name'] for row in response.json()['results'])
+
+def service(name):
+    return {'name': name, 'description': 'Routing test', 'image': 'https://example.com/a.jpg', 'features': []}
+
+Service.objects.create(**service('shared'))
+# The replica "lags": it lacks the primary's newest row and has one of its own
+Service.objects.using('replica_1').create(**service('shared'))
+Service.objects.using('replica_1').create(**service('replica-only'))
+Service.objects.create(**service('primary-only'))
+
+out = {}
+client = Client()
+out['model_written_recently'] = names(client.get('/api/services/'))
+cache.clear()
+out['list'] = names(client.get('/api/services/'))
+out['search'] = names(client.get('/api/services/?search=replica'))
+out['detail'] = client.get('/api/services/2/').json()['name']
+response = client.post('/api/feedback/', {'name': 'n', 'email': 'n@example.com', 'review': 'Good', 'rating': 5},
+                       content_type='application/json')
+out['pin_cookie'] = 'db_pin' in response.cookies
+cache.clear()
+out['pinned_client'] = names(client.get('/api/services/'))
+cache.clear()
+out['other_client'] = names(Client().get('/api/services/'))
+print(json.dumps(out))
+'''
+
+# Threads that read and then write in one transaction: the pattern where two
+# deferred transactions both try to upgrade to the write lock
+CONCURRENCY_SCRIPT = '''
+import json, threading
+from django.db import OperationalError, connection, transaction
+from feedback.models import Feedback
+
+errors = []
+
+def work(n):
+    for i in range(25):
+        try:
+            with transaction.atomic():
+                Feedback.objects.filter(rating=5).count()
+                Feedback.objects.create(name=f'T{n}', email=f't{n}-{i}@example.com', rating=5, review='x')
+        except OperationalError as exc:
+            errors.append(str(exc))
+    connection.close()
+
+threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+with connection.cursor() as cursor:
+    cursor.execute('PRAGMA journal_mode')
+    journal_mode = cursor.fetchone()[0]
+print(json.dumps({
+    'rows': Feedback.objects.count(), 'errors': errors, 'journal_mode': journal_mode,
+    'engine': connection.settings_dict['ENGINE'],
+}))
+'''
+
+
+# Remakes the article table the way SQLite migrations do (alter_field), which
+# drops every trigger on it, then lets the post_migrate hook repair the index
+SEARCH_REMAKE_SCRIPT = '''
+import json
+from django.db import connection, models
+from django.test import Client
+from articles.models import Article
+from core.search import create_search_indexes
+
+def triggers():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'articles_article'")
+        return cursor.fetchone()[0]
+
+def article(title):
+    Article.objects.create(title=title, description='Remake test', image='https://example.com/a.jpg',
+                           author='A', publish_date='2024-01-01', read_time='5 min', category='Test')
+
+def found(term):
+    return Client().get(f'/api/articles/?search={term}').json()['count']
+
+out = {'before': triggers()}
+article('Quartz')
+old = Article._meta.get_field('title')
+new = models.CharField(max_length=400)
+new.set_attributes_from_name('title')
+new.model = Article
+with connection.schema_editor() as editor:
+    editor.alter_field(Article, old, new)
+out['remade'] = triggers()
+article('Basalt')
+create_search_indexes()
+out['repaired'] = triggers()
+article('Granite')
+out['found'] = {term: found(term) for term in ('quartz', 'basalt', 'granite')}
+print(json.dumps(out))
+'''
+
+class ScratchDatabaseTestCase(SimpleTestCase):
+    """Runs manage.py in child processes against scratch SQLite files"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.scratch = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.scratch, ignore_errors=True)
+        cls.env = {
+            **os.environ,
+            'DATABASE_URL': f'sqlite:///{cls.scratch}/primary.sqlite3',
+            'DATABASE_REPLICA_URLS': '',
+            'ALLOWED_HOSTS': 'testserver',
+        }
+
+    @classmethod
+    def manage(cls, *args):
+        result = subprocess.run(MANAGE + list(args), env=cls.env, capture_output=True, text=True)
+        if result.returncode:
+            raise AssertionError(f'manage.py {args[0]} failed:\n{result.stderr}')
+        return result.stdout
+
+
+class ReplicaRoutingTests(ScratchDatabaseTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env['DATABASE_REPLICA_URLS'] = f'sqlite:///{cls.scratch}/replica.sqlite3'
+        cls.manage('migrate', '--run-syncdb', '-v', '0')
+        cls.manage('migrate', '--run-syncdb', '-v', '0', '--database', 'replica_1')
+        cls.result = json.loads(cls.manage('shell', '-c', REPLICA_SCRIPT).splitlines()[-1])
+
+    def test_recently_written_model_reads_primary(self):
+        self.assertEqual(self.result['model_written_recently'], ['primary-only', 'shared'])
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.result['list'], ['replica-only', 'shared'])
+        self.assertEqual(self.result['detail'], 'replica-only')
+
+    def test_search_reads_replica_index(self):
+        # Built on each file by migrate; the request itself runs no DDL
+        self.assertEqual(self.result['search'], ['replica-only'])
+
+    def test_writer_is_pinned_to_primary(self):
+        self.assertTrue(self.result['pin_cookie'])
+        self.assertEqual(self.result['pinned_client'], ['primary-only', 'shared'])
+        self.assertEqual(self.result['other_client'], ['replica-only', 'shared'])
+
+
+class SearchIndexRepairTests(ScratchDatabaseTestCase):
+    def test_remade_table_gets_its_triggers_back(self):
+        self.manage('migrate', '--run-syncdb', '-v', '0')
+        result = json.loads(self.manage('shell', '-c', SEARCH_REMAKE_SCRIPT).splitlines()[-1])
+        self.assertEqual((result['before'], result['remade'], result['repaired']), (3, 0, 3))
+        # Including the row written while the triggers were missing
+        self.assertEqual(result['found'], {'quartz': 1, 'basalt': 1, 'granite': 1})
+
+class ConcurrentSQLiteTests(ScratchDatabaseTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env['SQLITE_CONCURRENT'] = 'True'
+        cls.manage('migrate', '--run-syncdb', '-v', '0')
+
+    def test_writers_queue_instead_of_failing(self):
+        result = json.loads(self.manage('shell', '-c', CONCURRENCY_SCRIPT).splitlines()[-1])
+        self.assertEqual(result['engine'], 'core.backends.sqlite3')
+        self.assertEqual(result['journal_mode'], 'wal')
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(result['rows'], 8 * 25)
+
+    def test_stress_command_has_no_lock_errors(self):
+        out = io.StringIO()
+        call_command('sqlite_stress', '--profile', 'concurrent', '--workers', '8', '--requests', '40',
+                     '--read-ratio', '0.3', '--strict', stdout=out)
+        self.assertIn('locked=0 ', out.getvalue())
+        self.assertIn('other errors=0', out.getvalue())
+
+
+class RendererParityTests(TestCase):
+    """The fast renderers must produce what DRF's stdlib JSONRenderer produces"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for viewset in get_api_viewsets():
+            generate(viewset.queryset.model, 15)
+
+    def setUp(self):
+        self.reference = renderers.JSONRenderer()
+        self.renderer = JSONRenderer()
+
+    def assertSameBytes(self, data, accepted_media_type=None, renderer_context=None):
+        self.assertEqual(
+            self.renderer.render(data, accepted_media_type, renderer_context),
+            self.reference.render(data, accepted_media_type, renderer_context),
+        )
+
+    def test_edge_cases(self):
+        for key, value in EDGE_CASES.items():
+            with self.subTest(key):
+                self.assertSameBytes({key: value})
+        self.assertSameBytes(EDGE_CASES)
+
+    def test_every_serializer(self):
+        for viewset in get_api_viewsets():
+            instances = list(viewset.queryset.model._default_manager.all())
+            for serializer_class in get_serializer_classes(viewset):
+                with self.subTest(serializer_class.__name__):
+                    self.assertSameBytes(serializer_class(instances, many=True).data)
+                    self.assertSameBytes(serializer_class(instances[0]).data)
+
+    def test_api_responses(self):
+        for path in ['/api/services/', '/api/articles/?fields=id,title,publish_date',
+                     '/api/feedback/', '/api/projects/1/', '/api/bootstrap/']:
+            with self.subTest(path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, self.reference.render(response.data))
+
+    def test_indented_output_uses_stdlib(self):
+        self.assertSameBytes(EDGE_CASES, 'application/json; indent=2', {})
+
+    def test_null_renders_empty(self):
+        self.assertEqual(self.renderer.render(None), b'')
+
+    @skipUnless(orjson, 'orjson is not installed')
+    def test_orjson_encodes(self):
+        data = {'id': 1, 'title': 'Plain'}
+        self.assertEqual(self.renderer.render(data), orjson.dumps(data))
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack_decodes_to_json_data(self):
+        for viewset in get_api_viewsets():
+            data = viewset.serializer_class(viewset.queryset.model._default_manager.all(), many=True).data
+            with self.subTest(viewset.__name__):
+                self.assertEqual(
+                    msgpack.unpackb(MessagePackRenderer().render(data), raw=False),
+                    json.loads(self.reference.render(data)),
+                )
+
+
+class AsyncReadTests(TestCase):
+    """Async list/retrieve (ASGI) must answer exactly like the sync views"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for viewset in (ServiceViewSet, ArticleViewSet, FeedbackViewSet):
+            generate(viewset.queryset.model, 45)
+
+    def setUp(self):
+        cache.clear()
+
+    def views(self, viewset, action):
+        sync_view = viewset.as_view({'get': action})
+        with override_settings(ASGI=True):
+            async_view = viewset.as_view({'get': action})
+        self.assertTrue(asyncio.iscoroutinefunction(async_view))
+        return sync_view, async_view
+
+    def render(self, response):
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def fetch(self, viewset, action, path, headers=None, clear_cache=True, **kwargs):
+        """(sync response, async response) for the same request"""
+        sync_view, async_view = self.views(viewset, action)
+        sync_response = self.render(sync_view(RequestFactory().get(path, headers=headers), **kwargs))
+        if clear_cache:
+            cache.clear()
+        # The async response must not come from the sync handlers
+        with mock.patch.object(viewset, action, side_effect=AssertionError(f'sync {action} called')):
+            async_response = self.render(
+                async_to_sync(async_view)(AsyncRequestFactory().get(path, headers=headers), **kwargs)
+            )
+        return sync_response, async_response
+
+    def assertSameResponse(self, sync_response, async_response):
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        for header in ('ETag', 'Last-Modified', 'Content-Type'):
+            self.assertEqual(async_response.get(header), sync_response.get(header), header)
+
+    def test_list(self):
+        for viewset, path in [
+            (ServiceViewSet, '/api/services/'),
+            (ServiceViewSet, '/api/services/?page=3'),
+            (ArticleViewSet, '/api/articles/?pagination=cursor&omit=description'),
+            (ArticleViewSet, '/api/articles/?search=platform'),
+            (FeedbackViewSet, '/api/feedback/'),
+        ]:
+            with self.subTest(path):
+                sync_response, async_response = self.fetch(viewset, 'list', path)
+                self.assertEqual(sync_response.status_code, 200)
+                self.assertTrue(sync_response.data['results'])
+                self.assertSameResponse(sync_response, async_response)
+
+    def test_sparse_list(self):
+        sync_response, async_response = self.fetch(ArticleViewSet, 'list', '/api/articles/?fields=id,title,author')
+        self.assertEqual(list(json.loads(async_response.content)['results'][0]), ['id', 'title', 'author'])
+        self.assertSameResponse(sync_response, async_response)
+
+    def test_cursor_pages(self):
+        sync_response, async_response = self.fetch(ArticleViewSet, 'list', '/api/articles/?pagination=cursor')
+        next_link = sync_response.data['next'].replace('http://testserver', '')
+        self.assertSameResponse(*self.fetch(ArticleViewSet, 'list', next_link))
+
+    def test_retrieve(self):
+        service = ServiceViewSet.queryset.model.objects.order_by('pk')[3]
+        sync_response, async_response = self.fetch(ServiceViewSet, 'retrieve', f'/api/services/{service.pk}/',
+                                                    pk=str(service.pk))
+        self.assertEqual(sync_response.data['id'], service.pk)
+        self.assertSameResponse(sync_response, async_response)
+
+    def test_missing_detail(self):
+        sync_response, async_response = self.fetch(ServiceViewSet, 'retrieve', '/api/services/9999/', pk='9999')
+        self.assertEqual((sync_response.status_code, async_response.status_code), (404, 404))
+
+    def test_served_from_cache_written_by_sync_view(self):
+        self.assertSameResponse(*self.fetch(ServiceViewSet, 'list', '/api/services/', clear_cache=False))
+
+    def test_not_modified(self):
+        for action, path, kwargs in [
+            ('list', '/api/services/', {}),
+            ('retrieve', '/api/services/2/', {'pk': '2'}),
+        ]:
+            with self.subTest(path):
+                sync_response, _ = self.fetch(ServiceViewSet, action, path, **kwargs)
+                headers = {'If-None-Match': sync_response['ETag']}
+                sync_response, async_response = self.fetch(ServiceViewSet, action, path, headers, **kwargs)
+                self.assertEqual((sync_response.status_code, async_response.status_code), (304, 304))
+                self.assertEqual(async_response['ETag'], sync_response['ETag'])
+                self.assertEqual(async_response.content, b'')
+
+
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(Service, 25)
+        generate(Feedback, 5)
+
+    def setUp(self):
+        cache.clear()
+
+    def assertVersionBumped(self, model, write):
+        before = get_model_version(model)
+        write()
+        self.assertNotEqual(get_model_version(model), before)
+
+    def test_hit_matches_miss(self):
+        for path in ['/api/services/', '/api/services/?page=2', f'/api/services/{Service.objects.first().pk}/']:
+            with self.subTest(path):
+                miss = self.client.get(path)
+                with self.assertNumQueries(0):
+                    hit = self.client.get(path)
+                self.assertEqual(hit.status_code, 200)
+                self.assertEqual(hit.content, miss.content)
+                for header in ('Content-Type', 'ETag', 'Last-Modified'):
+                    self.assertEqual(hit[header], miss[header], header)
+
+    def test_writes_bump_the_model_version(self):
+        service = Service.objects.first()
+        self.assertVersionBumped(Service, lambda: service.save())
+        self.assertVersionBumped(Service, lambda: Service.objects.filter(pk=service.pk).update(name='Renamed'))
+        self.assertVersionBumped(Service, lambda: service.delete())
+        # An UPDATE that matches nothing changes nothing
+        version = get_model_version(Service)
+        Service.objects.filter(pk=0).update(name='Nobody')
+        self.assertEqual(get_model_version(Service), version)
+
+    def test_admin_approve_bumps_the_version(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        Feedback.objects.update(approved=False)
+        self.assertVersionBumped(Feedback, lambda: self.client.post('/admin/feedback/feedback/', {
+            'action': 'approve_feedback', '_selected_action': list(Feedback.objects.values_list('pk', flat=True)),
+        }))
+        self.assertFalse(Feedback.objects.filter(approved=False).exists())
+
+    def test_write_is_visible_to_the_next_read(self):
+        service = Service.objects.order_by('pk').first()
+        path = f'/api/services/{service.pk}/'
+        self.assertEqual(self.client.get(path).json()['name'], service.name)
+        Service.objects.filter(pk=service.pk).update(name='Renamed')
+        self.assertEqual(self.client.get(path).json()['name'], 'Renamed')
+
+    def test_media_types_are_cached_apart(self):
+        html = self.client.get('/api/services/', headers={'Accept': 'text/html'})
+        self.assertTrue(html['Content-Type'].startswith('text/html'))
+        response = self.client.get('/api/services/', headers={'Accept': 'application/json'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['count'], 25)
+
+    def test_query_strings_are_cached_apart(self):
+        first = self.client.get('/api/services/?fields=id&page=2')
+        self.assertNotEqual(self.client.get('/api/services/?fields=id').content, first.content)
+        # Parameter order does not matter
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/services/?page=2&fields=id').content, first.content)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.client.get('/api/services/')
+        self.client.force_login(User.objects.create_user('user', password='pw'))
+        with mock.patch.object(cache, 'get', wraps=cache.get) as get:
+            self.client.get('/api/services/')
+        self.assertFalse(any(':response:' in str(call.args[0]) for call in get.call_args_list))
+
+
+def service_data(name, **extra):
+    return {'name': name, 'description': 'Bulk test', 'image': 'https://example.com/a.jpg', 'features': [], **extra}
+
+
+class BulkEndpointTests(TestCase):
+    path = '/api/services/bulk/'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('editor', password='pw'))
+        self.services = [Service.objects.create(**service_data(f'S{i}')) for i in range(3)]
+
+    def send(self, method, items):
+        return getattr(self.client, method)(self.path, json.dumps(items), content_type='application/json')
+
+    def test_anonymous_requests_are_rejected(self):
+        self.client.logout()
+        for method in ('post', 'patch', 'delete'):
+            with self.subTest(method):
+                self.assertEqual(self.send(method, []).status_code, 401)
+        self.assertEqual(Service.objects.count(), 3)
+
+    def test_create(self):
+        response = self.send('post', [service_data('New 1'), service_data('New 2')])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['name'] for row in response.json()], ['New 1', 'New 2'])
+        self.assertTrue(all(row['id'] for row in response.json()))
+        self.assertEqual(Service.objects.count(), 5)
+
+    def test_create_reports_errors_per_item(self):
+        response = self.send('post', [service_data('Fine'), {'name': 'No description'}])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn('description', errors[1])
+        self.assertEqual(Service.objects.count(), 3)
+
+    def test_partial_update(self):
+        first, second, untouched = self.services
+        response = self.send('patch', [{'id': first.pk, 'name': 'Renamed'}, {'id': second.pk, 'description': 'New'}])
+        self.assertEqual(response.status_code, 200)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.name, first.description), ('Renamed', 'Bulk test'))
+        self.assertEqual((second.name, second.description), ('S1', 'New'))
+        self.assertEqual(first.updated_at, second.updated_at)
+        self.assertGreater(first.updated_at, untouched.updated_at)
+
+    def test_update_reports_errors_per_item(self):
+        first, second, third = self.services
+        response = self.send('patch', [
+            {'id': first.pk, 'name': 'Valid'},
+            {'name': 'No id'},
+            {'id': first.pk, 'name': 'Duplicate'},
+            {'id': 9999, 'name': 'Missing'},
+            {'id': second.pk, 'image': 'not a url'},
+            'not an object',
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[:4], [
+            {}, {'id': ['A valid id is required.']}, {'id': ['Duplicate id.']}, {'id': ['Not found.']},
+        ])
+        self.assertIn('image', errors[4])
+        self.assertEqual(errors[5], {'id': ['A valid id is required.']})
+        self.assertFalse(Service.objects.filter(name='Valid').exists())
+
+    def test_update_reads_under_row_locks(self):
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True,
+                               side_effect=QuerySet.select_for_update) as lock:
+            self.send('patch', [{'id': self.services[0].pk, 'name': 'Locked'}])
+        self.assertTrue(lock.called)
+
+    def test_failed_write_rolls_back(self):
+        bulk_update = BaseQuerySet.bulk_update
+
+        def write_then_fail(queryset, *args, **kwargs):
+            bulk_update(queryset, *args, **kwargs)
+            raise DatabaseError('disk full')
+
+        with mock.patch.object(BaseQuerySet, 'bulk_update', write_then_fail), self.assertRaises(DatabaseError):
+            self.send('patch', [{'id': service.pk, 'name': 'Lost'} for service in self.services])
+        self.assertFalse(Service.objects.filter(name='Lost').exists())
+
+    def test_destroy(self):
+        first, second, third = self.services
+        response = self.send('delete', [first.pk, {'id': second.pk}, 9999, 'abc', {'name': 'no id'}, str(third.pk)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'id': first.pk, 'status': 'deleted'},
+            {'id': second.pk, 'status': 'deleted'},
+            {'id': 9999, 'status': 'not_found'},
+            {'id': 'abc', 'status': 'invalid'},
+            {'id': None, 'status': 'invalid'},
+            {'id': third.pk, 'status': 'deleted'},
+        ])
+        self.assertFalse(Service.objects.exists())
+
+    def test_rejects_non_list_and_oversized_payloads(self):
+        self.assertEqual(self.send('post', service_data('Single')).status_code, 400)
+        with mock.patch.object(ServiceViewSet, 'bulk_max_items', 2):
+            self.assertEqual(self.send('delete', [1, 2, 3]).status_code, 400)
+
+
+class ThrottleTests(TestCase):
+    path = '/api/feedback/'
+
+    def setUp(self):
+        cache.clear()
+        self.sent = 0
+
+    def submit(self, email=None, ip='10.0.0.1', forwarded_for=None):
+        self.sent += 1
+        extra = {'REMOTE_ADDR': ip}
+        if forwarded_for:
+            extra['HTTP_X_FORWARDED_FOR'] = forwarded_for
+        data = {'name': 'N', 'email': email or f'user{self.sent}@example.com', 'rating': 5, 'review': 'Good'}
+        return self.client.post(self.path, data, content_type='application/json', **extra)
+
+    def assertThrottled(self, *args, **kwargs):
+        with self.assertLogs('core.throttling', 'WARNING'):
+            response = self.submit(*args, **kwargs)
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 3600)
+
+    def test_per_email_limit(self):
+        # feedback_email is 3/hour, counted across client addresses
+        for i in range(3):
+            self.assertEqual(self.submit('same@example.com', ip=f'10.0.1.{i}').status_code, 201)
+        self.assertThrottled(' Same@Example.com ', ip='10.0.1.9')
+        self.assertEqual(self.submit('other@example.com', ip='10.0.1.9').status_code, 201)
+
+    def test_per_ip_limit(self):
+        # feedback_ip is 10/hour
+        for _ in range(10):
+            self.assertEqual(self.submit().status_code, 201)
+        self.assertThrottled()
+        self.assertEqual(self.submit(ip='10.0.0.2').status_code, 201)
+        self.assertEqual(get_hits(['feedback_ip'])['feedback_ip'], 1)
+
+    def test_rejected_before_serializer_and_database(self):
+        for _ in range(10):
+            self.submit()
+        with mock.patch.object(FeedbackViewSet, 'get_serializer', side_effect=AssertionError('serialized')), \
+                self.assertNumQueries(0):
+            self.assertThrottled()
+
+    def test_spoofed_forwarded_for_is_ignored_without_proxies(self):
+        for i in range(10):
+            self.submit(forwarded_for=f'192.0.2.{i}')
+        self.assertThrottled(forwarded_for='192.0.2.99')
+
+    def test_forwarded_for_is_used_behind_proxies(self):
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            for _ in range(10):
+                self.submit(ip='10.0.0.254', forwarded_for='192.0.2.1')
+            self.assertThrottled(ip='10.0.0.254', forwarded_for='192.0.2.1')
+            # The address the proxy appended is the client; what the client sent before it is not
+            self.assertEqual(self.submit(ip='10.0.0.254', forwarded_for='192.0.2.2').status_code, 201)
+            self.assertThrottled(ip='10.0.0.254', forwarded_for='203.0.113.5, 192.0.2.1')
+
+    def test_authenticated_users_are_not_throttled(self):
+        self.client.force_login(User.objects.create_user('staff', password='pw'))
+        for _ in range(4):
+            self.assertEqual(self.submit('same@example.com').status_code, 201)
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(Service, 5)
+        generate(Contact, 30)
+        cls.user = User.objects.create_user('staff', password='pw', is_staff=True)
+
+    def setUp(self):
+        # Authenticated requests skip the response cache and reach the validators
+        self.client.force_login(self.user)
+
+    def assertNotModified(self, path, viewset, **headers):
+        with mock.patch.object(viewset, 'get_serializer', side_effect=AssertionError('serialized')):
+            response = self.client.get(path, headers=headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        return response
+
+    def test_if_none_match(self):
+        service = Service.objects.first()
+        for path in ['/api/services/', f'/api/services/{service.pk}/']:
+            with self.subTest(path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                not_modified = self.assertNotModified(path, ServiceViewSet, if_none_match=response['ETag'])
+                self.assertEqual(not_modified['ETag'], response['ETag'])
+                self.assertEqual(not_modified['Last-Modified'], response['Last-Modified'])
+                self.assertIn('no-cache', not_modified['Cache-Control'])
+
+    def test_if_modified_since(self):
+        service = Service.objects.first()
+        for path in ['/api/services/', f'/api/services/{service.pk}/']:
+            with self.subTest(path):
+                last_modified = self.client.get(path)['Last-Modified']
+                self.assertNotModified(path, ServiceViewSet, if_modified_since=last_modified)
+                earlier = http_date(parse_http_date(last_modified) - 60)
+                self.assertEqual(self.client.get(path, headers={'If-Modified-Since': earlier}).status_code, 200)
+
+    def test_writes_change_the_validators(self):
+        service = Service.objects.first()
+        for path, write in [
+            ('/api/services/', lambda: Service.objects.last().delete()),
+            (f'/api/services/{service.pk}/', lambda: Service.objects.filter(pk=service.pk).update(name='New')),
+        ]:
+            with self.subTest(path):
+                etag = self.client.get(path)['ETag']
+                write()
+                response = self.client.get(path, headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_validators_differ_per_query(self):
+        self.assertNotEqual(self.client.get('/api/services/')['ETag'],
+                            self.client.get('/api/services/?fields=id')['ETag'])
+
+    def test_cursor_pages_do_not_count_or_scan(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/contacts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data['next'])
+        sql = ' '.join(query['sql'] for query in queries).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('MAX(', sql)
+        self.assertNotModified('/api/contacts/', ContactViewSet, if_none_match=response['ETag'])
+
+        next_page = response.data['next'].replace('http://testserver', '')
+        second = self.client.get(next_page)
+        self.assertNotModified(next_page, ContactViewSet, if_none_match=second['ETag'])
+
+    def test_cursor_page_validators_follow_the_page_rows(self):
+        etag = self.client.get('/api/contacts/')['ETag']
+        rows = list(Contact.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+        # A row on a later page does not affect the first page
+        Contact.objects.filter(pk=rows[-1]).update(full_name='Elsewhere')
+        self.assertNotModified('/api/contacts/', ContactViewSet, if_none_match=etag)
+        # Editing or deleting a row on the page does
+        Contact.objects.filter(pk=rows[3]).update(full_name='Edited')
+        response = self.client.get('/api/contacts/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        Contact.objects.filter(pk=rows[5]).delete()
+        self.assertNotEqual(self.client.get('/api/contacts/')['ETag'], response['ETag'])
+
+    def test_missing_object_is_404(self):
+        self.assertEqual(self.client.get('/api/services/9999/', headers={'If-None-Match': '"x"'}).status_code, 404)
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(Service, 5)
+        generate(Feedback, 12)
+        Feedback.objects.update(approved=True)
+        # Every row ties on created_at: only the id orders them
+        Feedback.objects.update(created_at=Feedback.objects.first().created_at)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, path):
+        response = self.client.get(path.replace('http://testserver', ''))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, data):
+        return [row['id'] for row in data['results']]
+
+    @mock.patch.object(KeysetPagination, 'page_size', 5)
+    def test_next_and_previous_round_trip_across_ties(self):
+        expected = list(Feedback.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+        pages = [self.get('/api/feedback/')]
+        self.assertIsNone(pages[0]['previous'])
+        while pages[-1]['next']:
+            pages.append(self.get(pages[-1]['next']))
+        self.assertEqual([self.ids(page) for page in pages], [expected[:5], expected[5:10], expected[10:]])
+
+        backwards = [pages[-1]]
+        while backwards[-1]['previous']:
+            backwards.append(self.get(backwards[-1]['previous']))
+        self.assertEqual([self.ids(page) for page in reversed(backwards)], [self.ids(page) for page in pages])
+        # The first page reached backwards links forward again
+        self.assertEqual(self.ids(self.get(backwards[-1]['next'])), expected[5:10])
+
+    def test_mode_per_viewset_and_parameter(self):
+        for path, keyset in [
+            ('/api/services/', False),
+            ('/api/feedback/', True),
+            ('/api/services/?pagination=cursor', True),
+            ('/api/feedback/?pagination=page', False),
+            ('/api/services/?pagination=bogus', False),
+        ]:
+            with self.subTest(path):
+                data = self.get(path)
+                self.assertEqual('count' not in data, keyset)
+                self.assertLessEqual({'next', 'previous', 'results'}, set(data))
+
+    @mock.patch.object(KeysetPagination, 'page_size', 2)
+    def test_cursor_parameter_selects_keyset(self):
+        link = remove_query_param(self.get('/api/services/?pagination=cursor')['next'], 'pagination')
+        self.assertIn('cursor=', link)
+        data = self.get(link)
+        self.assertNotIn('count', data)
+        self.assertEqual(len(data['results']), 2)
+
+    def test_bad_cursor_is_404(self):
+        for cursor in ['garbage', urlsafe_b64encode(b'{"not": "a list"}').decode(),
+                       urlsafe_b64encode(b'["not a date", 1, 0]').decode(),
+                       urlsafe_b64encode(b'["2024-01-01T00:00:00", "x", 0]').decode()]:
+            with self.subTest(cursor):
+                self.assertEqual(self.client.get(f'/api/feedback/?cursor={cursor}').status_code, 404)
+
+    def test_searches_use_page_numbers(self):
+        Feedback.objects.filter(pk=Feedback.objects.order_by('pk')[7].pk).update(review='platform platform')
+        Feedback.objects.filter(pk=Feedback.objects.order_by('pk')[2].pk).update(review='a platform review')
+        for path in ['/api/feedback/?search=platform', '/api/feedback/?search=platform&pagination=cursor']:
+            with self.subTest(path):
+                data = self.get(path)
+                self.assertIn('count', data)
+                # Relevance order, not the keyset order
+                self.assertEqual(self.ids(data)[0], Feedback.objects.order_by('pk')[7].pk)
+
+
+class CompiledSerializerTests(TestCase):
+    """compile_serializer() must reproduce Serializer(many=True).data exactly"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for viewset in get_api_viewsets():
+            generate(viewset.queryset.model, 40)
+
+    def assertSameOutput(self, serializer, queryset):
+        compiled = compile_serializer(serializer, queryset.model)
+        self.assertIsNotNone(compiled, f'{type(serializer).__name__} did not compile')
+        converters = compiled.bind({})
+        actual = [compiled.to_representation(row, converters) for row in compiled.rows(queryset)]
+        expected = type(serializer)(list(queryset), many=True).data
+        self.assertEqual(actual, expected)
+        self.assertEqual(renderers.JSONRenderer().render(actual), renderers.JSONRenderer().render(expected))
+        return actual
+
+    def test_every_registered_serializer(self):
+        for viewset in get_api_viewsets():
+            model = viewset.queryset.model
+            for serializer_class in get_serializer_classes(viewset):
+                with self.subTest(serializer_class.__name__):
+                    self.assertSameOutput(serializer_class(), model._default_manager.order_by('pk'))
+
+    def test_nulls_dates_and_choices(self):
+        rows = self.assertSameOutput(EventSerializer(), Event.objects.order_by('pk'))
+        self.assertIn(None, [row['max_attendees'] for row in rows])
+        self.assertIn(None, [row['registration_link'] for row in rows])
+        self.assertEqual({row['event_type'] for row in rows}, {'upcoming', 'past'})
+        self.assertRegex(rows[0]['date'], r'^\d{4}-\d{2}-\d{2}$')
+        self.assertTrue(rows[0]['created_at'].endswith('Z'))
+
+    def test_decimal_and_formatted_fields(self):
+        class Serializer(serializers.ModelSerializer):
+            score = serializers.DecimalField(source='rating', max_digits=4, decimal_places=2)
+            created = serializers.DateTimeField(source='created_at', format='%d/%m/%Y %H:%M')
+            rating = serializers.ChoiceField(choices=[(i, str(i)) for i in range(1, 6)])
+
+            class Meta:
+                model = Feedback
+                fields = ['id', 'score', 'created', 'rating', 'company', 'approved']
+
+        rows = self.assertSameOutput(Serializer(), Feedback.objects.order_by('pk'))
+        self.assertRegex(rows[0]['score'], r'^\d\.00$')
+
+    def test_method_fields_are_not_compiled(self):
+        class Serializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Feedback
+                fields = ['id', 'label']
+
+            def get_label(self, obj):
+                return obj.name
+
+        self.assertIsNone(compile_serializer(Serializer(), Feedback))
+
+
+class BootstrapTests(TestCase):
+    path = '/api/bootstrap/'
+
+    @classmethod
+    def setUpTestData(cls):
+        for viewset in (ServiceViewSet, ArticleViewSet, FeedbackViewSet):
+            generate(viewset.queryset.model, 10)
+        generate(Event, 10)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_payload(self):
+        data = self.client.get(self.path).json()
+        self.assertEqual(list(data), ['services', 'projects', 'articles', 'events', 'testimonials'])
+        self.assertEqual((len(data['services']), len(data['articles']), data['projects']), (6, 3, []))
+        self.assertEqual(data['services'], ServiceSerializer(Service.objects.all()[:6], many=True).data)
+        approved = set(Feedback.objects.filter(approved=True).values_list('pk', flat=True))
+        self.assertTrue({row['id'] for row in data['testimonials']} <= approved)
+        self.assertNotIn('email', data['testimonials'][0])
+        dates = [row['date'] for row in data['events']]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_limits(self):
+        data = self.client.get(self.path, {'services': 2, 'articles': 0, 'events': 'x', 'testimonials': 500}).json()
+        self.assertEqual(len(data['services']), 2)
+        self.assertNotIn('articles', data)
+        self.assertEqual(len(data['events']), len(self.client.get(self.path).json()['events']))
+        self.assertEqual(len(data['testimonials']), Feedback.objects.filter(approved=True).count())
+
+    def test_sections_are_serialized_with_the_request(self):
+        image = Service.objects.order_by('-created_at').first().image
+        srcsets = {image: {'webp': '/media/v/320.webp 320w'}}
+        with mock.patch('images.fields.get_srcsets', return_value=srcsets) as lookup, \
+                mock.patch.object(SrcsetField, 'get_list_converter', autospec=True,
+                                  side_effect=SrcsetField.get_list_converter) as bind:
+            data = self.client.get(self.path).json()
+        # Once for the whole response, shared by every section with a srcset
+        self.assertEqual(lookup.call_count, 1)
+        self.assertTrue(all(call.args[1]['request'] is not None for call in bind.call_args_list))
+        self.assertIn(srcsets[image], [row['srcset'] for row in data['services']])
+
+    def test_sparse_parameters_do_not_reach_cached_sections(self):
+        trimmed = self.client.get(self.path, {'fields': 'id'}).json()
+        self.assertEqual(trimmed, self.client.get(self.path).json())
+        self.assertIn('title', trimmed['articles'][0])
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get(self.path)
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.path, headers={'If-None-Match': etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+        self.assertNotEqual(self.client.get(self.path, {'services': 1})['ETag'], etag)
+
+    def test_write_rebuilds_only_its_section(self):
+        etag = self.client.get(self.path)['ETag']
+        Article.objects.filter(pk=Article.objects.first().pk).update(title='Edited')
+        with mock.patch.object(Section, 'serialize', autospec=True, side_effect=Section.serialize) as serialize:
+            response = self.client.get(self.path, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([call.args[0].model for call in serialize.call_args_list], [Article])
+
+
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(Service, 3)
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.user = User.objects.create_user('user', password='pw')
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.enterContext(override_settings(PROFILE_DIR=directory))
+        self.directory = Path(directory)
+
+    def profile_id(self, path='/api/services/', headers=None):
+        response = self.client.get(path, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response.get('X-Profile-Id')
+
+    def test_truthy_flags_profile(self):
+        self.client.force_login(self.staff)
+        for value in ('1', 'true', 'Yes', 'on'):
+            with self.subTest(header=value):
+                profile_id = self.profile_id(headers={'X-Profile': value})
+                self.assertTrue((self.directory / f'{profile_id}.prof').exists())
+        self.assertIsNotNone(self.profile_id('/api/services/?profile=1'))
+
+    def test_falsy_flags_do_not_profile(self):
+        self.client.force_login(self.staff)
+        for value in ('0', 'false', 'no', 'off', ''):
+            with self.subTest(value):
+                self.assertIsNone(self.profile_id(headers={'X-Profile': value}))
+                self.assertIsNone(self.profile_id(f'/api/services/?profile={value}'))
+        self.assertFalse(any(self.directory.iterdir()))
+
+    def test_only_staff_are_profiled(self):
+        self.assertIsNone(self.profile_id(headers={'X-Profile': '1'}))
+        self.client.force_login(self.user)
+        self.assertIsNone(self.profile_id(headers={'X-Profile': '1'}))
+
+    def test_staff_jwt_is_profiled(self):
+        token = RefreshToken.for_user(self.staff).access_token
+        self.assertIsNotNone(self.profile_id(headers={'X-Profile': '1', 'Authorization': f'Bearer {token}'}))
+
+    def test_profile_endpoints_are_staff_only(self):
+        self.client.force_login(self.staff)
+        profile_id = self.profile_id(headers={'X-Profile': '1'})
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/api/profiles/').status_code, 403)
+        self.assertEqual(self.client.get(f'/api/profiles/{profile_id}/').status_code, 403)
+
+    def test_list_download_and_stats(self):
+        self.client.force_login(self.staff)
+        profile_id = self.profile_id(headers={'X-Profile': '1'})
+        [summary] = self.client.get('/api/profiles/').json()
+        self.assertEqual((summary['id'], summary['path'], summary['user']), (profile_id, '/api/services/', 'staff'))
+
+        download = self.client.get(f'/api/profiles/{profile_id}/')
+        self.assertEqual(b''.join(download.streaming_content), (self.directory / f'{profile_id}.prof').read_bytes())
+        report = self.client.get(f'/api/profiles/{profile_id}/?stats=tottime')
+        self.assertEqual(report.status_code, 200)
+        self.assertIn(b'function calls', report.content)
+
+    def test_bad_sort_key_and_id(self):
+        self.client.force_login(self.staff)
+        profile_id = self.profile_id(headers={'X-Profile': '1'})
+        response = self.client.get(f'/api/profiles/{profile_id}/?stats=bogus')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'stats': ['Unknown sort key "bogus".']})
+        self.assertEqual(self.client.get('/api/profiles/..%2Fsettings/').status_code, 404)
+        self.assertEqual(self.client.get('/api/profiles/20240101-000000000000-abcdef/').status_code, 404)
+
+    @override_settings(PROFILE_MAX_FILES=2)
+    def test_rotation_keeps_the_newest(self):
+        self.client.force_login(self.staff)
+        ids = [self.profile_id(headers={'X-Profile': '1'}) for _ in range(3)]
+        self.assertEqual(sorted(path.stem for path in self.directory.glob('*.prof')), sorted(ids[1:]))
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(Service, 3)
+        generate(Article, 3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fields_keeps_only_the_listed_fields(self):
+        results = self.client.get('/api/services/?fields=id, name').json()['results']
+        self.assertEqual([list(row) for row in results], [['id', 'name']] * 3)
+        service = Service.objects.first()
+        self.assertEqual(list(self.client.get(f'/api/services/{service.pk}/?fields=name').json()), ['name'])
+
+    def test_omit_drops_fields(self):
+        row = self.client.get('/api/articles/?omit=description,image').json()['results'][0]
+        self.assertNotIn('description', row)
+        self.assertNotIn('image', row)
+        self.assertIn('title', row)
+
+    def test_fields_and_omit_combine(self):
+        row = self.client.get('/api/articles/?fields=id,title,author&omit=author').json()['results'][0]
+        self.assertEqual(list(row), ['id', 'title'])
+
+    def test_unselected_columns_are_not_read(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/articles/?fields=id,title&pagination=page')
+        page_query = next(query['sql'] for query in queries if 'LIMIT' in query['sql'])
+        self.assertIn('"title"', page_query)
+        self.assertNotIn('"description"', page_query)
+
+    def test_unknown_field_is_400(self):
+        for path, param in [
+            ('/api/articles/?fields=id,slug', 'fields'),
+            ('/api/articles/?omit=slug', 'omit'),
+            (f'/api/articles/{Article.objects.first().pk}/?fields=slug', 'fields'),
+        ]:
+            with self.subTest(path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {param: ['Unknown field: slug']})
+
+    def test_unknown_field_is_400_on_the_async_path(self):
+        with override_settings(ASGI=True):
+            view = ArticleViewSet.as_view({'get': 'list'})
+        response = async_to_sync(view)(AsyncRequestFactory().get('/api/articles/?fields=slug'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_empty_parameters_keep_every_field(self):
+        row = self.client.get('/api/services/?fields=&omit=').json()['results'][0]
+        self.assertEqual(list(row), list(ServiceSerializer().fields))
+
+    def test_writes_ignore_sparse_parameters(self):
+        self.client.force_login(User.objects.create_user('editor', password='pw'))
+        response = self.client.post('/api/services/?fields=slug', service_data('Created'),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('description', response.json())
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(Service, 5)
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        registry.pending.clear()
+
+    def server_timing(self, response):
+        """{name: params} from a Server-Timing header"""
+        parts = {}
+        for part in response['Server-Timing'].split(', '):
+            name, *params = part.split(';')
+            parts[name] = dict(param.split('=', 1) for param in params)
+        return parts
+
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/services/')
+        timing = self.server_timing(response)
+        self.assertEqual(list(timing), ['db', 'serialize', 'total', 'size'])
+        self.assertEqual(timing['db']['desc'], f'"{len(queries)} queries"')
+        self.assertEqual(timing['size']['desc'], f'"{len(response.content)} bytes"')
+        durations = [float(timing[name]['dur']) for name in ('db', 'serialize', 'total')]
+        self.assertGreater(durations[1], 0)
+        self.assertLessEqual(max(durations[:2]), durations[2])
+
+    def test_cache_hits_report_no_queries(self):
+        self.client.get('/api/services/')
+        self.assertEqual(self.server_timing(self.client.get('/api/services/'))['db']['desc'], '"0 queries"')
+
+    def test_requests_are_counted_per_route(self):
+        for path in ('/api/services/', '/api/services/', '/api/services/9999/'):
+            self.client.get(path)
+        samples = registry.collect()
+        self.assertEqual(samples[('api_requests_total', (('method', 'GET'), ('route', 'service-list'),
+                                                         ('status', '200')))], 2)
+        self.assertEqual(samples[('api_requests_total', (('method', 'GET'), ('route', 'service-detail'),
+                                                         ('status', '404')))], 1)
+        self.assertEqual(samples[('api_request_duration_seconds_count', (('method', 'GET'),
+                                                                         ('route', 'service-list')))], 2)
+
+    def test_prometheus_format(self):
+        route = (('method', 'GET'), ('route', 'a"b\\c\nd'))
+        samples = {
+            ('api_requests_total', route + (('status', '200'),)): 3,
+            ('api_request_duration_seconds_bucket', route + (('le', '0.01'),)): 1,
+            ('api_request_duration_seconds_bucket', route + (('le', '0.5'),)): 2,
+            ('api_request_duration_seconds_bucket', route + (('le', '+Inf'),)): 1,
+            ('api_request_duration_seconds_sum', route): 12_500_000,
+            ('api_request_duration_seconds_count', route): 4,
+            ('api_db_duration_seconds_total', (('route', 'x'),)): 1500,
+        }
+        lines = render_prometheus(samples).splitlines()
+        labels = 'method="GET",route="a\\"b\\\\c\\nd"'
+        for metric, (kind, _) in METRICS.items():
+            self.assertIn(f'# TYPE {metric} {kind}', lines)
+        self.assertIn(f'api_requests_total{{{labels},status="200"}} 3', lines)
+        buckets = [line for line in lines if line.startswith('api_request_duration_seconds_bucket')]
+        self.assertEqual(len(buckets), len(LATENCY_BUCKETS) + 1)
+        self.assertEqual(buckets[0], f'api_request_duration_seconds_bucket{{{labels},le="0.005"}} 0')
+        self.assertIn(f'api_request_duration_seconds_bucket{{{labels},le="0.01"}} 1', buckets)
+        self.assertIn(f'api_request_duration_seconds_bucket{{{labels},le="0.5"}} 3', buckets)
+        self.assertEqual(buckets[-1], f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4')
+        self.assertIn(f'api_request_duration_seconds_sum{{{labels}}} 12.500000', lines)
+        self.assertIn(f'api_request_duration_seconds_count{{{labels}}} 4', lines)
+        self.assertIn('api_db_duration_seconds_total{route="x"} 0.001500', lines)
+
+    def test_metrics_endpoint(self):
+        self.client.get('/api/services/')
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        self.assertIn('api_requests_total{method="GET",route="service-list",status="200"} 1',
+                      response.content.decode().splitlines())
+
+    @override_settings(METRICS_TOKEN='scrape')
+    def test_metrics_permission(self):
+        self.assertIn(self.client.get('/api/metrics/').status_code, (401, 403))
+        wrong = self.client.get('/api/metrics/', headers={'Authorization': 'Metrics nope'})
+        self.assertIn(wrong.status_code, (401, 403))
+        self.assertEqual(self.client.get('/api/metrics/', headers={'Authorization': 'Metrics scrape'}).status_code,
+                         200)
+        self.client.force_login(User.objects.create_user('user', password='pw'))
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        with override_settings(METRICS_TOKEN=''):
+            # No token configured: an empty one does not open the endpoint
+            self.assertEqual(self.client.get('/api/metrics/', headers={'Authorization': 'Metrics '}).status_code,
+                             403)
+
+
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(Service, 25)
+        cls.user = User.objects.create_user('user', password='pw')
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, path='/api/services/', encoding='gzip', **headers):
+        return self.client.get(path, headers={'Accept-Encoding': encoding, **headers})
+
+    def assertGzipped(self, response, identity):
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(gzip.decompress(response.content), identity.content)
+        self.assertEqual(response['ETag'], f'W/{identity["ETag"]}')
+
+    def test_gzip(self):
+        identity = self.get(encoding='')
+        self.assertFalse(identity.has_header('Content-Encoding'))
+        self.assertFalse(identity['ETag'].startswith('W/'))
+        # Miss, then the body compressed once and stored with the cache entry
+        self.assertGzipped(self.get(), identity)
+        with self.assertNumQueries(0), mock.patch('core.cache.compress', side_effect=AssertionError('compressed')):
+            self.assertGzipped(self.get(), identity)
+        # Authenticated responses are not cached and compressed by the middleware
+        self.client.force_login(self.user)
+        self.assertGzipped(self.get(), self.get(encoding=''))
+
+    @skipUnless(brotli, 'Brotli is not installed')
+    def test_brotli_is_preferred(self):
+        identity = self.get(encoding='')
+        response = self.get(encoding='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), identity.content)
+
+    def test_negotiation(self):
+        best = 'br' if brotli else 'zstd' if 'zstd' in CODECS else 'gzip'
+        for header, expected in [
+            ('', None),
+            ('identity', None),
+            ('deflate', None),
+            ('gzip;q=0', None),
+            ('GZIP', 'gzip'),
+            ('*', best),
+            ('*;q=0.5, gzip', 'gzip'),
+            ('gzip;q=0.5, br;q=0.2, zstd;q=0.1', 'gzip'),
+            ('*, gzip;q=0', best if best != 'gzip' else None),
+        ]:
+            with self.subTest(header):
+                self.assertEqual(negotiate(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)), expected)
+
+    def test_not_modified_with_the_compressed_etag(self):
+        etag = self.get()['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        for user in (None, self.user):
+            with self.subTest(user=user):
+                if user:
+                    self.client.force_login(user)
+                response = self.get(if_none_match=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+                self.assertFalse(response.has_header('Content-Encoding'))
+                # The 304 carries the validators of the representation revalidated
+                self.assertEqual(response['ETag'], etag)
+                self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(self.get(encoding='', if_none_match=etag[2:])['ETag'], etag[2:])
+
+    def test_min_size(self):
+        size = len(self.get(encoding='').content)
+        with override_settings(COMPRESSION_MIN_SIZE=size + 1):
+            response = self.get()
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertFalse(response['ETag'].startswith('W/'))
+        cache.clear()
+        with override_settings(COMPRESSION_MIN_SIZE=size):
+            self.assertEqual(self.get()['Content-Encoding'], 'gzip')
+
+    def test_vary(self):
+        for encoding in ('', 'gzip'):
+            with self.subTest(encoding):
+                self.assertIn('Accept-Encoding', self.get(encoding=encoding)['Vary'])
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_token_responses_are_not_compressed(self):
+        response = self.client.post('/api/auth/login/', {'username': 'user', 'password': 'pw'},
+                                    content_type='application/json', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(self.get()['Content-Encoding'], 'gzip')
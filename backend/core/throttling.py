@@ -0,0 +1,104 @@
+"""
+Flood protection for the anonymous create endpoints.
+
+Throttles run in ``APIView.initial()``, before the serializer or the
+database is touched, so an over-limit request costs a couple of cache
+reads. Limits use a sliding window counter: two fixed-window counters
+(current and previous) updated with atomic ``cache.incr()``, with the
+previous window weighted by how much of it still overlaps the sliding
+window. Rates come from ``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']`` under
+``<view.throttle_scope>_ip`` and ``<view.throttle_scope>_email``.
+"""
+import hashlib
+import logging
+
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+from .cache import KEY_PREFIX
+
+logger = logging.getLogger(__name__)
+
+HITS_KEY = f'{KEY_PREFIX}:throttle:hits'
+
+
+def record_hit(scope):
+    """Count a throttled request for the scope"""
+    key = f'{HITS_KEY}:{scope}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_hits(scopes):
+    """Throttled request counts per scope since the cache was last cleared"""
+    values = cache.get_many([f'{HITS_KEY}:{scope}' for scope in scopes])
+    return {scope: values.get(f'{HITS_KEY}:{scope}', 0) for scope in scopes}
+
+
+class CreateRateThrottle(SimpleRateThrottle):
+    """Sliding window limit on anonymous ``create`` requests"""
+    kind = None
+
+    def __init__(self):
+        # The scope depends on the view, see allow_request()
+        pass
+
+    def allow_request(self, request, view):
+        if getattr(view, 'action', None) != 'create' or request.user.is_authenticated:
+            return True
+        self.scope = f'{view.throttle_scope}_{self.kind}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current, previous = f'{self.key}:{window}', f'{self.key}:{window - 1}'
+        counts = self.cache.get_many([current, previous])
+        overlap = 1 - (self.now % self.duration) / self.duration
+        if counts.get(previous, 0) * overlap + counts.get(current, 0) >= self.num_requests:
+            return self.throttle_failure()
+
+        self.cache.add(current, 0, self.duration * 2)
+        try:
+            self.cache.incr(current)
+        except ValueError:
+            self.cache.set(current, 1, self.duration * 2)
+        return True
+
+    def throttle_failure(self):
+        record_hit(self.scope)
+        logger.warning('Throttled %s request (%s)', self.scope, self.rate)
+        return False
+
+    def wait(self):
+        # The previous window's weight decays to zero by the end of this one
+        return self.duration - self.now % self.duration
+
+    def key_for(self, ident):
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class IPCreateThrottle(CreateRateThrottle):
+    kind = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.key_for(self.get_ident(request))
+
+
+class EmailCreateThrottle(CreateRateThrottle):
+    kind = 'email'
+
+    def get_cache_key(self, request, view):
+        try:
+            email = request.data.get(getattr(view, 'throttle_email_field', 'email'))
+        except AttributeError:
+            return None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return self.key_for(hashlib.md5(email.strip().lower().encode()).hexdigest())
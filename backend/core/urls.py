@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import BootstrapView, MetricsView, ProfileDetailView, ProfileListView
+
+urlpatterns = [
+    path('bootstrap/', BootstrapView.as_view(), name='bootstrap'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('profiles/<str:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
+]
@@ -0,0 +1,55 @@
+from importlib import import_module
+
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.routers import APIRootView
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSetMixin
+
+
+def _walk(patterns, prefix=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            yield prefix, pattern
+
+
+def get_api_viewsets():
+    """
+    Return {viewset class: URL prefix} for every ViewSet routed in the
+    project URLconf, in URLconf order.
+    """
+    viewsets = {}
+    for prefix, pattern in _walk(get_resolver().url_patterns):
+        cls = getattr(pattern.callback, 'cls', None)
+        if cls is not None and issubclass(cls, ViewSetMixin) and cls not in viewsets:
+            viewsets[cls] = '/' + prefix
+    return viewsets
+
+
+def get_api_views():
+    """
+    Return {APIView class: path} for the non-ViewSet API views that take no
+    URL arguments and answer GET (e.g. /api/bootstrap/).
+    """
+    views = {}
+    for prefix, pattern in _walk(get_resolver().url_patterns):
+        path = prefix + str(pattern.pattern)
+        cls = getattr(pattern.callback, 'view_class', None)
+        if (cls is None or not issubclass(cls, APIView) or issubclass(cls, (ViewSetMixin, APIRootView))
+                or not hasattr(cls, 'get') or '<' in path or cls in views):
+            continue
+        views[cls] = '/' + path
+    return views
+
+
+
+def get_serializer_classes(viewset):
+    """The viewset's serializer_class plus the other serializers of its model in its module"""
+    classes = [viewset.serializer_class]
+    module = import_module(viewset.__module__)
+    for value in vars(module).values():
+        if (isinstance(value, type) and value not in classes
+                and getattr(getattr(value, 'Meta', None), 'model', None) is viewset.queryset.model):
+            classes.append(value)
+    return classes
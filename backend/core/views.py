@@ -0,0 +1,165 @@
+import hmac
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from articles.models import Article
+from articles.serializers import ArticleSerializer
+from events.models import Event
+from events.serializers import EventSerializer
+from feedback.models import Feedback
+from feedback.serializers import PublicFeedbackSerializer
+from projects.models import Project
+from projects.serializers import ProjectSerializer
+from services.models import Service
+from services.serializers import ServiceSerializer
+
+from .cache import KEY_PREFIX, get_model_version
+from .conditional import apply_conditional, make_etag
+from .fast import compile_serializer
+from .metrics import registry, render_prometheus, time_serialization
+from .profiling import format_stats, list_profiles, profile_path
+
+
+class Section:
+    def __init__(self, model, serializer_class, get_queryset, default_limit, max_limit=50):
+        self.model = model
+        self.serializer_class = serializer_class
+        self.get_queryset = get_queryset
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def serialize(self, limit, context):
+        queryset = self.get_queryset()[:limit]
+        serializer = self.serializer_class(context=context)
+        compiled = compile_serializer(serializer, self.model)
+        if compiled is None:
+            return self.serializer_class(queryset, many=True, context=context).data
+        rows = list(compiled.rows(queryset))
+        # Bound like FastListMixin.represent(), so contextual fields see the request
+        with time_serialization():
+            converters = compiled.bind(context)
+            return [compiled.to_representation(row, converters) for row in rows]
+
+
+class BootstrapView(APIView):
+    """
+    Everything the homepage needs in one request.
+
+    Each section is cached on its own under its model's cache version, so
+    editing an article only rebuilds the articles section. Limits are set
+    per section with ``?<section>=<n>`` (0 leaves the section out).
+    """
+    permission_classes = [permissions.AllowAny]
+    replica_reads = True
+    sections = {
+        'services': Section(Service, ServiceSerializer, Service.objects.all, 6),
+        'projects': Section(Project, ProjectSerializer, Project.objects.all, 6),
+        'articles': Section(Article, ArticleSerializer, Article.objects.all, 3),
+        'events': Section(
+            Event, EventSerializer,
+            lambda: Event.objects.filter(event_type='upcoming').order_by('date', 'id'), 3,
+        ),
+        'testimonials': Section(
+            Feedback, PublicFeedbackSerializer,
+            lambda: Feedback.objects.filter(approved=True), 6,
+        ),
+    }
+
+    def get_limits(self, request):
+        limits = {}
+        for name, section in self.sections.items():
+            try:
+                limit = int(request.query_params.get(name, section.default_limit))
+            except ValueError:
+                limit = section.default_limit
+            limit = max(0, min(limit, section.max_limit))
+            if limit:
+                limits[name] = limit
+        return limits
+
+    def get(self, request, *args, **kwargs):
+        limits = self.get_limits(request)
+        versions = {name: get_model_version(self.sections[name].model) for name in limits}
+        keys = {
+            name: f'{KEY_PREFIX}:bootstrap:{name}:{versions[name]}:{limit}'
+            for name, limit in limits.items()
+        }
+
+        etag = make_etag(request.accepted_renderer.media_type, *keys.values())
+        not_modified = apply_conditional(request, etag, None)
+        if not_modified is not None:
+            return not_modified
+
+        cached = cache.get_many(keys.values())
+        # One context for every section: e.g. the srcset map is read once
+        context = {'request': request, 'view': self, 'format': self.format_kwarg}
+        data, missing = {}, {}
+        for name, key in keys.items():
+            if key in cached:
+                data[name] = cached[key]
+            else:
+                data[name] = missing[key] = self.sections[name].serialize(limits[name], context)
+        if missing:
+            cache.set_many(missing, settings.API_CACHE_TIMEOUT)
+
+        response = Response(data)
+        response['ETag'] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+class MetricsPermission(permissions.BasePermission):
+    """Staff users, or a scraper sending ``Authorization: Metrics <METRICS_TOKEN>``"""
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        header = request.headers.get('Authorization', '')
+        if token and hmac.compare_digest(header.encode(), f'Metrics {token}'.encode()):
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class MetricsView(APIView):
+    """Request metrics in Prometheus text format"""
+    permission_classes = [MetricsPermission]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            render_prometheus(registry.collect()),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
+
+
+class ProfileListView(APIView):
+    """Stored request profiles, newest first"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(list_profiles())
+
+
+class ProfileDetailView(APIView):
+    """
+    Download a profile as a ``.prof`` file, or with ``?stats=<sort>`` read
+    the top functions as a pstats text report (``cumulative``, ``tottime``...)
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        path = profile_path(profile_id, '.prof')
+        if path is None or not path.exists():
+            raise Http404
+        sort = request.query_params.get('stats')
+        if sort:
+            try:
+                report = format_stats(path, sort)
+            except KeyError:
+                return Response({'stats': [f'Unknown sort key "{sort}".']}, status=400)
+            return HttpResponse(report, content_type='text/plain; charset=utf-8')
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
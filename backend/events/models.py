@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, list_indexes
 
 class Event(BaseModel):
     EVENT_TYPES = [
@@ -19,6 +19,7 @@ class Event(BaseModel):
     
     class Meta:
         ordering = ['-date']
+        indexes = list_indexes(ordering, ['event_type', 'location'])
     
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -1,8 +1,12 @@
 from rest_framework import serializers
+from core.sparse import DynamicFieldsMixin
+from images.fields import SrcsetField
 from .models import Event
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = Event
-        fields = ['id', 'title', 'description', 'image', 'date', 'time', 
+        fields = ['id', 'title', 'description', 'image', 'srcset', 'date', 'time', 
                  'location', 'event_type', 'max_attendees', 'registration_link', 'created_at']
\ No newline at end of file
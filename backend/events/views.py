@@ -1,18 +1,28 @@
 from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
+from changes.sync import DeltaSyncMixin, UpdatedSinceFilter
+from core.asyncviews import AsyncReadMixin
+from core.bulk import BulkModelViewSetMixin
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.fast import FastListMixin
+from core.search import FullTextSearchFilter
+from core.sparse import SparseFieldsetMixin
 from .models import Event
 from .serializers import EventSerializer
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(BulkModelViewSetMixin, CachedResponseMixin, ConditionalGetMixin,
+                   SparseFieldsetMixin, FastListMixin, DeltaSyncMixin, AsyncReadMixin,
+                   viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, UpdatedSinceFilter]
     filterset_fields = ['event_type', 'location']
     search_fields = ['title', 'description', 'location']
     ordering_fields = ['date', 'created_at', 'title']
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'delta']:
             permission_classes = [permissions.AllowAny]
         else:
             permission_classes = [permissions.IsAuthenticated]
@@ -10,9 +10,11 @@ class FeedbackAdmin(admin.ModelAdmin):
     actions = ['approve_feedback', 'reject_feedback']
     
     def approve_feedback(self, request, queryset):
-        queryset.update(approved=True)
+        updated = queryset.moderate(True)
+        self.message_user(request, f"{updated} feedback approved")
     approve_feedback.short_description = "Approve selected feedback"
     
     def reject_feedback(self, request, queryset):
-        queryset.update(approved=False)
+        updated = queryset.moderate(False)
+        self.message_user(request, f"{updated} feedback rejected")
     reject_feedback.short_description = "Reject selected feedback"
\ No newline at end of file
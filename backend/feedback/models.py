@@ -1,5 +1,13 @@
 from django.db import models
-from core.models import BaseModel
+from django.db.models import Q
+from core.models import BaseModel, BaseQuerySet, list_indexes
+
+
+class FeedbackQuerySet(BaseQuerySet):
+    def moderate(self, approved):
+        """Set approved on the rows that differ in a single UPDATE; return the count"""
+        return self.exclude(approved=approved).update(approved=approved)
+
 
 class Feedback(BaseModel):
     name = models.CharField(max_length=100)
@@ -8,9 +16,16 @@ class Feedback(BaseModel):
     rating = models.PositiveIntegerField(choices=[(i, i) for i in range(1, 6)])
     review = models.TextField()
     approved = models.BooleanField(default=False)
+
+    objects = FeedbackQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
+        indexes = list_indexes(ordering, ['approved', 'rating']) + [
+            # Public testimonials list: approved only, newest first
+            models.Index(fields=['-created_at'], condition=Q(approved=True),
+                         name='feedback_public_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.rating} stars"
\ No newline at end of file
@@ -1,12 +1,26 @@
 from rest_framework import serializers
+from core.sparse import DynamicFieldsMixin
 from .models import Feedback
 
-class FeedbackSerializer(serializers.ModelSerializer):
+class FeedbackSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Feedback
         fields = ['id', 'name', 'email', 'company', 'rating', 'review', 'approved', 'created_at']
         
-class PublicFeedbackSerializer(serializers.ModelSerializer):
+class PublicFeedbackSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Feedback
-        fields = ['id', 'name', 'company', 'rating', 'review', 'created_at']
\ No newline at end of file
+        fields = ['id', 'name', 'company', 'rating', 'review', 'created_at']
+
+
+class ModerationSerializer(serializers.Serializer):
+    """Bulk approve/reject: either a list of ids or a filter on filterset fields"""
+    action = serializers.ChoiceField(choices=['approve', 'reject'])
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False,
+                                allow_empty=False, max_length=1000)
+    filter = serializers.DictField(required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Provide either "ids" or "filter".')
+        return attrs
\ No newline at end of file
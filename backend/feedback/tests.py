@@ -0,0 +1,97 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.cache import get_model_version
+from stats.counters import snapshot
+
+from .models import Feedback
+
+
+def feedback(name, rating=5, approved=False):
+    return Feedback.objects.create(name=name, email=f'{name.lower()}@example.com', rating=rating,
+                                   review='Good', approved=approved)
+
+
+class ModerationTests(TestCase):
+    path = '/api/feedback/moderate/'
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('moderator', password='pw'))
+        self.pending = [feedback(f'P{i}', rating=i) for i in range(1, 4)]
+        self.approved = feedback('A', rating=1, approved=True)
+
+    def moderate(self, data):
+        return self.client.post(self.path, data, content_type='application/json')
+
+    def test_requires_authentication(self):
+        self.client.logout()
+        self.assertEqual(self.moderate({'action': 'approve', 'ids': [self.pending[0].pk]}).status_code, 401)
+        self.assertFalse(Feedback.objects.filter(pk=self.pending[0].pk, approved=True).exists())
+
+    def test_approve_by_ids(self):
+        first, second, _ = self.pending
+        response = self.moderate({'action': 'approve', 'ids': [first.pk, self.approved.pk, 9999, second.pk, first.pk]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'updated': 2, 'results': [
+            {'id': first.pk, 'status': 'approved'},
+            {'id': self.approved.pk, 'status': 'unchanged'},
+            {'id': 9999, 'status': 'not_found'},
+            {'id': second.pk, 'status': 'approved'},
+        ]})
+        self.assertEqual(set(Feedback.objects.filter(approved=True).values_list('pk', flat=True)),
+                         {first.pk, second.pk, self.approved.pk})
+
+    def test_reject_by_filter(self):
+        response = self.moderate({'action': 'reject', 'filter': {'rating': 1}})
+        self.assertEqual(response.json(), {'updated': 1, 'matched': 2, 'unchanged': 1})
+        self.assertFalse(Feedback.objects.filter(approved=True).exists())
+
+    def test_approve_by_filter(self):
+        response = self.moderate({'action': 'approve', 'filter': {'approved': False}})
+        self.assertEqual(response.json(), {'updated': 3, 'matched': 3, 'unchanged': 0})
+        self.assertEqual(Feedback.objects.filter(approved=True).count(), 4)
+
+    def test_invalid_requests(self):
+        for data in [
+            {'action': 'approve'},
+            {'action': 'approve', 'ids': [1], 'filter': {'rating': 1}},
+            {'action': 'publish', 'ids': [1]},
+            {'action': 'approve', 'ids': list(range(1001))},
+            {'action': 'approve', 'filter': {'email': 'a@example.com'}},
+            {'action': 'approve', 'filter': {'rating': 'many'}},
+        ]:
+            with self.subTest(data):
+                self.assertEqual(self.moderate(data).status_code, 400)
+        self.assertEqual(Feedback.objects.filter(approved=True).count(), 1)
+
+    def test_only_changed_rows_get_a_new_updated_at(self):
+        before = dict(Feedback.objects.values_list('pk', 'updated_at'))
+        self.moderate({'action': 'approve', 'filter': {'rating': 1}})
+        after = dict(Feedback.objects.values_list('pk', 'updated_at'))
+        self.assertGreater(after[self.pending[0].pk], before[self.pending[0].pk])
+        self.assertEqual(after[self.approved.pk], before[self.approved.pk])
+        self.assertEqual(after[self.pending[1].pk], before[self.pending[1].pk])
+
+    def test_invalidates_cached_list_and_stats(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/feedback/').json()['results'][0]['id'], self.approved.pk)
+        self.assertEqual(snapshot()['feedback']['approved'], 1)
+        version = get_model_version(Feedback)
+
+        self.client.force_login(User.objects.get(username='moderator'))
+        self.moderate({'action': 'approve', 'ids': [row.pk for row in self.pending]})
+        self.assertNotEqual(get_model_version(Feedback), version)
+        self.assertEqual(snapshot()['feedback'], {
+            'approved': 4, 'pending': 0, 'average_rating': 1.75,
+            'rating_histogram': {'1': 2, '2': 1, '3': 1, '4': 0, '5': 0},
+        })
+        self.client.logout()
+        self.assertEqual(len(self.client.get('/api/feedback/').json()['results']), 4)
+
+    def test_no_op_leaves_cache_version(self):
+        version = get_model_version(Feedback)
+        response = self.moderate({'action': 'approve', 'ids': [self.approved.pk]})
+        self.assertEqual(response.json()['updated'], 0)
+        self.assertEqual(get_model_version(Feedback), version)
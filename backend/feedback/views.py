@@ -1,32 +1,46 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
+from changes.sync import DeltaSyncMixin, UpdatedSinceFilter
+from core.asyncviews import AsyncReadMixin
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.fast import FastListMixin
+from core.search import FullTextSearchFilter
+from core.sparse import SparseFieldsetMixin
+from core.throttling import EmailCreateThrottle, IPCreateThrottle
 from .models import Feedback
-from .serializers import FeedbackSerializer, PublicFeedbackSerializer
+from .serializers import FeedbackSerializer, ModerationSerializer, PublicFeedbackSerializer
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+class FeedbackViewSet(CachedResponseMixin, ConditionalGetMixin, SparseFieldsetMixin,
+                      FastListMixin, DeltaSyncMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, UpdatedSinceFilter]
     filterset_fields = ['approved', 'rating']
     search_fields = ['name', 'company', 'review']
     ordering_fields = ['created_at', 'rating']
+    pagination_mode = 'cursor'
+    throttle_classes = [IPCreateThrottle, EmailCreateThrottle]
+    throttle_scope = 'feedback'
     
     def get_permissions(self):
-        if self.action in ['list', 'create']:
+        if self.action in ['list', 'create', 'delta']:
             permission_classes = [permissions.AllowAny]
         else:
             permission_classes = [permissions.IsAuthenticated]
         return [permission() for permission in permission_classes]
     
     def get_queryset(self):
-        if self.action == 'list' and not self.request.user.is_authenticated:
+        if self.action in ('list', 'delta') and not self.request.user.is_authenticated:
             return Feedback.objects.filter(approved=True)
         return super().get_queryset()
     
     def get_serializer_class(self):
-        if self.action == 'list' and not self.request.user.is_authenticated:
+        if self.action in ('list', 'delta') and not self.request.user.is_authenticated:
             return PublicFeedbackSerializer
         return super().get_serializer_class()
     
@@ -34,12 +48,56 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     def approve(self, request, pk=None):
         feedback = self.get_object()
         feedback.approved = True
-        feedback.save()
+        feedback.save(update_fields=['approved', 'updated_at'])
         return Response({'status': 'approved'})
     
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def reject(self, request, pk=None):
         feedback = self.get_object()
         feedback.approved = False
-        feedback.save()
-        return Response({'status': 'rejected'})
\ No newline at end of file
+        feedback.save(update_fields=['approved', 'updated_at'])
+        return Response({'status': 'rejected'})
+
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    def moderate(self, request):
+        """Approve or reject many feedback entries with one UPDATE"""
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        approve = serializer.validated_data['action'] == 'approve'
+        done = 'approved' if approve else 'rejected'
+
+        if 'filter' in serializer.validated_data:
+            # A filter can match any number of rows: update through it and report counts
+            queryset = self.moderation_filter(Feedback.objects.all(), serializer.validated_data['filter'])
+            with transaction.atomic():
+                matched = queryset.count()
+                updated = queryset.moderate(approve)
+            return Response({'updated': updated, 'matched': matched, 'unchanged': matched - updated})
+
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        with transaction.atomic():
+            previous = dict(
+                Feedback.objects.filter(pk__in=ids).select_for_update().values_list('pk', 'approved')
+            )
+            updated = Feedback.objects.filter(pk__in=list(previous)).moderate(approve)
+
+        results = []
+        for pk in ids:
+            if pk not in previous:
+                outcome = 'not_found'
+            elif previous[pk] == approve:
+                outcome = 'unchanged'
+            else:
+                outcome = done
+            results.append({'id': pk, 'status': outcome})
+        return Response({'updated': updated, 'results': results})
+
+    def moderation_filter(self, queryset, data):
+        filterset_class = DjangoFilterBackend().get_filterset_class(self, queryset)
+        unknown = set(data) - set(filterset_class.base_filters)
+        if unknown:
+            raise ValidationError({'filter': [f'Unknown filter: {name}' for name in sorted(unknown)]})
+        filterset = filterset_class(data, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise ValidationError({'filter': filterset.errors})
+        return filterset.qs
\ No newline at end of file
@@ -29,7 +29,7 @@ def fix_migrations():
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_solutions.settings')
     
     # Make migrations for each app
-    apps = ['core', 'services', 'projects', 'articles', 'events', 'feedback', 'gallery', 'contacts']
+    apps = ['core', 'services', 'projects', 'articles', 'events', 'feedback', 'gallery', 'contacts', 'jobs', 'stats', 'images', 'changes']
     
     print("\n📦 Creating migrations for all apps...")
     for app in apps:
@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, list_indexes
 
 class GalleryItem(BaseModel):
     filename = models.CharField(max_length=200)
@@ -10,6 +10,7 @@ class GalleryItem(BaseModel):
     
     class Meta:
         ordering = ['-upload_date']
+        indexes = list_indexes(ordering, ['category'])
     
     def __str__(self):
         return self.filename
\ No newline at end of file
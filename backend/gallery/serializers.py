@@ -1,7 +1,11 @@
 from rest_framework import serializers
+from core.sparse import DynamicFieldsMixin
+from images.fields import SrcsetField
 from .models import GalleryItem
 
-class GalleryItemSerializer(serializers.ModelSerializer):
+class GalleryItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = GalleryItem
-        fields = ['id', 'filename', 'image', 'category', 'upload_date', 'description', 'created_at']
\ No newline at end of file
+        fields = ['id', 'filename', 'image', 'srcset', 'category', 'upload_date', 'description', 'created_at']
\ No newline at end of file
@@ -1,18 +1,28 @@
 from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
+from changes.sync import DeltaSyncMixin, UpdatedSinceFilter
+from core.asyncviews import AsyncReadMixin
+from core.bulk import BulkModelViewSetMixin
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.fast import FastListMixin
+from core.search import FullTextSearchFilter
+from core.sparse import SparseFieldsetMixin
 from .models import GalleryItem
 from .serializers import GalleryItemSerializer
 
-class GalleryItemViewSet(viewsets.ModelViewSet):
+class GalleryItemViewSet(BulkModelViewSetMixin, CachedResponseMixin, ConditionalGetMixin,
+                         SparseFieldsetMixin, FastListMixin, DeltaSyncMixin, AsyncReadMixin,
+                         viewsets.ModelViewSet):
     queryset = GalleryItem.objects.all()
     serializer_class = GalleryItemSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, UpdatedSinceFilter]
     filterset_fields = ['category']
     search_fields = ['filename', 'description', 'category']
     ordering_fields = ['upload_date', 'created_at', 'filename']
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'delta']:
             permission_classes = [permissions.AllowAny]
         else:
             permission_classes = [permissions.IsAuthenticated]
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import ImageSource
+from .variants import queue_variants
+
+@admin.register(ImageSource)
+class ImageSourceAdmin(admin.ModelAdmin):
+    list_display = ['url', 'status', 'width', 'height', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['url', 'digest']
+    readonly_fields = ['digest', 'width', 'height', 'variants', 'last_error',
+                       'created_at', 'updated_at']
+    actions = ['regenerate_variants']
+
+    def regenerate_variants(self, request, queryset):
+        queue_variants(queryset.values_list('url', flat=True), force=True)
+    regenerate_variants.short_description = "Regenerate variants for selected images"
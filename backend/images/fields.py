@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from .variants import get_srcsets
+
+
+class SrcsetField(serializers.Field):
+    """
+    ``{"webp": "<url> 320w, ...", "jpeg": "..."}`` for the model's image URL,
+    or null until its variants have been generated.
+
+    The srcset map is looked up once per serializer context, i.e. once per
+    response, rather than once per row.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', 'image')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.get_srcsets(self.context).get(value)
+
+    def get_list_converter(self, context):
+        """The converter core.fast uses for one list response"""
+        return self.get_srcsets(context).get
+
+    @staticmethod
+    def get_srcsets(context):
+        if 'srcsets' not in context:
+            context['srcsets'] = get_srcsets()
+        return context['srcsets']
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from images.models import ImageSource
+from images.variants import generate, image_models, queue_variants
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive variants for every image URL referenced by the content models'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true',
+                            help='Generate now instead of queueing jobs for the worker')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate images whose variants already exist')
+
+    def handle(self, *args, **options):
+        urls = set()
+        for model in image_models():
+            urls.update(model._default_manager.values_list('image', flat=True))
+        if not options['sync']:
+            queue_variants(urls, force=options['force'])
+            self.stdout.write(self.style.SUCCESS(f'Queued variants for {len(urls)} image URL(s)'))
+            return
+
+        ImageSource.objects.bulk_create([ImageSource(url=url) for url in urls], ignore_conflicts=True)
+        sources = list(ImageSource.objects.filter(url__in=urls))
+        errors = generate(sources, force=options['force'])
+        for source, error in zip(sources, errors):
+            if error is not None:
+                self.stdout.write(self.style.WARNING(f'{source.url}: {error}'))
+        failed = sum(error is not None for error in errors)
+        self.stdout.write(self.style.SUCCESS(f'{len(sources) - failed} image(s) ready, {failed} failed'))
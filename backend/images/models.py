@@ -0,0 +1,30 @@
+from django.db import models
+from core.models import BaseModel, list_indexes
+
+class ImageSource(BaseModel):
+    """A remote image URL and the resized variants generated from it"""
+    PENDING = 'pending'
+    READY = 'ready'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (READY, 'Ready'),
+        (FAILED, 'Failed'),
+    ]
+
+    url = models.URLField(max_length=500, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    # SHA-256 of the source bytes; variants are stored under it
+    digest = models.CharField(max_length=64, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # [{"width": 320, "format": "webp", "path": "variants/ab/<digest>/320.webp"}, ...]
+    variants = models.JSONField(default=list, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = list_indexes(ordering, ['status'])
+
+    def __str__(self):
+        return self.url
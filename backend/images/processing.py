@@ -0,0 +1,43 @@
+"""
+Pillow resizing, run in worker processes.
+
+Kept free of Django imports so pool workers started with ``spawn`` do not
+need a configured project.
+"""
+import io
+
+from PIL import Image, ImageOps
+
+SAVE_OPTIONS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def target_widths(source_width, widths):
+    """Requested widths below the source width, plus the source capped at the largest"""
+    targets = {width for width in widths if width < source_width}
+    targets.add(min(source_width, max(widths)))
+    return sorted(targets)
+
+
+def render(data, widths, formats):
+    """Return ((width, height), [(width, format, bytes), ...]) for one source image"""
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        size = image.size
+        if image.mode not in ('RGB', 'RGBA', 'L'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        outputs = []
+        for width in target_widths(image.width, widths):
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize(
+                (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+            )
+            for name in formats:
+                format_name, options = SAVE_OPTIONS[name]
+                frame = resized.convert('RGB') if name == 'jpeg' and resized.mode == 'RGBA' else resized
+                buffer = io.BytesIO()
+                frame.save(buffer, format_name, **options)
+                outputs.append((width, name, buffer.getvalue()))
+    return size, outputs
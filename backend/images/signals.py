@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.signals import bulk_changed
+
+from .variants import has_image, queue_variants
+
+
+@receiver(post_save)
+def queue_saved_image(sender, instance, **kwargs):
+    if has_image(sender):
+        queue_variants([instance.image])
+
+
+@receiver(bulk_changed)
+def queue_bulk_images(sender, action, objs=(), values=None, **kwargs):
+    if not has_image(sender):
+        return
+    if objs:
+        queue_variants([obj.image for obj in objs])
+    elif values and isinstance(values.get('image'), str):
+        queue_variants([values['image']])
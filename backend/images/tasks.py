@@ -0,0 +1,16 @@
+from jobs.registry import task
+from .models import ImageSource
+from .variants import generate
+
+
+@task('images.generate_variants', batch=True, max_attempts=3)
+def generate_variants(payloads):
+    """Fetch and resize a batch of source images, rendering them in parallel"""
+    sources = ImageSource.objects.in_bulk([payload['url'] for payload in payloads], field_name='url')
+    errors = {}
+    for force in (False, True):
+        batch = [payload['url'] for payload in payloads
+                 if payload['url'] in sources and bool(payload.get('force')) == force]
+        errors.update(zip(batch, generate([sources[url] for url in batch], force=force)))
+    # Sources deleted since the job was queued have nothing left to do
+    return [errors.get(payload['url']) for payload in payloads]
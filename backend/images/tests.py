@@ -0,0 +1,105 @@
+import io
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from images import variants
+from images.models import ImageSource
+from services.models import Service
+from services.serializers import ServiceSerializer
+
+
+def jpeg_bytes(width=800, height=600):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (40, 120, 200)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """Stands in for the remote image host: /photo-<n>.jpg is a JPEG, anything else 404s"""
+    body = jpeg_bytes()
+
+    def do_GET(self):
+        if not self.path.startswith('/photo-'):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SrcsetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        cls.media_root = tempfile.mkdtemp()
+        cls.settings = override_settings(MEDIA_ROOT=cls.media_root, IMAGE_VARIANT_WORKERS=0)
+        cls.settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        for i in range(3):
+            Service.objects.create(name=f'Service {i}', description='d', features=[],
+                                   image=f'{self.base_url}/photo-{i}.jpg')
+        Service.objects.create(name='Missing', description='d', features=[],
+                               image=f'{self.base_url}/missing.jpg')
+        with self.assertLogs('images.variants', 'WARNING'):
+            call_command('generate_image_variants', '--sync', stdout=io.StringIO())
+
+    def count_lookups(self):
+        return mock.patch.object(variants, 'get_model_version', wraps=variants.get_model_version)
+
+    def test_variants_generated_from_http_source(self):
+        statuses = dict(ImageSource.objects.values_list('url', 'status'))
+        self.assertEqual(statuses[f'{self.base_url}/photo-0.jpg'], ImageSource.READY)
+        self.assertEqual(statuses[f'{self.base_url}/missing.jpg'], ImageSource.FAILED)
+        source = ImageSource.objects.get(url=f'{self.base_url}/photo-0.jpg')
+        self.assertEqual((source.width, source.height), (800, 600))
+        self.assertEqual(len(source.variants), 6)
+
+    def test_compiled_list_looks_up_srcsets_once(self):
+        with self.count_lookups() as lookup:
+            response = self.client.get('/api/services/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lookup.call_count, 1)
+        srcsets = {row['name']: row['srcset'] for row in response.json()['results']}
+        self.assertIsNone(srcsets['Missing'])
+        self.assertIn('640w', srcsets['Service 0']['webp'])
+        # Never upscaled past the 800px source
+        self.assertIn('800w', srcsets['Service 2']['jpeg'])
+        self.assertNotIn('960w', srcsets['Service 2']['jpeg'])
+
+    def test_serializer_looks_up_srcsets_once(self):
+        with self.count_lookups() as lookup:
+            data = ServiceSerializer(Service.objects.all(), many=True).data
+        self.assertEqual(lookup.call_count, 1)
+        self.assertEqual(sum(row['srcset'] is not None for row in data), 3)
+
+    def test_compiled_list_matches_serializer(self):
+        response = self.client.get('/api/services/?pagination=page')
+        data = ServiceSerializer(Service.objects.all(), many=True).data
+        self.assertEqual(
+            {row['id']: row['srcset'] for row in response.json()['results']},
+            {row['id']: row['srcset'] for row in data},
+        )
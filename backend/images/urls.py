@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import serve_variant
+
+urlpatterns = [
+    path('<path:path>', serve_variant, name='image-variant'),
+]
@@ -0,0 +1,177 @@
+"""
+Responsive image variants for the remote ``image`` URLs.
+
+Each source URL is fetched once and resized in a process pool into the
+widths in ``IMAGE_VARIANT_WIDTHS`` and the formats in
+``IMAGE_VARIANT_FORMATS``. Files are stored under
+``MEDIA_ROOT/variants/<digest[:2]>/<digest>/`` where digest is the SHA-256
+of the source bytes, so a path never changes content and can be served
+with immutable cache headers. Once variants exist, rows pointing at the
+URL are touched so cached responses and ETags pick up the new ``srcset``.
+"""
+import hashlib
+import logging
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+
+from core.cache import KEY_PREFIX, get_model_version
+from core.models import BaseModel
+
+from .models import ImageSource
+from .processing import render
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+
+def has_image(model):
+    try:
+        return isinstance(model._meta.get_field('image'), models.URLField)
+    except FieldDoesNotExist:
+        return False
+
+
+def image_models():
+    return [model for model in apps.get_models() if issubclass(model, BaseModel) and has_image(model)]
+
+
+def variant_path(digest, width, format_name):
+    return f'variants/{digest[:2]}/{digest}/{width}.{EXTENSIONS[format_name]}'
+
+
+def fetch(url):
+    request = urllib.request.Request(url, headers={'User-Agent': 'ai-solutions-image-variants'})
+    with urllib.request.urlopen(request, timeout=settings.IMAGE_FETCH_TIMEOUT) as response:
+        data = response.read(settings.IMAGE_MAX_BYTES + 1)
+    if len(data) > settings.IMAGE_MAX_BYTES:
+        raise ValueError(f'{url} is larger than {settings.IMAGE_MAX_BYTES} bytes')
+    return data
+
+
+def _fetch_or_error(url):
+    try:
+        return fetch(url)
+    except Exception as exc:
+        return exc
+
+
+def queue_variants(urls, force=False):
+    """Record new image URLs and queue variant generation for them"""
+    from .tasks import generate_variants
+
+    urls = {url for url in urls if url}
+    if not urls:
+        return
+    known = set(ImageSource.objects.filter(url__in=urls).values_list('url', flat=True))
+    ImageSource.objects.bulk_create(
+        [ImageSource(url=url) for url in urls - known], ignore_conflicts=True
+    )
+    for url in sorted(urls if force else urls - known):
+        generate_variants.delay(url=url, force=force)
+
+
+def generate(sources, force=False):
+    """Generate variants for ImageSource rows; return errors aligned with sources"""
+    widths = settings.IMAGE_VARIANT_WIDTHS
+    formats = settings.IMAGE_VARIANT_FORMATS
+    errors = [None] * len(sources)
+    todo = [i for i, source in enumerate(sources) if force or source.status != ImageSource.READY]
+    if not todo:
+        return errors
+
+    # Fetching is I/O bound, resizing is CPU bound
+    with ThreadPoolExecutor(max_workers=min(8, len(todo))) as threads:
+        fetched = dict(zip(todo, threads.map(_fetch_or_error, [sources[i].url for i in todo])))
+    jobs = {i: data for i, data in fetched.items() if not isinstance(data, Exception)}
+    results = dict(_render_all(jobs, widths, formats))
+
+    for i in todo:
+        source = sources[i]
+        result = fetched[i] if i not in jobs else results[i]
+        if isinstance(result, Exception):
+            errors[i] = result
+            logger.warning('Image variants failed for %s: %s', source.url, result)
+            ImageSource.objects.filter(pk=source.pk).update(
+                status=ImageSource.FAILED, last_error=repr(result)
+            )
+            continue
+        digest = hashlib.sha256(jobs[i]).hexdigest()
+        (width, height), outputs = result
+        variants = []
+        for variant_width, format_name, data in outputs:
+            path = variant_path(digest, variant_width, format_name)
+            if not default_storage.exists(path):
+                default_storage.save(path, ContentFile(data))
+            variants.append({'width': variant_width, 'format': format_name, 'path': path})
+        ImageSource.objects.filter(pk=source.pk).update(
+            status=ImageSource.READY, digest=digest, width=width, height=height,
+            variants=variants, last_error='',
+        )
+        touch_references([source.url])
+    return errors
+
+
+def _render_all(jobs, widths, formats):
+    """Yield (index, result or exception) for each source's bytes"""
+    workers = settings.IMAGE_VARIANT_WORKERS
+    if not workers or len(jobs) <= 1:
+        for i, data in jobs.items():
+            try:
+                yield i, render(data, widths, formats)
+            except Exception as exc:
+                yield i, exc
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {i: pool.submit(render, data, widths, formats) for i, data in jobs.items()}
+        for i, future in futures.items():
+            try:
+                yield i, future.result()
+            except Exception as exc:
+                yield i, exc
+
+
+def touch_references(urls):
+    """Bump updated_at (and so cache versions and ETags) of rows using these URLs"""
+    for model in image_models():
+        model._default_manager.filter(image__in=urls).update()
+
+
+def build_srcset(variants):
+    srcset = {}
+    for format_name in settings.IMAGE_VARIANT_FORMATS:
+        candidates = sorted(
+            (variant['width'], variant['path'])
+            for variant in variants if variant['format'] == format_name
+        )
+        if candidates:
+            srcset[format_name] = ', '.join(
+                f'{default_storage.url(path)} {width}w' for width, path in candidates
+            )
+    return srcset
+
+
+_srcsets = {}
+
+
+def get_srcsets():
+    """Mapping of source URL -> {format: srcset} for every ready image"""
+    global _srcsets
+    version = get_model_version(ImageSource)
+    if _srcsets.get('version') != version:
+        key = f'{KEY_PREFIX}:images:srcsets:{version}'
+        srcsets = cache.get(key)
+        if srcsets is None:
+            ready = ImageSource.objects.filter(status=ImageSource.READY)
+            srcsets = {url: build_srcset(variants) for url, variants in ready.values_list('url', 'variants')}
+            cache.set(key, srcsets, settings.API_CACHE_TIMEOUT)
+        _srcsets = {'version': version, 'srcsets': srcsets}
+    return _srcsets['srcsets']
@@ -0,0 +1,27 @@
+import re
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+
+from core.conditional import apply_conditional
+
+VARIANT_RE = re.compile(r'[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})/(?P<name>\d+\.(?P<ext>webp|jpg))')
+CONTENT_TYPES = {'webp': 'image/webp', 'jpg': 'image/jpeg'}
+
+
+def serve_variant(request, path):
+    """Serve a stored variant; paths are content addressed so never change"""
+    match = VARIANT_RE.fullmatch(path)
+    if match is None:
+        raise Http404
+    etag = f'"{match["digest"]}-{match["name"]}"'
+    response = apply_conditional(request, etag, None)
+    if response is None:
+        try:
+            response = FileResponse(default_storage.open(f'variants/{path}'),
+                                    content_type=CONTENT_TYPES[match['ext']])
+        except FileNotFoundError:
+            raise Http404
+        response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
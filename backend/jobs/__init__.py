@@ -0,0 +1 @@
+# Jobs app
\ No newline at end of file
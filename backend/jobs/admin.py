@@ -0,0 +1,17 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'run_at', 'created_at']
+    list_filter = ['status', 'name', 'created_at']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['created_at', 'updated_at', 'locked_by', 'locked_at', 'last_error']
+    actions = ['retry_jobs']
+    
+    def retry_jobs(self, request, queryset):
+        queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED, run_at=timezone.now(), attempts=0, last_error=''
+        )
+    retry_jobs.short_description = "Retry selected jobs now"
@@ -0,0 +1,41 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Process queued background jobs (contact notifications, ...)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Process the jobs that are due now and exit')
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='Maximum number of jobs claimed at a time')
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='Requeue running jobs whose worker has been silent this long (seconds)')
+        parser.add_argument('--keep-done', type=int, default=24,
+                            help='Hours to keep finished jobs before purging them')
+
+    def handle(self, *args, **options):
+        worker = Worker(batch_size=options['batch_size'], stale_after=options['stale_after'])
+        keep_done = timedelta(hours=options['keep_done'])
+        self.stdout.write(self.style.SUCCESS('Worker started'))
+        try:
+            while True:
+                processed = worker.run_once()
+                if processed:
+                    self.stdout.write(f'Processed {processed} job(s)')
+                    continue
+                if options['once']:
+                    break
+                worker.purge(timezone.now() - keep_done)
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('Worker stopped')
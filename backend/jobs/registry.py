@@ -0,0 +1,52 @@
+"""
+Task registry for the database-backed job queue.
+
+Declare handlers in an app's tasks.py:
+
+    @task('contacts.notify_admin', batch=True)
+    def notify_admin(payloads):
+        ...
+
+Single handlers are called as ``handler(payload)`` once per job. Batch
+handlers are called as ``handler(payloads)`` with every claimed job of that
+task and return a list with one entry per payload: None on success or the
+exception that made that job fail.
+"""
+from django.utils import timezone
+
+
+class Task:
+    def __init__(self, name, func, batch=False, max_attempts=5):
+        self.name = name
+        self.func = func
+        self.batch = batch
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, run_at=None, **payload):
+        """Queue a job for this task; payload must be JSON serializable"""
+        from .models import Job
+        return Job.objects.create(
+            name=self.name,
+            payload=payload,
+            run_at=run_at or timezone.now(),
+            max_attempts=self.max_attempts,
+        )
+
+
+_tasks = {}
+
+
+def task(name, batch=False, max_attempts=5):
+    def decorator(func):
+        if name in _tasks:
+            raise ValueError(f'Task {name!r} is already registered')
+        _tasks[name] = Task(name, func, batch=batch, max_attempts=max_attempts)
+        return _tasks[name]
+    return decorator
+
+
+def get_task(name):
+    return _tasks.get(name)
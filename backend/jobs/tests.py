@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Job
+from .registry import task
+from .worker import Worker, retry_delay
+
+calls = []
+
+
+@task('jobs.tests.flaky', max_attempts=2)
+def flaky(payload):
+    calls.append(payload)
+    if payload.get('fail'):
+        raise RuntimeError('boom')
+
+
+class WorkerTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_runs_due_jobs_only(self):
+        flaky.delay(n=1)
+        later = flaky.delay(run_at=timezone.now() + timedelta(hours=1), n=2)
+        self.assertEqual(Worker().run_once(), 1)
+        self.assertEqual(calls, [{'n': 1}])
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.QUEUED)
+
+    def test_failure_retries_then_fails(self):
+        job = flaky.delay(fail=True)
+        with self.assertLogs('jobs.worker', 'WARNING'):
+            Worker().run_once()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn('RuntimeError: boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            Worker().run_once()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_unknown_task_fails_without_retry(self):
+        job = Job.objects.create(name='jobs.tests.missing', max_attempts=5)
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            Worker().run_once()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 1))
+
+    def test_stale_running_jobs_are_requeued(self):
+        stale = flaky.delay(n=1)
+        Job.objects.filter(pk=stale.pk).update(
+            status=Job.RUNNING, locked_by='dead', locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(Worker(stale_after=600).run_once(), 1)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, Job.DONE)
+
+    def test_claimed_jobs_are_not_claimed_twice(self):
+        for n in range(3):
+            flaky.delay(n=n)
+        first, second = Worker(batch_size=2), Worker(batch_size=2)
+        claimed = first.claim() + second.claim()
+        self.assertEqual(sorted(job.pk for job in claimed), sorted(Job.objects.values_list('pk', flat=True)))
+
+    def test_retry_delay_backs_off_to_a_cap(self):
+        self.assertEqual(retry_delay(1), timedelta(seconds=30))
+        self.assertEqual(retry_delay(3), timedelta(seconds=120))
+        self.assertEqual(retry_delay(20), timedelta(hours=1))
+
+    def test_purge_keeps_recent_and_unfinished_jobs(self):
+        old = Job.objects.create(name='jobs.tests.flaky', status=Job.DONE)
+        Job.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        Job.objects.create(name='jobs.tests.flaky', status=Job.DONE)
+        Job.objects.create(name='jobs.tests.flaky', status=Job.FAILED)
+        self.assertEqual(Worker().purge(timezone.now() - timedelta(days=1)), 1)
+        self.assertEqual(Job.objects.count(), 2)
@@ -0,0 +1,104 @@
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts, base=30, cap=3600):
+    """Exponential backoff: 30s, 60s, 120s, ... capped at an hour"""
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+
+class Worker:
+    def __init__(self, batch_size=50, stale_after=600):
+        self.batch_size = batch_size
+        self.stale_after = timedelta(seconds=stale_after)
+
+    def release_stale(self):
+        """Requeue jobs whose worker died while running them"""
+        cutoff = timezone.now() - self.stale_after
+        return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+            status=Job.QUEUED, locked_by='', locked_at=None
+        )
+
+    def claim(self):
+        """Atomically mark up to batch_size due jobs as running for this worker"""
+        token = uuid.uuid4().hex
+        now = timezone.now()
+        with transaction.atomic():
+            due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by('run_at')
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            ids = list(due.values_list('pk', flat=True)[:self.batch_size])
+            # The status guard makes the claim safe on SQLite, where there are no
+            # row locks: a job another worker claimed first is simply not updated.
+            Job.objects.filter(pk__in=ids, status=Job.QUEUED).update(
+                status=Job.RUNNING, locked_by=token, locked_at=now,
+                attempts=F('attempts') + 1,
+            )
+        return list(Job.objects.filter(locked_by=token, status=Job.RUNNING).order_by('name', 'run_at'))
+
+    def run_once(self):
+        """Claim and run one batch; return the number of jobs processed"""
+        self.release_stale()
+        jobs = self.claim()
+        for name, group in groupby(jobs, key=lambda job: job.name):
+            self.run_group(name, list(group))
+        return len(jobs)
+
+    def run_group(self, name, jobs):
+        task = get_task(name)
+        if task is None:
+            for job in jobs:
+                self.finish(job, LookupError(f'No task registered as {name!r}'), retry=False)
+            return
+
+        if task.batch:
+            try:
+                errors = task([job.payload for job in jobs])
+            except Exception as exc:
+                errors = [exc] * len(jobs)
+            for job, error in zip(jobs, errors):
+                self.finish(job, error)
+        else:
+            for job in jobs:
+                try:
+                    task(job.payload)
+                except Exception as exc:
+                    self.finish(job, exc)
+                else:
+                    self.finish(job, None)
+
+    def finish(self, job, error, retry=True):
+        job.locked_by = ''
+        job.locked_at = None
+        if error is None:
+            job.status = Job.DONE
+            job.last_error = ''
+        else:
+            job.last_error = ''.join(traceback.format_exception(error)) or repr(error)
+            if retry and job.attempts < job.max_attempts:
+                job.status = Job.QUEUED
+                job.run_at = timezone.now() + retry_delay(job.attempts)
+                logger.warning('Job %s failed (attempt %s), retrying at %s: %s',
+                               job, job.attempts, job.run_at, error)
+            else:
+                job.status = Job.FAILED
+                logger.error('Job %s failed permanently: %s', job, error)
+        job.save(update_fields=['status', 'run_at', 'locked_by', 'locked_at',
+                                'last_error', 'updated_at'])
+
+    def purge(self, older_than):
+        """Delete finished jobs last touched before older_than"""
+        deleted, _ = Job.objects.filter(status=Job.DONE, updated_at__lt=older_than).delete()
+        return deleted
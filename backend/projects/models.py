@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, list_indexes
 
 class Project(BaseModel):
     name = models.CharField(max_length=200)
@@ -12,6 +12,7 @@ class Project(BaseModel):
     
     class Meta:
         ordering = ['-completion_date']
+        indexes = list_indexes(ordering, ['category', 'client'])
     
     def __str__(self):
         return self.name
\ No newline at end of file
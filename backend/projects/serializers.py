@@ -1,8 +1,12 @@
 from rest_framework import serializers
+from core.sparse import DynamicFieldsMixin
+from images.fields import SrcsetField
 from .models import Project
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = Project
-        fields = ['id', 'name', 'description', 'image', 'category', 
+        fields = ['id', 'name', 'description', 'image', 'srcset', 'category', 
                  'completion_date', 'technologies', 'client', 'created_at']
\ No newline at end of file
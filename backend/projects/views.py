@@ -1,18 +1,28 @@
 from rest_framework import viewsets, permissions
 from django_filters.rest_framework import DjangoFilterBackend
+from changes.sync import DeltaSyncMixin, UpdatedSinceFilter
+from core.asyncviews import AsyncReadMixin
+from core.bulk import BulkModelViewSetMixin
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.fast import FastListMixin
+from core.search import FullTextSearchFilter
+from core.sparse import SparseFieldsetMixin
 from .models import Project
 from .serializers import ProjectSerializer
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(BulkModelViewSetMixin, CachedResponseMixin, ConditionalGetMixin,
+                     SparseFieldsetMixin, FastListMixin, DeltaSyncMixin, AsyncReadMixin,
+                     viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, UpdatedSinceFilter]
     filterset_fields = ['category', 'client']
     search_fields = ['name', 'description', 'category', 'client']
     ordering_fields = ['completion_date', 'created_at', 'name']
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'delta']:
             permission_classes = [permissions.AllowAny]
         else:
             permission_classes = [permissions.IsAuthenticated]
@@ -33,7 +33,7 @@ def complete_setup():
         return False
     
     # Step 2: Create migrations
-    apps = ['core', 'services', 'projects', 'articles', 'events', 'feedback', 'gallery', 'contacts']
+    apps = ['core', 'services', 'projects', 'articles', 'events', 'feedback', 'gallery', 'contacts', 'jobs', 'stats', 'images', 'changes']
     
     for app in apps:
         if not run_command(f"python manage.py makemigrations {app}", f"Creating migrations for {app}"):
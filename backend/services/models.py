@@ -1,5 +1,5 @@
 from django.db import models
-from core.models import BaseModel
+from core.models import BaseModel, list_indexes
 
 class Service(BaseModel):
     name = models.CharField(max_length=200)
@@ -9,6 +9,7 @@ class Service(BaseModel):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = list_indexes(ordering, ['name'])
     
     def __str__(self):
         return self.name
\ No newline at end of file
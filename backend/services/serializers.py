@@ -1,7 +1,11 @@
 from rest_framework import serializers
+from core.sparse import DynamicFieldsMixin
+from images.fields import SrcsetField
 from .models import Service
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = Service
-        fields = ['id', 'name', 'description', 'image', 'features', 'created_at']
\ No newline at end of file
+        fields = ['id', 'name', 'description', 'image', 'srcset', 'features', 'created_at']
\ No newline at end of file
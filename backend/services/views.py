@@ -2,19 +2,29 @@ from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from changes.sync import DeltaSyncMixin, UpdatedSinceFilter
+from core.asyncviews import AsyncReadMixin
+from core.bulk import BulkModelViewSetMixin
+from core.cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.fast import FastListMixin
+from core.search import FullTextSearchFilter
+from core.sparse import SparseFieldsetMixin
 from .models import Service
 from .serializers import ServiceSerializer
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(BulkModelViewSetMixin, CachedResponseMixin, ConditionalGetMixin,
+                     SparseFieldsetMixin, FastListMixin, DeltaSyncMixin, AsyncReadMixin,
+                     viewsets.ModelViewSet):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, UpdatedSinceFilter]
     filterset_fields = ['name']
     search_fields = ['name', 'description']
     ordering_fields = ['created_at', 'name']
     
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'delta']:
             permission_classes = [permissions.AllowAny]
         else:
             permission_classes = [permissions.IsAuthenticated]
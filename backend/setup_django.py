@@ -26,7 +26,7 @@ def setup_django_project():
     print("🚀 Setting up AI-Solutions Django Backend...")
     
     # Create Django apps
-    apps = ['core', 'services', 'projects', 'articles', 'events', 'feedback', 'gallery', 'contacts']
+    apps = ['core', 'services', 'projects', 'articles', 'events', 'feedback', 'gallery', 'contacts', 'jobs', 'stats', 'images', 'changes']
     
     for app in apps:
         if not os.path.exists(app):
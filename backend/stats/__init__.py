@@ -0,0 +1 @@
+# Stats app
\ No newline at end of file
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import Counter
+
+@admin.register(Counter)
+class CounterAdmin(admin.ModelAdmin):
+    list_display = ['name', 'value']
+    search_fields = ['name']
+    readonly_fields = ['name', 'value']
@@ -0,0 +1,114 @@
+"""
+Named counters behind the admin dashboard.
+
+Totals are kept for every tracked model, plus approved/pending counts, a
+rating sum and a rating histogram for feedback. Writes adjust the counters
+with single-statement ``value = value + delta`` updates, so reading the
+dashboard never scans Feedback or Contact.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from core.models import tracked_models
+
+from .models import Counter
+
+FEEDBACK = 'feedback.Feedback'
+RATINGS = range(1, 6)
+
+
+def is_feedback(model):
+    return model._meta.label == FEEDBACK
+
+
+def total_key(model):
+    return f'{model._meta.app_label}.total'
+
+
+def counter_names(model):
+    names = [total_key(model)]
+    if is_feedback(model):
+        names += ['feedback.approved', 'feedback.pending', 'feedback.rating_sum']
+        names += [f'feedback.rating.{rating}' for rating in RATINGS]
+    return names
+
+
+def row_deltas(model, sign, approved=None, rating=None):
+    """Counter changes for sign rows (negative to remove) with these values"""
+    deltas = defaultdict(int)
+    deltas[total_key(model)] += sign
+    if is_feedback(model):
+        deltas['feedback.approved' if approved else 'feedback.pending'] += sign
+        deltas['feedback.rating_sum'] += sign * rating
+        deltas[f'feedback.rating.{rating}'] += sign
+    return deltas
+
+
+def instance_deltas(instance, sign):
+    return row_deltas(type(instance), sign, getattr(instance, 'approved', None),
+                      getattr(instance, 'rating', None))
+
+
+def merge(*deltas):
+    merged = defaultdict(int)
+    for delta in deltas:
+        for name, value in delta.items():
+            merged[name] += value
+    return merged
+
+
+def apply(model, deltas):
+    """Add deltas to the counters, initialising them first if needed"""
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        if not Counter.objects.filter(name=name).update(value=F('value') + delta):
+            # Never reconciled: computing from scratch already includes this change
+            reconcile(model)
+            return
+
+
+def compute(model):
+    values = dict.fromkeys(counter_names(model), 0)
+    values[total_key(model)] = model._default_manager.count()
+    if is_feedback(model):
+        groups = model._default_manager.order_by().values('approved', 'rating').annotate(n=Count('pk'))
+        for group in groups:
+            for name, value in row_deltas(model, group['n'], group['approved'], group['rating']).items():
+                if name != total_key(model):
+                    values[name] += value
+    return values
+
+
+def reconcile(model):
+    """Recompute a model's counters from its table"""
+    values = compute(model)
+    with transaction.atomic():
+        for name, value in values.items():
+            Counter.objects.update_or_create(name=name, defaults={'value': value})
+    return values
+
+
+def snapshot():
+    """Current dashboard numbers, read from the counters table"""
+    values = dict(Counter.objects.values_list('name', 'value'))
+    for model in tracked_models():
+        if any(name not in values for name in counter_names(model)):
+            values.update(reconcile(model))
+
+    feedback_total = values['feedback.total']
+    return {
+        'totals': {model._meta.app_label: values[total_key(model)] for model in tracked_models()},
+        'feedback': {
+            'approved': values['feedback.approved'],
+            'pending': values['feedback.pending'],
+            'average_rating': (
+                round(values['feedback.rating_sum'] / feedback_total, 2) if feedback_total else None
+            ),
+            'rating_histogram': {
+                str(rating): values[f'feedback.rating.{rating}'] for rating in RATINGS
+            },
+        },
+    }
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.models import tracked_models
+from stats.counters import compute, reconcile
+from stats.models import Counter
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard counters from scratch and report any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report drift, do not write the counters')
+
+    def handle(self, *args, **options):
+        stored = dict(Counter.objects.values_list('name', 'value'))
+        drift = 0
+        for model in tracked_models():
+            values = compute(model) if options['dry_run'] else reconcile(model)
+            for name, value in values.items():
+                previous = stored.get(name)
+                if previous != value:
+                    drift += 1
+                    self.stdout.write(self.style.WARNING(f'{name}: {previous} -> {value}'))
+        if drift:
+            self.stdout.write(self.style.WARNING(f'{drift} counter(s) drifted'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All counters are consistent'))
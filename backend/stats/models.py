@@ -0,0 +1,12 @@
+from django.db import models
+
+class Counter(models.Model):
+    """A named running total, maintained incrementally by stats.signals"""
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} = {self.value}"
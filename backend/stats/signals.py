@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models.expressions import Combinable
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.models import is_tracked
+from core.signals import bulk_changed, pre_bulk_update
+
+from .counters import apply, instance_deltas, is_feedback, merge, reconcile, row_deltas
+
+FEEDBACK_FIELDS = {'approved', 'rating'}
+
+
+@receiver(pre_save)
+def remember_feedback(sender, instance, **kwargs):
+    # An edit may move feedback between approved/pending or rating buckets
+    if is_feedback(sender) and not instance._state.adding and instance.pk:
+        instance._stats_previous = (
+            sender._default_manager.filter(pk=instance.pk).values('approved', 'rating').first()
+        )
+
+
+@receiver(post_save)
+def count_save(sender, instance, created, **kwargs):
+    if not is_tracked(sender):
+        return
+    if created:
+        apply(sender, instance_deltas(instance, 1))
+    elif is_feedback(sender):
+        previous = instance.__dict__.pop('_stats_previous', None)
+        if previous is not None:
+            apply(sender, merge(row_deltas(sender, -1, **previous), instance_deltas(instance, 1)))
+
+
+@receiver(post_delete)
+def count_delete(sender, instance, **kwargs):
+    if is_tracked(sender):
+        apply(sender, instance_deltas(instance, -1))
+
+
+@receiver(pre_bulk_update)
+def count_bulk_update(sender, queryset, values, **kwargs):
+    if not is_feedback(sender) or not FEEDBACK_FIELDS & set(values):
+        return
+    if any(isinstance(values.get(name), Combinable) for name in FEEDBACK_FIELDS):
+        # Expression updates: the new values are only known to the database
+        transaction.on_commit(lambda: reconcile(sender))
+        return
+
+    # Move the affected rows between buckets, grouped so this stays one query
+    deltas = []
+    groups = queryset.order_by().values('approved', 'rating').annotate(n=Count('pk'))
+    for group in groups:
+        deltas.append(row_deltas(sender, -group['n'], group['approved'], group['rating']))
+        deltas.append(row_deltas(
+            sender, group['n'],
+            values.get('approved', group['approved']),
+            values.get('rating', group['rating']),
+        ))
+    apply(sender, merge(*deltas))
+
+
+@receiver(bulk_changed)
+def count_bulk_write(sender, action, objs=(), fields=(), **kwargs):
+    if not is_tracked(sender):
+        return
+    if action == 'bulk_create':
+        apply(sender, merge(*(instance_deltas(obj, 1) for obj in objs)))
+    elif action == 'bulk_update' and is_feedback(sender) and FEEDBACK_FIELDS & set(fields):
+        transaction.on_commit(lambda: reconcile(sender))
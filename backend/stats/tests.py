@@ -0,0 +1,122 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+
+from contacts.models import Contact
+from core.models import tracked_models
+from feedback.models import Feedback
+
+from .counters import compute, reconcile, snapshot
+from .models import Counter
+
+
+def feedback(rating=5, approved=False, **kwargs):
+    return Feedback.objects.create(name='F', email='f@example.com', rating=rating, review='Good',
+                                   approved=approved, **kwargs)
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        for model in tracked_models():
+            reconcile(model)
+
+    def assertCounted(self):
+        """The stored counters equal a full recount of every tracked model"""
+        stored = dict(Counter.objects.values_list('name', 'value'))
+        for model in tracked_models():
+            expected = compute(model)
+            self.assertEqual({name: stored.get(name) for name in expected}, expected, model._meta.label)
+
+    def test_create_and_delete(self):
+        rows = [feedback(rating, approved=rating > 2) for rating in (1, 3, 5, 5)]
+        Contact.objects.create(full_name='C', email='c@example.com', country='NZ', job_details='Hello')
+        self.assertCounted()
+        rows[0].delete()
+        rows[2].delete()
+        self.assertCounted()
+
+    def test_edit_moves_buckets(self):
+        row = feedback(2)
+        row.approved = True
+        row.rating = 4
+        row.save()
+        self.assertCounted()
+
+    def test_approve_and_unapprove_with_update(self):
+        for rating in (1, 2, 5):
+            feedback(rating)
+        self.assertEqual(Feedback.objects.moderate(True), 3)
+        self.assertCounted()
+        Feedback.objects.filter(rating__lt=3).update(approved=False, rating=3)
+        self.assertCounted()
+
+    def test_expression_update_reconciles_on_commit(self):
+        for rating in (2, 4):
+            feedback(rating)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Feedback.objects.update(rating=F('rating') + 1)
+        # The new ratings are only known to the database until the reconcile runs
+        self.assertEqual(Counter.objects.get(name='feedback.rating.2').value, 1)
+        for callback in callbacks:
+            callback()
+        self.assertCounted()
+
+    def test_bulk_update_reconciles_on_commit(self):
+        rows = [feedback(rating) for rating in (1, 2)]
+        for row in rows:
+            row.approved = True
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.bulk_update(rows, ['approved'])
+        self.assertCounted()
+
+    def test_bulk_create(self):
+        Feedback.objects.bulk_create([
+            Feedback(name='B', email='b@example.com', rating=rating, review='Good') for rating in (1, 4)
+        ])
+        self.assertCounted()
+
+    def test_snapshot(self):
+        for rating, approved in ((2, True), (4, True), (5, False)):
+            feedback(rating, approved)
+        data = snapshot()
+        self.assertEqual(data['totals']['feedback'], 3)
+        self.assertEqual(data['feedback'], {
+            'approved': 2, 'pending': 1, 'average_rating': 3.67,
+            'rating_histogram': {'1': 0, '2': 1, '3': 0, '4': 1, '5': 1},
+        })
+
+    def test_snapshot_reconciles_missing_counters(self):
+        feedback(3, approved=True)
+        # feedback.total survives, one of the other feedback counters does not
+        Counter.objects.filter(name='feedback.rating.3').delete()
+        self.assertEqual(snapshot()['feedback']['rating_histogram']['3'], 1)
+        self.assertCounted()
+
+        Counter.objects.all().delete()
+        self.assertEqual(snapshot()['totals']['feedback'], 1)
+        self.assertCounted()
+
+    def test_reconcile_stats_fixes_drift(self):
+        feedback(5, approved=True)
+        Counter.objects.filter(name='feedback.approved').update(value=7)
+        out = io.StringIO()
+        call_command('reconcile_stats', '--dry-run', stdout=out)
+        self.assertIn('feedback.approved: 7 -> 1', out.getvalue())
+        self.assertEqual(Counter.objects.get(name='feedback.approved').value, 7)
+
+        call_command('reconcile_stats', stdout=io.StringIO())
+        self.assertCounted()
+        out = io.StringIO()
+        call_command('reconcile_stats', stdout=out)
+        self.assertIn('All counters are consistent', out.getvalue())
+
+    def test_stats_endpoint(self):
+        feedback(4, approved=True)
+        self.assertEqual(self.client.get('/api/stats/').status_code, 401)
+        self.client.force_login(User.objects.create_user('user', password='pw'))
+        data = self.client.get('/api/stats/').json()
+        self.assertEqual(data['feedback']['approved'], 1)
+        self.assertIn('throttled', data)
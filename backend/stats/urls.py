@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import StatsView
+
+urlpatterns = [
+    path('', StatsView.as_view(), name='stats'),
+]
@@ -0,0 +1,18 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from core.throttling import get_hits
+
+from .counters import snapshot
+
+
+class StatsView(APIView):
+    """Dashboard totals and feedback rating statistics, read in O(1)"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        data = snapshot()
+        data['throttled'] = get_hits(sorted(api_settings.DEFAULT_THROTTLE_RATES))
+        return Response(data)